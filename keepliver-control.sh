@@ -40,8 +40,12 @@ case "$1" in
         PIDS=$(pgrep -f "$PROCESS_NAME")
         if [ -n "$PIDS" ]; then
             echo "找到进程: $PIDS"
-            echo "$PIDS" | xargs kill
-            sleep 2
+            # SIGTERM: 等待进行中的保活请求完成后退出
+            echo "$PIDS" | xargs kill -TERM
+            for _ in $(seq 1 15); do
+                pgrep -f "$PROCESS_NAME" > /dev/null || break
+                sleep 2
+            done
             # 再次检查，如果还在运行则强制杀死
             REMAINING=$(pgrep -f "$PROCESS_NAME")
             if [ -n "$REMAINING" ]; then
@@ -60,6 +64,8 @@ case "$1" in
             echo "keepliver 正在运行，进程ID: $PID"
             # 显示进程详细信息
             ps -f -p "$PID"
+            # 通过控制接口查看保活状态（上次保活时间、下次计划时间等）
+            (cd "$WORK_DIR" && source "$VENV_PATH" && python -m keepliver.cli ctl status 2>/dev/null)
             # 显示日志尾部
             if [ -f "$LOG_FILE" ]; then
                 echo ""
@@ -71,6 +77,30 @@ case "$1" in
         fi
         ;;
     
+    reload|重载)
+        # 优先走控制接口，不可用时退回到 SIGHUP
+        if (cd "$WORK_DIR" && source "$VENV_PATH" && python -m keepliver.cli ctl reload 2>/dev/null); then
+            exit 0
+        fi
+        PIDS=$(pgrep -f "$PROCESS_NAME")
+        if [ -n "$PIDS" ]; then
+            # SIGHUP: 重新读取 config.json / secrets.json / --settings，不重启进程
+            echo "$PIDS" | xargs kill -HUP
+            echo "已通知 keepliver 重新加载配置"
+        else
+            echo "没有找到运行的 keepliver 进程"
+        fi
+        ;;
+
+    ctl|控制)
+        # 其余参数原样转发，如: $0 ctl trigger / $0 ctl pause
+        shift
+        cd "$WORK_DIR" || { echo "无法进入工作目录 $WORK_DIR"; exit 1; }
+        source "$VENV_PATH"
+        python -m keepliver.cli ctl "$@"
+        exit $?
+        ;;
+
     restart|重启)
         echo "重启 keepliver..."
         "$0" stop
@@ -79,12 +109,14 @@ case "$1" in
         ;;
     
     *)
-        echo "使用方法: $0 {start|启用|stop|杀死|kill|status|状态|restart|重启}"
+        echo "使用方法: $0 {start|启用|stop|杀死|kill|status|状态|reload|重载|ctl|控制|restart|重启}"
         echo ""
         echo "命令说明:"
         echo "  start, 启用    - 启动 keepliver"
         echo "  stop, 杀死, kill - 停止 keepliver"
         echo "  status, 状态   - 查看 keepliver 状态"
+        echo "  reload, 重载   - 重新加载配置（不重启进程）"
+        echo "  ctl, 控制      - 发送控制命令 (status/trigger/relogin/pause/resume/metrics/reload)"
         echo "  restart, 重启  - 重启 keepliver"
         exit 1
         ;;
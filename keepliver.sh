@@ -29,6 +29,7 @@ show_help() {
   start       启动服务
   stop        停止服务
   restart     重启服务
+  reload      重新加载配置（发送 SIGHUP，不重启浏览器和调度状态）
   status      查看服务状态
   logs        查看实时日志 (Ctrl+C 退出)
   enable      设置开机自启
@@ -180,7 +181,10 @@ StartLimitIntervalSec=300
 StartLimitBurst=5
 
 [Service]
-Type=simple
+# 进程启动后通知 systemd 就绪，并定期发送看门狗心跳；保活循环卡死超过 WatchdogSec 即被重启
+Type=notify
+NotifyAccess=all
+WatchdogSec=120
 WorkingDirectory=WORK_DIR_PLACEHOLDER
 Environment="PATH=WORK_DIR_PLACEHOLDER/.venv/bin:/usr/bin:/bin"
 Environment="PYTHONUNBUFFERED=1"
@@ -202,6 +206,7 @@ ExecStart=/usr/bin/systemd-inhibit --what=sleep --who=keepliver --why="Prevent s
     --keep-browser KEEP_BROWSER_PLACEHOLDER \
     --auto-connect HEADLESS_PLACEHOLDER
 
+ExecReload=/usr/bin/pkill -HUP --parent $MAINPID
 Restart=always
 RestartSec=60
 
@@ -317,6 +322,12 @@ restart_service() {
     check_status
 }
 
+reload_service() {
+    echo -e "${BLUE}🔁 重新加载配置...${NC}"
+    systemctl --user reload "${SERVICE_NAME}.service"
+    echo -e "${GREEN}✅ 已发送重新加载信号${NC}"
+}
+
 check_status() {
     echo -e "${BLUE}=== 服务状态 ===${NC}"
     systemctl --user status "${SERVICE_NAME}.service" --no-pager 2>/dev/null || true
@@ -329,6 +340,10 @@ check_status() {
     else
         echo -e "${RED}❌ 进程未运行${NC}"
     fi
+
+    echo ""
+    echo -e "${BLUE}=== 保活状态 ===${NC}"
+    "$WORK_DIR/.venv/bin/ctyun-keeplive" ctl status 2>/dev/null || echo "控制接口不可用"
 }
 
 show_logs() {
@@ -374,6 +389,9 @@ case "$1" in
     restart|重启)
         restart_service
         ;;
+    reload|重载)
+        reload_service
+        ;;
     status|状态)
         check_status
         ;;
@@ -4,7 +4,9 @@ import os
 import sys
 import time
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+from keepliver.sdnotify import Watchdog, notify
 
 
 def _run_module_main(module, argv: List[str]) -> None:
@@ -24,9 +26,20 @@ def _add_if(args: List[str], flag: str, value) -> None:
     args.extend([flag, str(value)])
 
 
-def _login_selenium(args) -> None:
-    from keepliver import ctyun_auto_selenium as mod
+def _run_login_module(module: str, argv: List[str], args) -> None:
+    if getattr(args, "login_worker", "inprocess") == "subprocess":
+        from keepliver.login_worker import run_worker
+
+        # --keep-browser 0 keeps the worker running on purpose; its phase deadlines still apply.
+        timeout = _busy_timeout(args) if args.keep_browser > 0 else None
+        run_worker(module, argv[1:], timeout=timeout)
+        return
+    import importlib
+
+    _run_module_main(importlib.import_module(module), argv)
+
 
+def _login_selenium(args) -> None:
     argv = ["ctyun_auto_selenium.py"]
     _add_if(argv, "--profile-dir", args.profile_dir)
     _add_if(argv, "--chromedriver", args.chromedriver)
@@ -57,20 +70,30 @@ def _login_selenium(args) -> None:
     if args.auto_connect:
         argv.append("--auto-connect")
     _add_if(argv, "--keep-browser", args.keep_browser)
+    _add_if(argv, "--rss-budget-mb", args.rss_budget_mb)
+    _add_if(argv, "--browser-preset", args.browser_preset)
+    _add_if(argv, "--headless-shell", args.headless_shell)
+    if args.tmpfs_profile:
+        argv.append("--tmpfs-profile")
+    _add_if(argv, "--tmpfs-dir", args.tmpfs_dir)
+    _add_if(argv, "--profile-budget-mb", args.profile_budget_mb)
+    _add_if(argv, "--remote", args.remote)
+    _add_if(argv, "--remote-profile-dir", args.remote_profile_dir)
+    _add_if(argv, "--launch-deadline", args.launch_deadline)
+    _add_if(argv, "--login-deadline", args.login_deadline)
+    _add_if(argv, "--connect-deadline", args.connect_deadline)
 
-    _run_module_main(mod, argv)
+    _run_login_module("keepliver.ctyun_auto_selenium", argv, args)
 
 
 def _login_playwright(args) -> None:
-    from keepliver import ctyun_auto as mod
-
     argv = ["ctyun_auto.py"]
     _add_if(argv, "--profile-dir", args.profile_dir)
     _add_if(argv, "--timeout", args.timeout)
     _add_if(argv, "--out", args.config)
     if args.headless:
         argv.append("--headless")
-    _run_module_main(mod, argv)
+    _run_login_module("keepliver.ctyun_auto", argv, args)
 
 
 def _run_login(args) -> None:
@@ -80,6 +103,50 @@ def _run_login(args) -> None:
         _login_selenium(args)
 
 
+def _guarded_login(args, login=None, life=None) -> None:
+    from keepliver.retry import get_breaker
+
+    breaker = get_breaker("login")
+    while not breaker.allow():
+        wait = max(breaker.retry_after(), 1.0)
+        print(f"[auto] login circuit open, waiting {wait:.0f}s", flush=True)
+        if life is None:
+            time.sleep(wait)
+            continue
+        # The open window can last many minutes; a SIGTERM must not wait it out.
+        life.sleep(wait)
+        if life.stopping.is_set():
+            raise SystemExit("[auto] stop requested while waiting for the login circuit.")
+    try:
+        (login or _run_login)(args)
+        _check_login_output(args)
+    except BaseException:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+
+
+def _check_login_output(args) -> None:
+    # ctyun_auto_selenium reports most failed logins by returning early, not by raising.
+    if _load_config(args.config) is None:
+        raise RuntimeError(f"login did not produce a valid config: {args.config}")
+
+
+def _login_now(args, life, relogin=None) -> None:
+    """Log in in the foreground, unless a pre-emptive login is running or just finished.
+
+    Two logins on the same profile dir would fight over Chrome's profile lock (and over
+    sys.argv in _run_module_main), so a running background login is waited for instead.
+    """
+    if relogin is not None:
+        if relogin.running():
+            print("[auto] waiting for the pre-emptive login to finish.", flush=True)
+            relogin.wait()
+        if relogin.take_swapped():
+            return
+    _guarded_login(args, life=life)
+
+
 def _load_config(path: str) -> Optional[dict]:
     try:
         from keepliver.keepalive import load_config, validate_config
@@ -91,20 +158,290 @@ def _load_config(path: str) -> Optional[dict]:
         return None
 
 
-def _ensure_config(path: str, args) -> dict:
+def _probe_session(args, cfg: dict) -> str:
+    from keepliver.probe import UNKNOWN, probe_session, probe_url
+
+    if probe_url(cfg, args.probe_url) is None:
+        # Probing is opt-in: without an endpoint, behave as before it existed.
+        return UNKNOWN
+    result = probe_session(cfg, url=args.probe_url, session=args.http_session)
+    print(f"[auto] session probe: {result}", flush=True)
+    return result
+
+
+def _ensure_config(path: str, args, probe: bool = False, life=None) -> dict:
+    from keepliver.probe import EXPIRED
+
     cfg = _load_config(path)
     if cfg is not None:
-        return cfg
-
-    print(f"config not found or invalid, login to generate: {path}")
-    _run_login(args)
+        # A well-formed config can still carry a dead token; one small signed call tells.
+        if not probe or _probe_session(args, cfg) != EXPIRED:
+            return cfg
+        if _retry_with_profile_auth(args, cfg):
+            return cfg
+        print(f"session in config expired, login to refresh: {path}")
+    else:
+        print(f"config not found or invalid, login to generate: {path}")
+    _guarded_login(args, life=life)
     cfg = _load_config(path)
     if cfg is None:
         raise SystemExit("login finished but config is still invalid")
     return cfg
 
 
-def main() -> None:
+def _retry_with_profile_auth(args, cfg: dict) -> bool:
+    # The browser profile may hold a newer authData than config.json; reading it
+    # from disk takes milliseconds, a browser login takes minutes.
+    import requests
+
+    from keepliver.keepalive import refresh_auth_from_profile, send_keepalive_with_retry
+    from keepliver.retry import CircuitOpenError
+
+    if not args.profile_dir or not refresh_auth_from_profile(args.config, cfg, args.profile_dir):
+        return False
+    try:
+        ok, status, payload = send_keepalive_with_retry(
+            cfg, hedge=args.hedge, session=args.http_session
+        )
+    except (CircuitOpenError, requests.RequestException) as e:
+        print(f"[auto] keepalive with profile auth error: {e}", flush=True)
+        return False
+    print(f"[auto] keepalive with profile auth: {status} response: {payload}", flush=True)
+    return ok
+
+
+# Loop state shared with the control socket. The loops write the status fields; control
+# commands only set the request flags and wake the loop.
+AUTO_STATE = {
+    "last_status": None,
+    "last_keepalive_ts": None,
+    "next_run_ts": None,
+    "paused": False,
+    "relogin_requested": False,
+}
+
+
+WATCHDOG = Watchdog()
+
+
+def _sleep(life, seconds: Optional[float]) -> None:
+    AUTO_STATE["next_run_ts"] = None if seconds is None else time.time() + seconds
+    WATCHDOG.idle()
+    life.sleep(seconds)
+    WATCHDOG.busy()
+
+
+def _set_status(status: str) -> None:
+    AUTO_STATE["last_status"] = status
+    notify(f"STATUS=last keepalive: {status} at {time.strftime('%H:%M:%S')}")
+
+
+def _busy_timeout(args) -> Optional[float]:
+    """Longest a loop step may take: one full browser login, every bounded phase at its deadline.
+
+    Unbounded phases are left out. The open-ended keep phase of --keep-browser 0 re-arms the
+    watchdog itself (sdnotify.still_busy) for as long as it keeps running.
+    """
+    from keepliver.deadline import phase_deadlines
+
+    return sum(s for s in phase_deadlines(args).values() if s) + 60
+
+
+def _control_handlers(args, life) -> Dict:
+    from keepliver import metrics
+    from keepliver.control import format_ts
+
+    def status(_request):
+        next_run = AUTO_STATE["next_run_ts"]
+        next_in = None if next_run is None else max(0, next_run - time.time())
+        return {
+            args.account or "default": {
+                "status": AUTO_STATE["last_status"],
+                "last_keepalive": format_ts(AUTO_STATE["last_keepalive_ts"]),
+                "next_run": format_ts(next_run),
+                "next_run_in_s": None if next_in is None else round(next_in),
+                "paused": AUTO_STATE["paused"],
+                "mode": "adaptive" if args.adaptive else "browser",
+            }
+        }
+
+    def trigger(_request):
+        life.wake()
+        return "keepalive triggered"
+
+    def relogin(_request):
+        AUTO_STATE["relogin_requested"] = True
+        life.wake()
+        return "login requested"
+
+    def pause(_request):
+        AUTO_STATE["paused"] = True
+        life.wake()
+        return "paused"
+
+    def resume(_request):
+        AUTO_STATE["paused"] = False
+        life.wake()
+        return "resumed"
+
+    def reload(_request):
+        life.request_reload()
+        return "reload requested"
+
+    return {
+        "status": status,
+        "trigger": trigger,
+        "relogin": relogin,
+        "pause": pause,
+        "resume": resume,
+        "metrics": lambda _request: metrics.format_metrics(metrics.snapshot()),
+        "reload": reload,
+    }
+
+
+def _schedule_relogin(args, scheduler, relogin, delay: float) -> float:
+    """Start the background login once due; otherwise don't sleep past the due time."""
+    due = scheduler.relogin_at(args.session_lifetime)
+    if due is None:
+        return delay
+    remaining = due - time.time()
+    if remaining <= 0:
+        relogin.start()
+        return delay
+    return min(delay, max(remaining, 1.0))
+
+
+def _run_adaptive(args, life, argv: List[str]) -> None:
+    import requests
+
+    from keepliver.keepalive import send_keepalive_with_retry
+    from keepliver.probe import VALID, invalidate, remember
+    from keepliver.retry import CircuitOpenError, RetryPolicy
+    from keepliver.scheduler import AdaptiveScheduler, default_state_path
+
+    scheduler = AdaptiveScheduler(
+        args.schedule_state or default_state_path(args.config),
+        base_interval=args.interval,
+        min_interval=args.min_interval,
+        max_interval=args.max_interval,
+    )
+    if args.profile_cookies:
+        from keepliver.keepalive import profile_session
+
+        args.http_session = profile_session(args.profile_dir)
+    cfg = _ensure_config(args.config, args, probe=True, life=life)
+    relogin = None
+    if args.preemptive_relogin:
+        from keepliver.relogin import BackgroundRelogin
+
+        relogin = BackgroundRelogin(args)
+        if scheduler.login_ts is None:
+            # Unknown login time: the config was written by the login that produced it.
+            scheduler.login_ts = os.path.getmtime(args.config)
+    backoff = RetryPolicy(base=60, cap=300)
+    retry_delay = None
+    consecutive_errors = 0
+    max_consecutive_errors = 5
+
+    def failed(what: str, e: BaseException) -> float:
+        # Keepalive and login failures share one count, as in the browser-mode loop.
+        nonlocal consecutive_errors, retry_delay
+        consecutive_errors += 1
+        print(f"[auto] {what} error: {e}", flush=True)
+        _set_status("error")
+        if consecutive_errors >= max_consecutive_errors:
+            print("[auto] too many consecutive errors, exiting.", flush=True)
+            raise SystemExit(1)
+        retry_delay = backoff.next_delay(retry_delay)
+        print(f"[auto] retrying in {retry_delay:.0f} seconds...", flush=True)
+        return retry_delay
+
+    while not life.stopping.is_set():
+        try:
+            if life.take_reload():
+                _reload(args, argv, scheduler)
+                cfg = _ensure_config(args.config, args, life=life)
+            if AUTO_STATE["paused"]:
+                _sleep(life, None)
+                continue
+            if AUTO_STATE["relogin_requested"]:
+                AUTO_STATE["relogin_requested"] = False
+                print("[auto] login requested over control socket.", flush=True)
+                _login_now(args, life, relogin)
+                cfg = _ensure_config(args.config, args, life=life)
+                scheduler.record_login()
+            if relogin is not None and relogin.take_swapped():
+                cfg = _ensure_config(args.config, args, life=life)
+                scheduler.record_login()
+        except Exception as e:
+            _sleep(life, failed("login", e))
+            continue
+        try:
+            ok, status, payload = send_keepalive_with_retry(
+                cfg, hedge=args.hedge, session=args.http_session
+            )
+        except CircuitOpenError as e:
+            print(f"[auto] keepalive skipped: {e}", flush=True)
+            _set_status("skipped")
+            _sleep(life, max(e.retry_after, 1.0))
+            continue
+        except requests.RequestException as e:
+            _sleep(life, failed("keepalive", e))
+            continue
+        AUTO_STATE["last_keepalive_ts"] = time.time()
+        print(f"[auto] keepalive status: {status} response: {payload}", flush=True)
+        if not ok:
+            ok = _retry_with_profile_auth(args, cfg)
+        _set_status("ok" if ok else "expired")
+        if ok:
+            consecutive_errors = 0
+            retry_delay = None
+            remember(cfg, VALID, args.probe_url)
+            scheduler.record_success()
+        else:
+            # A refused connect outdates any cached answer; ask again before opening a browser.
+            invalidate(cfg, args.probe_url)
+            if _probe_session(args, cfg) == VALID:
+                print("[auto] keepalive refused but session is valid, retry later.", flush=True)
+                _set_status("refused")
+                _sleep(life, scheduler.min_interval)
+                continue
+            scheduler.record_expired()
+            try:
+                print("[auto] session expired, login to refresh config.", flush=True)
+                _login_now(args, life, relogin)
+                cfg = _ensure_config(args.config, args, life=life)
+            except Exception as e:
+                # A failed login must not end the process: the breaker and what the
+                # scheduler learned live in it.
+                _sleep(life, failed("login", e))
+                continue
+            scheduler.record_login()
+            try:
+                ok, status, payload = send_keepalive_with_retry(
+                    cfg, hedge=args.hedge, session=args.http_session
+                )
+            except (CircuitOpenError, requests.RequestException) as e:
+                print(f"[auto] keepalive retry error: {e}", flush=True)
+            else:
+                print(f"[auto] keepalive retry status: {status} response: {payload}", flush=True)
+                AUTO_STATE["last_keepalive_ts"] = time.time()
+                if ok:
+                    consecutive_errors = 0
+                    retry_delay = None
+                    _set_status("ok")
+                    scheduler.record_success()
+        delay = scheduler.next_interval()
+        if relogin is not None:
+            delay = _schedule_relogin(args, scheduler, relogin, delay)
+        lifetime = scheduler.learned_lifetime()
+        learned = f"{lifetime:.0f}s" if lifetime is not None else "unknown"
+        print(f"[auto] next keepalive in {delay:.0f}s (learned lifetime: {learned})", flush=True)
+        _sleep(life, delay)
+    print("[auto] stopped.", flush=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Auto keepalive with login refresh.")
     parser.add_argument(
         "--config",
@@ -117,6 +454,65 @@ def main() -> None:
         default=1800,
         help="Seconds between keepalive requests (default 1800 = 30 min).",
     )
+    parser.add_argument(
+        "--control-socket",
+        default=None,
+        help="Unix socket for 'cli ctl' (default: $XDG_RUNTIME_DIR/keepliver.sock).",
+    )
+    parser.add_argument("--no-control", action="store_true", help="Don't open a control socket.")
+    parser.add_argument(
+        "--settings",
+        default=None,
+        help="JSON file of option overrides (same names as these flags), re-read on SIGHUP.",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="HTTP keepalive with interval learned from observed session lifetime.",
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=int,
+        default=300,
+        help="Lower bound for the adaptive interval (seconds).",
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=int,
+        default=None,
+        help="Upper bound for the adaptive interval (default: only the learned session bound).",
+    )
+    parser.add_argument(
+        "--schedule-state",
+        default=None,
+        help="Where the adaptive scheduler persists what it learned.",
+    )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Hedge slow keepalives with a second signed request (adaptive mode).",
+    )
+    parser.add_argument(
+        "--preemptive-relogin",
+        action="store_true",
+        help="Log in again in the background before the session lifetime runs out (adaptive).",
+    )
+    parser.add_argument(
+        "--session-lifetime",
+        type=int,
+        default=None,
+        help="Session lifetime in seconds for --preemptive-relogin (default: learned).",
+    )
+    parser.add_argument(
+        "--probe-url",
+        default=None,
+        help="Signed read-only endpoint used to check the session before a browser login.",
+    )
+    parser.add_argument(
+        "--profile-cookies",
+        action="store_true",
+        help="Send the browser profile's cookies with keepalive requests (adaptive mode).",
+    )
 
     parser.add_argument(
         "--backend",
@@ -157,6 +553,64 @@ def main() -> None:
         default=10,
         help="Seconds to keep browser open after success (0 = don't close).",
     )
+    parser.add_argument(
+        "--rss-budget-mb",
+        type=float,
+        default=0,
+        help="Recycle the login browser once its process tree RSS exceeds this (0 = off).",
+    )
+    parser.add_argument(
+        "--browser-preset",
+        choices=["default", "lean"],
+        default="default",
+        help="Selenium launch preset; 'lean' trades features for memory.",
+    )
+    parser.add_argument(
+        "--headless-shell", default=None, help="Run chrome-headless-shell instead of Chrome."
+    )
+    parser.add_argument(
+        "--tmpfs-profile",
+        action="store_true",
+        help="Run the login browser from a tmpfs copy of the profile (selenium).",
+    )
+    parser.add_argument("--tmpfs-dir", default=None, help="tmpfs mount (default /dev/shm).")
+    parser.add_argument(
+        "--profile-budget-mb",
+        type=float,
+        default=0,
+        help="Trim the login profile's caches before launch above this size (0 = never).",
+    )
+    parser.add_argument(
+        "--remote",
+        default=None,
+        help="Run selenium logins on these Grid / remote WebDriver URLs (comma-separated).",
+    )
+    parser.add_argument("--remote-profile-dir", default=None, help="Profile dir on the node.")
+    parser.add_argument(
+        "--login-worker",
+        choices=["subprocess", "inprocess"],
+        default="inprocess",
+        help="subprocess runs browser logins in a short-lived child process (keeps this "
+        "process small).",
+    )
+    parser.add_argument(
+        "--launch-deadline",
+        type=int,
+        default=120,
+        help="Kill the browser if starting it and opening the page takes longer (selenium).",
+    )
+    parser.add_argument(
+        "--login-deadline",
+        type=int,
+        default=0,
+        help="Login phase deadline (0 = timeout + captcha/SMS waits + 60).",
+    )
+    parser.add_argument(
+        "--connect-deadline",
+        type=int,
+        default=0,
+        help="Connect-capture phase deadline (0 = timeout + 60).",
+    )
     parser.add_argument(
         "--captcha-mode",
         choices=["auto", "manual", "off"],
@@ -177,8 +631,11 @@ def main() -> None:
     parser.add_argument("--telegram-chat-id", default="")
     parser.add_argument("--telegram-timeout", type=int, default=None)
     parser.add_argument("--telegram-test", action="store_true")
+    return parser
+
 
-    args = parser.parse_args()
+def _apply_defaults(args) -> None:
+    args.http_session = None
     if not args.secrets:
         default_secrets = os.path.join(os.path.dirname(__file__), "secrets.json")
         if os.path.exists(default_secrets):
@@ -192,27 +649,130 @@ def main() -> None:
             args.profile_dir = os.path.join(os.path.dirname(__file__), ".pw-profile")
         else:
             args.profile_dir = os.path.join(os.path.dirname(__file__), ".selenium-profile")
-    if not args.chromedriver:
-        repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-        candidates = [
-            os.path.join(os.path.dirname(__file__), "chromedriver.exe"),
-            os.path.join(repo_root, "chromedriver.exe"),
-            os.path.join(repo_root, "drivers", "chromedriver.exe"),
-        ]
-        args.chromedriver = next((p for p in candidates if os.path.exists(p)), "chromedriver")
-    if not args.edgedriver:
-        repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-        candidates = [
-            os.path.join(os.path.dirname(__file__), "msedgedriver.exe"),
-            os.path.join(repo_root, "msedgedriver.exe"),
-            os.path.join(repo_root, "drivers", "msedgedriver.exe"),
-        ]
-        args.edgedriver = next((p for p in candidates if os.path.exists(p)), "msedgedriver")
+    if not args.chromedriver or not args.edgedriver:
+        from keepliver.drivers import local_driver
+
+        args.chromedriver = args.chromedriver or local_driver("chrome")
+        args.edgedriver = args.edgedriver or local_driver("edge")
+
+
+def options_argv(options: Dict) -> List[str]:
+    """Turn {"min_interval": 300, "hedge": true} into ["--min-interval", "300", "--hedge"]."""
+    argv = []
+    for key, value in options.items():
+        if key == "name" or value is None or value is False or value == "":
+            continue
+        flag = "--" + key.replace("_", "-")
+        if value is True:
+            argv.append(flag)
+        else:
+            argv.extend([flag, str(value)])
+    return argv
+
+
+def parse_args(argv: List[str]):
+    args = build_parser().parse_args(argv)
+    if args.settings:
+        from keepliver.config_store import load_config
+
+        settings = load_config(args.settings)
+        if not isinstance(settings, dict):
+            raise ValueError(f"settings must be a JSON object: {args.settings}")
+        # Appended after the command line, so the file wins.
+        args = build_parser().parse_args(argv + options_argv(settings))
+    _apply_defaults(args)
+    return args
+
+
+# Reload log shows which options changed, not their secret values.
+_SECRET_OPTIONS = ("password", "telegram_token")
+
+
+def _reload(args, argv: List[str], scheduler=None) -> None:
+    """Re-read --settings and apply what changed to the running loop, in place.
+
+    config.json and secrets.json need nothing extra: both are read again on next use.
+    """
+    from keepliver import config_store, probe
+
+    config_store.invalidate()
+    probe.invalidate()
+    try:
+        fresh = parse_args(argv)
+    except (SystemExit, OSError, ValueError) as e:
+        print(f"[auto] reload failed, keeping current settings: {e}", flush=True)
+        return
+    fresh.http_session = args.http_session
+    fresh.backend = args.backend
+    fresh.auto_connect = args.auto_connect
+    changed = sorted(k for k, v in vars(fresh).items() if getattr(args, k, None) != v)
+    vars(args).update(vars(fresh))
+    for key in changed:
+        value = "***" if key in _SECRET_OPTIONS else repr(getattr(args, key))
+        print(f"[auto] reload: {key} = {value}", flush=True)
+    if {"profile_cookies", "profile_dir"} & set(changed):
+        args.http_session = None
+        if args.profile_cookies:
+            from keepliver.keepalive import profile_session
+
+            args.http_session = profile_session(args.profile_dir)
+    if scheduler is not None:
+        scheduler.retune(args.interval, args.min_interval, args.max_interval)
+    WATCHDOG.busy_timeout = _busy_timeout(args)
+    print(f"[auto] reloaded ({len(changed)} changed)", flush=True)
+
+
+def main() -> None:
+    from keepliver.lifecycle import Lifecycle
+
+    argv = sys.argv[1:]
+    args = parse_args(argv)
+    life = Lifecycle()
+    life.install()
+    control = None
+    if not args.no_control:
+        from keepliver.control import ControlServer, default_socket_path
+
+        control = ControlServer(
+            args.control_socket or default_socket_path(), _control_handlers(args, life)
+        )
+        control.start()
+    if WATCHDOG.start(_busy_timeout(args)):
+        print(f"[auto] systemd watchdog every {WATCHDOG.interval:.0f}s", flush=True)
+    notify("READY=1")
+    try:
+        _run(args, life, argv)
+    finally:
+        notify("STOPPING=1")
+        WATCHDOG.stop()
+        if control is not None:
+            control.stop()
+
+
+def _run(args, life, argv: List[str]) -> None:
+    if args.adaptive:
+        if args.backend != "selenium":
+            print("auto keepalive requires selenium; overriding backend to selenium.")
+            args.backend = "selenium"
+        args.auto_connect = True
+        _run_adaptive(args, life, argv)
+        return
+
+    from keepliver.retry import RetryPolicy
 
     # Auto keepalive via desktop list -> connect flow (no direct HTTP keepalive).
+    backoff = RetryPolicy(base=60, cap=300)
+    retry_delay = None
     consecutive_errors = 0
     max_consecutive_errors = 5
-    while True:
+    while not life.stopping.is_set():
+        if life.take_reload():
+            _reload(args, argv)
+        if AUTO_STATE["paused"]:
+            _sleep(life, None)
+            continue
+        # Every cycle logs in anyway, so a requested login is just an early cycle.
+        AUTO_STATE["relogin_requested"] = False
         if args.backend != "selenium":
             print("auto keepalive requires selenium; overriding backend to selenium.")
             args.backend = "selenium"
@@ -220,23 +780,28 @@ def main() -> None:
         start_ts = datetime.now(timezone.utc).astimezone().isoformat(sep=" ", timespec="seconds")
         print(f"[auto] start: {start_ts}", flush=True)
         try:
-            _login_selenium(args)
+            _guarded_login(args, _login_selenium, life)
             consecutive_errors = 0  # 成功后重置错误计数
+            retry_delay = None
+            _set_status("ok")
+            AUTO_STATE["last_keepalive_ts"] = time.time()
         except Exception as e:
+            _set_status("error")
             consecutive_errors += 1
             print(f"[auto] error: {e}", flush=True)
             print(f"[auto] consecutive errors: {consecutive_errors}/{max_consecutive_errors}", flush=True)
             if consecutive_errors >= max_consecutive_errors:
                 print("[auto] too many consecutive errors, exiting.", flush=True)
                 raise SystemExit(1)
-            # 出错后等待一段时间再重试，避免频繁重试
-            retry_delay = min(60 * consecutive_errors, 300)
-            print(f"[auto] retrying in {retry_delay} seconds...", flush=True)
-            time.sleep(retry_delay)
+            # 出错后等待一段时间再重试，避免频繁重试（去相关抖动，避免多节点同步重试）
+            retry_delay = backoff.next_delay(retry_delay)
+            print(f"[auto] retrying in {retry_delay:.0f} seconds...", flush=True)
+            _sleep(life, retry_delay)
             continue
         end_ts = datetime.now(timezone.utc).astimezone().isoformat(sep=" ", timespec="seconds")
         print(f"[auto] end: {end_ts}", flush=True)
-        time.sleep(args.interval)
+        _sleep(life, args.interval)
+    print("[auto] stopped.", flush=True)
 
 
 if __name__ == "__main__":
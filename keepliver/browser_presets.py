@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import time
+from typing import Dict, List, Optional
+
+from keepliver import metrics
+
+# One renderer, no background services, a capped V8 heap and a small window: all the
+# portal's login page and desktop list need. Compare with `python -m keepliver.browser_presets`.
+LEAN_ARGS = [
+    "--renderer-process-limit=1",
+    "--disable-extensions",
+    "--disable-gpu",
+    "--disable-software-rasterizer",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-breakpad",
+    "--disable-domain-reliability",
+    "--disable-client-side-phishing-detection",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,BackForwardCache",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-pings",
+    "--js-flags=--max-old-space-size=128",
+    "--window-size=800,600",
+]
+
+PRESETS = {"default": [], "lean": LEAN_ARGS}
+
+
+def preset_arguments(preset: str) -> List[str]:
+    """Extra browser command-line switches for a preset name."""
+    try:
+        return list(PRESETS[preset])
+    except KeyError:
+        raise ValueError(f"unknown browser preset: {preset}") from None
+
+
+def measure(login_argv: List[str], preset: str, timeout: Optional[float] = None) -> Dict:
+    """One selenium login with the preset in a worker: wall time and peak browser RSS."""
+    from keepliver.login_worker import LoginWorkerError, run_worker
+
+    metrics.set_gauge("browser_rss_peak_mb", 0)
+    argv = list(login_argv) + ["--browser-preset", preset, "--rss-interval", "0.5"]
+    start = time.monotonic()
+    error = None
+    try:
+        run_worker("keepliver.ctyun_auto_selenium", argv, timeout)
+    except (LoginWorkerError, TimeoutError) as e:
+        error = str(e)
+    return {
+        "preset": preset,
+        "seconds": round(time.monotonic() - start, 1),
+        "peak_rss_mb": round(metrics.get("browser_rss_peak_mb"), 1),
+        "error": error,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare peak browser RSS and login time of the browser presets.",
+        epilog="Arguments after -- go to ctyun_auto_selenium (e.g. --profile-dir, --out).",
+    )
+    parser.add_argument("--runs", type=int, default=1, help="Logins per preset.")
+    parser.add_argument(
+        "--presets", default="default,lean", help="Comma-separated presets to compare."
+    )
+    parser.add_argument("--timeout", type=float, default=None, help="Per-login timeout.")
+    parser.add_argument("--json", default=None, help="Also write the results to this file.")
+    parser.add_argument("login_args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+    login_argv = [a for a in args.login_args if a != "--"]
+    presets = [p.strip() for p in args.presets.split(",") if p.strip()]
+    for preset in presets:
+        preset_arguments(preset)
+
+    results = []
+    for run in range(args.runs):
+        # Alternate the order so a warm disk cache doesn't favour one preset.
+        for preset in presets if run % 2 == 0 else reversed(presets):
+            result = measure(login_argv, preset, args.timeout)
+            results.append(result)
+            print(json.dumps(result), flush=True)
+
+    print(f"{'preset':<10} {'runs':>4} {'ok':>3} {'peak RSS MiB':>13} {'login s':>8}")
+    for preset in presets:
+        ok = [r for r in results if r["preset"] == preset and not r["error"]]
+        runs = sum(1 for r in results if r["preset"] == preset)
+        peak = max((r["peak_rss_mb"] for r in ok), default=0.0)
+        secs = sum(r["seconds"] for r in ok) / len(ok) if ok else 0.0
+        print(f"{preset:<10} {runs:>4} {len(ok):>3} {peak:>13.0f} {secs:>8.1f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -27,13 +27,20 @@ def build_parser() -> argparse.ArgumentParser:
     login = sub.add_parser("login", help="Capture auth/device info for keepalive.")
     login.add_argument(
         "--backend",
-        choices=["selenium", "playwright"],
+        choices=["selenium", "playwright", "playwright-async"],
         default="selenium",
         help="Browser automation backend.",
     )
     login.add_argument("--profile-dir", default=None, help="Persistent profile dir.")
     login.add_argument("--timeout", type=int, default=None, help="Wait timeout seconds.")
     login.add_argument("--out", default=None, help="Output config path.")
+    login.add_argument(
+        "--accounts", default=None, help="Playwright: log in every account in accounts.json."
+    )
+    login.add_argument(
+        "--max-contexts", type=int, default=None, help="Playwright: concurrent login contexts."
+    )
+    login.add_argument("--state-dir", default=None, help="Playwright: storage state dir.")
     login.add_argument("--chromedriver", default=None, help="Path to chromedriver.")
     login.add_argument("--chrome-binary", default=None, help="Path to Chrome binary.")
     login.add_argument("--edgedriver", default=None, help="Path to msedgedriver.")
@@ -64,6 +71,27 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Force headless for selenium even if profile is new.",
     )
+    login.add_argument(
+        "--rss-budget-mb", type=float, default=None, help="Selenium browser memory budget."
+    )
+    login.add_argument(
+        "--browser-preset", choices=["default", "lean"], default=None, help="Launch preset."
+    )
+    login.add_argument("--headless-shell", default=None, help="Path to chrome-headless-shell.")
+    login.add_argument(
+        "--tmpfs-profile", action="store_true", help="Run the browser from a tmpfs profile copy."
+    )
+    login.add_argument("--tmpfs-dir", default=None, help="tmpfs mount for --tmpfs-profile.")
+    login.add_argument(
+        "--profile-budget-mb", type=float, default=None, help="Trim caches above this size."
+    )
+    login.add_argument("--remote", default=None, help="Selenium Grid / remote WebDriver URLs.")
+    login.add_argument("--remote-profile-dir", default=None, help="Profile dir on the node.")
+    login.add_argument("--launch-deadline", type=int, default=None, help="Browser start deadline.")
+    login.add_argument("--login-deadline", type=int, default=None, help="Login phase deadline.")
+    login.add_argument(
+        "--connect-deadline", type=int, default=None, help="Connect-capture phase deadline."
+    )
     login.add_argument(
         "--captcha-mode",
         choices=["auto", "manual", "off"],
@@ -110,15 +138,65 @@ def build_parser() -> argparse.ArgumentParser:
     keepalive.add_argument("--config", default=None, help="Path to config.json.")
     keepalive.add_argument("--interval", type=int, default=None, help="Seconds between requests.")
     keepalive.add_argument("--once", action="store_true", help="Send once and exit.")
+    keepalive.add_argument("--hedge", action="store_true", help="Hedge slow requests.")
+    keepalive.add_argument(
+        "--profile-dir", default=None, help="Refresh authData from this profile first."
+    )
+    keepalive.add_argument(
+        "--profile-cookies", action="store_true", help="Send the profile's cookies too."
+    )
+
+    config = sub.add_parser("config", help="List or roll back saved config.json versions.")
+    config.add_argument("--config", default=None, help="Path to config.json.")
+    config.add_argument("--rollback", type=int, default=None, help="Restore history version N.")
+
+    probe = sub.add_parser("probe", help="Check whether the saved session is still valid.")
+    probe.add_argument("--config", default=None, help="Path to config.json.")
+    probe.add_argument("--probe-url", default=None, help="Signed read-only endpoint to call.")
+
+    ctl = sub.add_parser("ctl", help="Send a command to a running auto/daemon process.")
+    ctl.add_argument(
+        "command", help="status | trigger | relogin | pause | resume | metrics | reload"
+    )
+    ctl.add_argument("account", nargs="?", default=None, help="Account name (daemon).")
+    ctl.add_argument("--socket", default=None, help="Control socket path.")
 
     once = sub.add_parser("once", help="Send one keepalive request and exit.")
     once.add_argument("--config", default=None, help="Path to config.json.")
+    once.add_argument(
+        "--profile-dir", default=None, help="Refresh authData from this profile first."
+    )
+    once.add_argument(
+        "--profile-cookies", action="store_true", help="Send the profile's cookies too."
+    )
 
     auto = sub.add_parser(
         "auto", help="Auto keepalive with login refresh when config is missing/expired."
     )
     auto.add_argument("--config", default=None, help="Path to config.json.")
     auto.add_argument("--interval", type=int, default=None, help="Seconds between requests.")
+    auto.add_argument("--settings", default=None, help="Option overrides, re-read on SIGHUP.")
+    auto.add_argument("--control-socket", default=None, help="Unix socket for 'ctl'.")
+    auto.add_argument("--no-control", action="store_true", help="Don't open a control socket.")
+    auto.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="HTTP keepalive with interval learned from observed session lifetime.",
+    )
+    auto.add_argument("--min-interval", type=int, default=None, help="Adaptive lower bound.")
+    auto.add_argument("--max-interval", type=int, default=None, help="Adaptive upper bound.")
+    auto.add_argument("--schedule-state", default=None, help="Adaptive scheduler state file.")
+    auto.add_argument("--hedge", action="store_true", help="Hedge slow keepalive requests.")
+    auto.add_argument(
+        "--profile-cookies", action="store_true", help="Send the profile's cookies too."
+    )
+    auto.add_argument("--probe-url", default=None, help="Session probe endpoint.")
+    auto.add_argument(
+        "--preemptive-relogin",
+        action="store_true",
+        help="Log in again in the background before the session expires.",
+    )
+    auto.add_argument("--session-lifetime", type=int, default=None, help="Session lifetime (s).")
     auto.add_argument(
         "--backend",
         choices=["selenium", "playwright"],
@@ -163,6 +241,33 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Seconds to keep browser open after success (0 = don't close).",
     )
+    auto.add_argument(
+        "--rss-budget-mb", type=float, default=None, help="Browser memory budget (selenium)."
+    )
+    auto.add_argument(
+        "--browser-preset", choices=["default", "lean"], default=None, help="Launch preset."
+    )
+    auto.add_argument("--headless-shell", default=None, help="Path to chrome-headless-shell.")
+    auto.add_argument(
+        "--tmpfs-profile", action="store_true", help="Run the browser from a tmpfs profile copy."
+    )
+    auto.add_argument("--tmpfs-dir", default=None, help="tmpfs mount for --tmpfs-profile.")
+    auto.add_argument(
+        "--profile-budget-mb", type=float, default=None, help="Trim caches above this size."
+    )
+    auto.add_argument("--remote", default=None, help="Selenium Grid / remote WebDriver URLs.")
+    auto.add_argument("--remote-profile-dir", default=None, help="Profile dir on the node.")
+    auto.add_argument(
+        "--login-worker",
+        choices=["subprocess", "inprocess"],
+        default=None,
+        help="Run browser logins in this process (default) or in a child process.",
+    )
+    auto.add_argument("--launch-deadline", type=int, default=None, help="Browser start deadline.")
+    auto.add_argument("--login-deadline", type=int, default=None, help="Login phase deadline.")
+    auto.add_argument(
+        "--connect-deadline", type=int, default=None, help="Connect-capture phase deadline."
+    )
     auto.add_argument(
         "--captcha-mode",
         choices=["auto", "manual", "off"],
@@ -205,6 +310,32 @@ def build_parser() -> argparse.ArgumentParser:
         help="Send a startup test message to verify Telegram config.",
     )
 
+    daemon = sub.add_parser("daemon", help="Multi-account keepalive daemon.")
+    daemon.add_argument("--accounts", default=None, help="Path to accounts.json.")
+    daemon.add_argument("--interval", type=int, default=None, help="Default keepalive interval.")
+    daemon.add_argument("--min-interval", type=int, default=None, help="Adaptive lower bound.")
+    daemon.add_argument("--max-interval", type=int, default=None, help="Adaptive upper bound.")
+    daemon.add_argument("--workers", type=int, default=None, help="Keepalive worker threads.")
+    daemon.add_argument("--tick", type=float, default=None, help="Timing wheel tick seconds.")
+    daemon.add_argument("--login-workers", type=int, default=None, help="Parallel logins.")
+    daemon.add_argument(
+        "--login-min-free-mb", type=float, default=None, help="MemAvailable for another login."
+    )
+    daemon.add_argument("--hedge", action="store_true", help="Hedge slow keepalive requests.")
+    daemon.add_argument(
+        "--profile-cookies", action="store_true", help="Send each profile's cookies too."
+    )
+    daemon.add_argument(
+        "--preemptive-relogin",
+        action="store_true",
+        help="Log accounts in again in the background before sessions expire.",
+    )
+    daemon.add_argument("--control-socket", default=None, help="Unix socket for 'ctl'.")
+    daemon.add_argument("--no-control", action="store_true", help="Don't open a control socket.")
+    daemon.add_argument("--lease", default=None, help="Shared lease store (sqlite:/dir:).")
+    daemon.add_argument("--lease-ttl", type=float, default=None, help="Lease TTL seconds.")
+    daemon.add_argument("--node-id", default=None, help="This node's lease owner name.")
+
     return parser
 
 
@@ -217,6 +348,23 @@ def main() -> None:
     args = parser.parse_args()
 
     if args.cmd == "login":
+        if args.backend == "playwright-async":
+            from keepliver import ctyun_auto_async as mod
+
+            argv = ["ctyun_auto_async.py"]
+            _add_if(argv, "--timeout", args.timeout)
+            _add_if(argv, "--out", args.out)
+            _add_if(argv, "--accounts", args.accounts)
+            _add_if(argv, "--max-contexts", args.max_contexts)
+            _add_if(argv, "--state-dir", args.state_dir)
+            _add_if(argv, "--account", args.account)
+            _add_if(argv, "--password", args.password)
+            _add_if(argv, "--secrets", args.secrets)
+            if args.headless:
+                argv.append("--headless")
+            _run_module_main(mod, argv)
+            return
+
         if args.backend == "playwright":
             from keepliver import ctyun_auto as mod
 
@@ -224,6 +372,9 @@ def main() -> None:
             _add_if(argv, "--profile-dir", args.profile_dir)
             _add_if(argv, "--timeout", args.timeout)
             _add_if(argv, "--out", args.out)
+            _add_if(argv, "--accounts", args.accounts)
+            _add_if(argv, "--max-contexts", args.max_contexts)
+            _add_if(argv, "--state-dir", args.state_dir)
             if args.headless:
                 argv.append("--headless")
             _run_module_main(mod, argv)
@@ -260,6 +411,18 @@ def main() -> None:
             argv.append("--force-headless")
         if args.auto_connect:
             argv.append("--auto-connect")
+        _add_if(argv, "--rss-budget-mb", args.rss_budget_mb)
+        _add_if(argv, "--browser-preset", args.browser_preset)
+        _add_if(argv, "--headless-shell", args.headless_shell)
+        if args.tmpfs_profile:
+            argv.append("--tmpfs-profile")
+        _add_if(argv, "--tmpfs-dir", args.tmpfs_dir)
+        _add_if(argv, "--profile-budget-mb", args.profile_budget_mb)
+        _add_if(argv, "--remote", args.remote)
+        _add_if(argv, "--remote-profile-dir", args.remote_profile_dir)
+        _add_if(argv, "--launch-deadline", args.launch_deadline)
+        _add_if(argv, "--login-deadline", args.login_deadline)
+        _add_if(argv, "--connect-deadline", args.connect_deadline)
         _run_module_main(mod, argv)
         return
 
@@ -268,10 +431,43 @@ def main() -> None:
 
         argv = ["keepalive.py"]
         _add_if(argv, "--config", args.config)
+        _add_if(argv, "--profile-dir", args.profile_dir)
         if args.cmd == "keepalive":
             _add_if(argv, "--interval", args.interval)
         if args.cmd == "once" or args.once:
             argv.append("--once")
+        if getattr(args, "hedge", False):
+            argv.append("--hedge")
+        if args.profile_cookies:
+            argv.append("--profile-cookies")
+        _run_module_main(mod, argv)
+        return
+
+    if args.cmd == "config":
+        from keepliver import config_store as mod
+
+        argv = ["config_store.py"]
+        _add_if(argv, "--config", args.config)
+        _add_if(argv, "--rollback", args.rollback)
+        _run_module_main(mod, argv)
+        return
+
+    if args.cmd == "ctl":
+        from keepliver import control as mod
+
+        argv = ["control.py", args.command]
+        if args.account:
+            argv.append(args.account)
+        _add_if(argv, "--socket", args.socket)
+        _run_module_main(mod, argv)
+        return
+
+    if args.cmd == "probe":
+        from keepliver import probe as mod
+
+        argv = ["probe.py"]
+        _add_if(argv, "--config", args.config)
+        _add_if(argv, "--probe-url", args.probe_url)
         _run_module_main(mod, argv)
         return
 
@@ -281,6 +477,23 @@ def main() -> None:
         argv = ["auto.py"]
         _add_if(argv, "--config", args.config)
         _add_if(argv, "--interval", args.interval)
+        _add_if(argv, "--settings", args.settings)
+        _add_if(argv, "--control-socket", args.control_socket)
+        if args.no_control:
+            argv.append("--no-control")
+        if args.adaptive:
+            argv.append("--adaptive")
+        _add_if(argv, "--min-interval", args.min_interval)
+        _add_if(argv, "--max-interval", args.max_interval)
+        _add_if(argv, "--schedule-state", args.schedule_state)
+        if args.hedge:
+            argv.append("--hedge")
+        if args.profile_cookies:
+            argv.append("--profile-cookies")
+        _add_if(argv, "--probe-url", args.probe_url)
+        if args.preemptive_relogin:
+            argv.append("--preemptive-relogin")
+        _add_if(argv, "--session-lifetime", args.session_lifetime)
         _add_if(argv, "--backend", args.backend)
         _add_if(argv, "--profile-dir", args.profile_dir)
         _add_if(argv, "--timeout", args.timeout)
@@ -310,6 +523,46 @@ def main() -> None:
         if args.auto_connect:
             argv.append("--auto-connect")
         _add_if(argv, "--keep-browser", args.keep_browser)
+        _add_if(argv, "--rss-budget-mb", args.rss_budget_mb)
+        _add_if(argv, "--browser-preset", args.browser_preset)
+        _add_if(argv, "--headless-shell", args.headless_shell)
+        if args.tmpfs_profile:
+            argv.append("--tmpfs-profile")
+        _add_if(argv, "--tmpfs-dir", args.tmpfs_dir)
+        _add_if(argv, "--profile-budget-mb", args.profile_budget_mb)
+        _add_if(argv, "--remote", args.remote)
+        _add_if(argv, "--remote-profile-dir", args.remote_profile_dir)
+        _add_if(argv, "--login-worker", args.login_worker)
+        _add_if(argv, "--launch-deadline", args.launch_deadline)
+        _add_if(argv, "--login-deadline", args.login_deadline)
+        _add_if(argv, "--connect-deadline", args.connect_deadline)
+        _run_module_main(mod, argv)
+        return
+
+    if args.cmd == "daemon":
+        from keepliver import daemon as mod
+
+        argv = ["daemon.py"]
+        _add_if(argv, "--accounts", args.accounts)
+        _add_if(argv, "--interval", args.interval)
+        _add_if(argv, "--min-interval", args.min_interval)
+        _add_if(argv, "--max-interval", args.max_interval)
+        _add_if(argv, "--workers", args.workers)
+        _add_if(argv, "--tick", args.tick)
+        _add_if(argv, "--login-workers", args.login_workers)
+        _add_if(argv, "--login-min-free-mb", args.login_min_free_mb)
+        if args.hedge:
+            argv.append("--hedge")
+        if args.profile_cookies:
+            argv.append("--profile-cookies")
+        if args.preemptive_relogin:
+            argv.append("--preemptive-relogin")
+        _add_if(argv, "--control-socket", args.control_socket)
+        if args.no_control:
+            argv.append("--no-control")
+        _add_if(argv, "--lease", args.lease)
+        _add_if(argv, "--lease-ttl", args.lease_ttl)
+        _add_if(argv, "--node-id", args.node_id)
         _run_module_main(mod, argv)
         return
 
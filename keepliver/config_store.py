@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+import argparse
+import copy
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Past versions kept next to the config as <config>.1 (newest) .. <config>.N.
+DEFAULT_HISTORY = 3
+
+# path -> ((mtime_ns, size, inode), parsed config)
+_CACHE: Dict[str, Tuple[Tuple[int, int, int], Dict]] = {}
+_CACHE_LOCK = threading.Lock()
+_WRITE_LOCK = threading.Lock()
+
+
+def _stat_key(st: os.stat_result) -> Tuple[int, int, int]:
+    # Size and inode catch a rename-over within one mtime tick on coarse filesystems.
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _fsync_dir(path: str) -> None:
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        # Windows can't open directories; the rename is still atomic there.
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_atomic(path: str, text: str) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(path)
+
+
+def history_path(path: str, version: int) -> str:
+    return f"{path}.{version}"
+
+
+def history(path: str, keep: int = DEFAULT_HISTORY) -> List[str]:
+    paths = [history_path(path, n) for n in range(1, keep + 1)]
+    return [p for p in paths if os.path.exists(p)]
+
+
+def _rotate(path: str, keep: int) -> None:
+    if keep <= 0 or not os.path.exists(path):
+        return
+    for n in range(keep, 1, -1):
+        older = history_path(path, n - 1)
+        if os.path.exists(older):
+            os.replace(older, history_path(path, n))
+    # Copy, don't move: the live config must exist at every instant.
+    tmp_path = history_path(path, 1) + ".tmp"
+    shutil.copy2(path, tmp_path)
+    os.replace(tmp_path, history_path(path, 1))
+
+
+def save_config(path: str, cfg: Dict, keep: int = DEFAULT_HISTORY) -> None:
+    text = json.dumps(cfg, ensure_ascii=True, indent=2)
+    with _WRITE_LOCK:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                unchanged = f.read() == text
+        except OSError:
+            unchanged = False
+        if unchanged:
+            return
+        _rotate(path, keep)
+        _write_atomic(path, text)
+        st = os.stat(path)
+    with _CACHE_LOCK:
+        _CACHE[os.path.abspath(path)] = (_stat_key(st), copy.deepcopy(cfg))
+
+
+def _parse(path: str) -> Tuple[Tuple[int, int, int], Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        st = os.fstat(f.fileno())
+        return _stat_key(st), json.load(f)
+
+
+def load_config(path: str, fallback: bool = True) -> Dict:
+    """Parsed config, re-read only when the file changed. Callers get their own copy.
+
+    A file that doesn't parse (written by an older, non-atomic version) falls back to the
+    newest history version that does, instead of looking like a missing login.
+    """
+    key = os.path.abspath(path)
+    st = os.stat(path)
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+    if cached is not None and cached[0] == _stat_key(st):
+        return copy.deepcopy(cached[1])
+    try:
+        stat_key, cfg = _parse(path)
+    except ValueError:
+        if not fallback:
+            raise
+        for old in history(path):
+            try:
+                _stat_key_old, cfg = _parse(old)
+            except (OSError, ValueError):
+                continue
+            print(f"Warning: {path} is not valid JSON, using {old}")
+            return cfg
+        raise
+    with _CACHE_LOCK:
+        _CACHE[key] = (stat_key, cfg)
+    return copy.deepcopy(cfg)
+
+
+def rollback(path: str, version: int = 1) -> Dict:
+    """Make history version N current again; the replaced config becomes version 1."""
+    with open(history_path(path, version), "r", encoding="utf-8") as f:
+        cfg = json.load(f)
+    save_config(path, cfg)
+    return cfg
+
+
+def invalidate(path: Optional[str] = None) -> None:
+    with _CACHE_LOCK:
+        if path is None:
+            _CACHE.clear()
+        else:
+            _CACHE.pop(os.path.abspath(path), None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or roll back config.json versions.")
+    parser.add_argument("--config", default="keepliver/config.json", help="Path to config.json.")
+    parser.add_argument("--rollback", type=int, default=None, help="Restore history version N.")
+    args = parser.parse_args()
+    if args.rollback is not None:
+        cfg = rollback(args.config, args.rollback)
+        user = (cfg.get("auth") or {}).get("userAccount")
+        print(f"Restored {history_path(args.config, args.rollback)} -> {args.config} ({user})")
+        return
+    if not os.path.exists(args.config):
+        raise SystemExit(f"config not found: {args.config}")
+    for old in [args.config] + history(args.config):
+        saved = datetime.fromtimestamp(os.path.getmtime(old)).isoformat(sep=" ", timespec="seconds")
+        print(f"{saved}\t{old}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+# One JSON object per line each way: {"cmd": ..., "account": ...} -> {"ok": ..., "result"/"error"}.
+Handler = Callable[[Dict], Any]
+
+
+def default_socket_path() -> str:
+    path = os.environ.get("KEEPLIVER_SOCKET")
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "keepliver.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), f"keepliver-{uid}.sock")
+
+
+class CommandError(Exception):
+    pass
+
+
+def format_ts(ts: Optional[float]) -> Optional[str]:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts).astimezone().isoformat(sep=" ", timespec="seconds")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline(65536)
+        try:
+            request = json.loads(line.decode("utf-8") or "{}")
+            if not isinstance(request, dict):
+                raise CommandError("request must be a JSON object")
+            handler = self.server.handlers.get(request.get("cmd"))
+            if handler is None:
+                names = ", ".join(sorted(self.server.handlers))
+                raise CommandError(f"unknown command {request.get('cmd')!r} (try: {names})")
+            response = {"ok": True, "result": handler(request)}
+        except (CommandError, ValueError) as e:
+            response = {"ok": False, "error": str(e)}
+        except Exception as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(response, ensure_ascii=False, default=str).encode("utf-8"))
+        self.wfile.write(b"\n")
+
+
+def _socket_in_use(path: str) -> bool:
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.settimeout(1.0)
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+class ControlServer:
+    def __init__(self, path: str, handlers: Dict[str, Handler]):
+        self.path = path
+        self.handlers = handlers
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+
+    def start(self) -> bool:
+        if not hasattr(socket, "AF_UNIX"):
+            print("Control socket not supported on this platform; skipping.")
+            return False
+        if os.path.exists(self.path):
+            if _socket_in_use(self.path):
+                print(f"Control socket {self.path} is in use by another process; skipping.")
+                return False
+            os.remove(self.path)
+        # Commands can trigger logins: only the owning user may connect, from the first moment.
+        old_umask = os.umask(0o177)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(self.path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        server.daemon_threads = True
+        server.handlers = self.handlers
+        threading.Thread(target=server.serve_forever, name="keepliver-control", daemon=True).start()
+        self._server = server
+        print(f"Control socket: {self.path}", flush=True)
+        return True
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def send_command(path: str, cmd: str, timeout: float = 10.0, **params) -> Dict:
+    request = dict(params, cmd=cmd)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError(f"no response from {path}")
+    return json.loads(line.decode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Talk to a running auto/daemon process.")
+    parser.add_argument(
+        "command",
+        help="status | trigger | relogin | pause | resume | metrics | reload",
+    )
+    parser.add_argument("account", nargs="?", default=None, help="Account name (daemon).")
+    parser.add_argument("--socket", default=None, help="Control socket path.")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args()
+    path = args.socket or default_socket_path()
+    params = {"account": args.account} if args.account else {}
+    try:
+        response = send_command(path, args.command, timeout=args.timeout, **params)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"cannot reach keepliver at {path}: {e}")
+    if not response.get("ok"):
+        raise SystemExit(f"error: {response.get('error')}")
+    result = response.get("result")
+    if isinstance(result, str):
+        print(result)
+    else:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
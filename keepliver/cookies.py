@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from typing import List, Optional
+
+import requests
+
+# Chromium on Linux without a keyring ("basic" password store) encrypts with this.
+_V10_PASSWORD = b"peanuts"
+# With a keyring that returned nothing, v11 values end up keyed by an empty password.
+_V11_FALLBACK_PASSWORDS = [b""]
+_SALT = b"saltysalt"
+_IV = b" " * 16
+# Cookies DB meta version from which plaintext is prefixed with sha256(host_key).
+_HOST_DIGEST_VERSION = 24
+# Chrome epoch (1601-01-01) to Unix epoch, in seconds.
+_CHROME_EPOCH_OFFSET = 11644473600
+
+_CRYPTO_WARNED = False
+
+
+def _derive_key(password: bytes) -> bytes:
+    return hashlib.pbkdf2_hmac("sha1", password, _SALT, 1, dklen=16)
+
+
+def _aes_cbc_decrypt(key: bytes, data: bytes) -> Optional[bytes]:
+    global _CRYPTO_WARNED
+    try:
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    except Exception:
+        if not _CRYPTO_WARNED:
+            print(
+                "cryptography not installed; encrypted cookies skipped. "
+                "Run: pip install -e '.[cookies]'"
+            )
+            _CRYPTO_WARNED = True
+        return None
+    if not data or len(data) % 16:
+        return None
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(_IV)).decryptor()
+    padded = decryptor.update(data) + decryptor.finalize()
+    pad = padded[-1]
+    if pad < 1 or pad > 16 or padded[-pad:] != bytes([pad]) * pad:
+        return None
+    return padded[:-pad]
+
+
+def decrypt_cookie_value(
+    encrypted: bytes,
+    host_key: str,
+    db_version: int = 0,
+    keyring_password: Optional[bytes] = None,
+) -> Optional[str]:
+    prefix = encrypted[:3]
+    if prefix == b"v10":
+        passwords = [_V10_PASSWORD]
+    elif prefix == b"v11":
+        passwords = ([keyring_password] if keyring_password else []) + _V11_FALLBACK_PASSWORDS
+    else:
+        return None
+    for password in passwords:
+        plain = _aes_cbc_decrypt(_derive_key(password), encrypted[3:])
+        if plain is None:
+            continue
+        if db_version >= _HOST_DIGEST_VERSION:
+            if plain[:32] != hashlib.sha256(host_key.encode("utf-8")).digest():
+                continue
+            plain = plain[32:]
+        try:
+            return plain.decode("utf-8")
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+def cookies_db_path(profile_dir: str) -> Optional[str]:
+    for rel in (("Default", "Network", "Cookies"), ("Default", "Cookies")):
+        path = os.path.join(profile_dir, *rel)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _query_cookies(db_path: str, domain: str):
+    # Copy first: the browser may hold the DB (and its WAL) open while we read.
+    with tempfile.TemporaryDirectory() as tmp:
+        copy_path = os.path.join(tmp, "Cookies")
+        shutil.copy2(db_path, copy_path)
+        for suffix in ("-wal", "-journal"):
+            if os.path.exists(db_path + suffix):
+                shutil.copy2(db_path + suffix, copy_path + suffix)
+        conn = sqlite3.connect(copy_path)
+        try:
+            try:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+                version = int(row[0]) if row else 0
+            except sqlite3.Error:
+                version = 0
+            rows = conn.execute(
+                "SELECT host_key, name, value, encrypted_value, path, expires_utc, is_secure "
+                "FROM cookies WHERE host_key LIKE ?",
+                (f"%{domain}",),
+            ).fetchall()
+        finally:
+            conn.close()
+    return version, rows
+
+
+def load_profile_cookies(
+    profile_dir: str,
+    domain: str = "ctyun.cn",
+    keyring_password: Optional[bytes] = None,
+) -> List[dict]:
+    db_path = cookies_db_path(profile_dir)
+    if not db_path:
+        return []
+    version, rows = _query_cookies(db_path, domain)
+    cookies = []
+    for host_key, name, value, encrypted, path, expires_utc, is_secure in rows:
+        if not value and encrypted:
+            value = decrypt_cookie_value(bytes(encrypted), host_key, version, keyring_password)
+        if value is None:
+            continue
+        expires = None
+        if expires_utc:
+            expires = int(expires_utc / 1000000 - _CHROME_EPOCH_OFFSET)
+        cookies.append(
+            {
+                "domain": host_key,
+                "name": name,
+                "value": value,
+                "path": path or "/",
+                "expires": expires,
+                "secure": bool(is_secure),
+            }
+        )
+    return cookies
+
+
+class ProfileCookieSession(requests.Session):
+    """requests.Session carrying the profile's cookies, reloaded when the DB changes."""
+
+    def __init__(self, profile_dir: str, domain: str = "ctyun.cn"):
+        super().__init__()
+        self.profile_dir = profile_dir
+        self.domain = domain
+        self.keyring_password = os.environ.get("KEEPLIVER_COOKIE_PASSWORD", "").encode() or None
+        self._mtime: Optional[float] = None
+        self._reload_lock = threading.Lock()
+        self.reload_if_changed()
+
+    def reload_if_changed(self) -> bool:
+        db_path = cookies_db_path(self.profile_dir)
+        if not db_path:
+            return False
+        with self._reload_lock:
+            mtime = os.path.getmtime(db_path)
+            if mtime == self._mtime:
+                return False
+            try:
+                cookies = load_profile_cookies(self.profile_dir, self.domain, self.keyring_password)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Warning: cannot read cookies from {db_path}: {e}")
+                return False
+            self._mtime = mtime
+            self.cookies.clear()
+            for c in cookies:
+                self.cookies.set(
+                    c["name"],
+                    c["value"],
+                    domain=c["domain"],
+                    path=c["path"],
+                    secure=c["secure"],
+                    expires=c["expires"],
+                )
+            return True
+
+    def request(self, method, url, *args, **kwargs):
+        self.reload_if_changed()
+        return super().request(method, url, *args, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List pc.ctyun.cn cookies from a browser profile.")
+    parser.add_argument(
+        "--profile-dir",
+        default=os.path.join(os.path.dirname(__file__), ".selenium-profile"),
+        help="Browser user-data dir.",
+    )
+    parser.add_argument("--domain", default="ctyun.cn", help="Cookie domain suffix.")
+    args = parser.parse_args()
+    cookies = load_profile_cookies(args.profile_dir, args.domain)
+    if not cookies:
+        raise SystemExit(f"no cookies for {args.domain} in {args.profile_dir}")
+    for c in cookies:
+        print(f"{c['domain']}\t{c['path']}\t{c['name']}\t{len(c['value'])} chars")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,46 @@ import argparse
 import json
 import os
 import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from keepliver.config_store import save_config
+
+PORTAL_URL = "https://pc.ctyun.cn"
+DESKTOP_LIST_URL = "https://pc.ctyun.cn/#/desktop-list"
+CONNECT_PATH = "/api/desktop/client/connect"
+
+HOOK_JS = """
+(() => {
+  const keys = [
+    "objId","objType","osType","deviceId","deviceCode",
+    "deviceName","sysVersion","appVersion","hostName",
+    "vdCommand","ipAddress","macAddress","hardwareFeatureCode"
+  ];
+  const origStringify = JSON.stringify;
+  JSON.stringify = function (value, ...rest) {
+    try {
+      if (value && typeof value === "object") {
+        const hit = keys.every(k => k in value);
+        if (hit) {
+          window.__ctyun_device_info = value;
+        }
+      }
+    } catch (e) {}
+    return origStringify.apply(this, arguments);
+  };
+})();
+"""
+
+# Same candidates as the selenium backend.
+_CLICK_BY_TEXT_JS = """
+(texts) => {
+  const els = Array.from(document.querySelectorAll('button, a, div, span'));
+  const el = els.find(e => texts.includes((e.innerText || '').trim()));
+  if (el) { el.click(); return true; }
+  return false;
+}
+"""
 
 
 def _safe_json_loads(text: str):
@@ -12,6 +52,198 @@ def _safe_json_loads(text: str):
         return None
 
 
+def _capture_headers(request) -> Optional[Dict]:
+    """url + ctg-* headers of the connect POST, or None for any other request."""
+    url = request.url or ""
+    if CONNECT_PATH not in url or request.method != "POST":
+        return None
+    headers = request.headers
+    ctg_headers = {k: v for k, v in headers.items() if k.lower().startswith("ctg-")}
+    return {"url": url, "ctg_headers": ctg_headers}
+
+
+def build_output(capture: Dict, device_info: Dict, auth_data: Dict) -> Dict:
+    return {
+        "connect_url": capture["url"],
+        "ctg_headers": capture["ctg_headers"],
+        "device_info": device_info,
+        "auth": {
+            "userId": auth_data.get("userId"),
+            "tenantId": auth_data.get("tenantId"),
+            "secretKey": auth_data.get("secretKey"),
+            "userAccount": auth_data.get("userAccount"),
+        },
+    }
+
+
+def storage_state_path(options: Dict, state_dir: Optional[str] = None) -> str:
+    """Where an account's cookies/localStorage are kept between runs."""
+    if options.get("storage_state"):
+        return options["storage_state"]
+    if state_dir:
+        return os.path.join(state_dir, f"{options['name']}.storage.json")
+    return os.path.splitext(options["config"])[0] + ".storage.json"
+
+
+def _account_credentials(options: Dict):
+    account, password = options.get("account"), options.get("password")
+    if (not account or not password) and options.get("secrets"):
+        try:
+            with open(options["secrets"], "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+        if isinstance(data, dict):
+            account = account or data.get("account")
+            password = password or data.get("password")
+    return account, password
+
+
+class ContextLogin:
+    """One account's login in a shared browser: its own context, storage state and captures."""
+
+    def __init__(self, options: Dict, timeout: float, state_dir: Optional[str] = None):
+        self.name = options["name"]
+        self.out = options["config"]
+        self.state_path = storage_state_path(options, state_dir)
+        self.account, self.password = _account_credentials(options)
+        self.timeout = timeout
+        self.context = None
+        self.page = None
+        self.auth_data: Optional[Dict] = None
+        self.capture: Optional[Dict] = None
+        self.device_info: Optional[Dict] = None
+        self.deadline = 0.0
+        self._next_click = 0.0
+
+    def open(self, browser) -> None:
+        state = self.state_path if os.path.exists(self.state_path) else None
+        self.context = browser.new_context(storage_state=state)
+        self.context.add_init_script(HOOK_JS)
+        self.page = self.context.new_page()
+        self.page.on("request", self._on_request)
+        self.page.goto(PORTAL_URL, wait_until="domcontentloaded")
+        self.deadline = time.time() + self.timeout
+        if self.account and self.password:
+            # A restored state usually lands on the desktop list with no form to fill.
+            self._fill_login(restored=state is not None)
+
+    def _on_request(self, request) -> None:
+        capture = _capture_headers(request)
+        if capture:
+            self.capture = capture
+
+    def _fill_login(self, restored: bool = False) -> None:
+        page = self.page
+        try:
+            page.evaluate(_CLICK_BY_TEXT_JS, ["账号登录", "密码登录", "账户登录", "账号登陆"])
+            page.wait_for_selector("input.account", timeout=3000 if restored else 10000)
+        except Exception:
+            if not restored:
+                print(f"[{self.name}] Account form not found; please login manually.")
+            return
+        try:
+            page.fill("input.account", self.account, timeout=10000)
+            page.fill("input.password", self.password, timeout=10000)
+            page.check("input.el-checkbox__original", force=True, timeout=2000)
+        except Exception as e:
+            print(f"[{self.name}] Account form not filled ({e}); please login manually.")
+            return
+        try:
+            page.click(".btn-submit-pc, .btn-submit", timeout=5000)
+        except Exception:
+            page.evaluate(_CLICK_BY_TEXT_JS, ["登录", "安全登录"])
+
+    def poll(self) -> Optional[bool]:
+        """True once the config is saved, False on timeout, None while still waiting."""
+        if self.auth_data is None:
+            auth_text = self.page.evaluate("localStorage.getItem('authData')")
+            self.auth_data = _safe_json_loads(auth_text) if auth_text else None
+            if self.auth_data:
+                print(f"[{self.name}] authData found; connecting to capture device_info...")
+                self.page.goto(DESKTOP_LIST_URL, wait_until="domcontentloaded")
+        else:
+            if self.device_info is None:
+                self.device_info = self.page.evaluate("window.__ctyun_device_info || null")
+            if self.device_info and self.capture:
+                save_config(self.out, build_output(self.capture, self.device_info, self.auth_data))
+                print(f"[{self.name}] Saved: {self.out}")
+                return True
+            if time.time() >= self._next_click:
+                self._next_click = time.time() + 5
+                self.page.evaluate(_CLICK_BY_TEXT_JS, ["进入AI云电脑", "连接云电脑", "连接"])
+        if time.time() > self.deadline:
+            what = "device_info/ctg headers" if self.auth_data else "authData"
+            print(f"[{self.name}] {what} not captured within {self.timeout:.0f}s.")
+            return False
+        return None
+
+    def close(self) -> None:
+        if self.context is None:
+            return
+        try:
+            # Only a logged-in state is worth restoring next time.
+            if self.auth_data:
+                os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+                self.context.storage_state(path=self.state_path)
+                os.chmod(self.state_path, 0o600)
+        except Exception as e:
+            print(f"[{self.name}] Warning: failed to save storage state: {e}")
+        try:
+            self.context.close()
+        except Exception:
+            pass
+        self.context = None
+        self.page = None
+
+
+def login_accounts(
+    accounts: List[Dict],
+    headless: bool = False,
+    timeout: float = 600,
+    max_contexts: int = 4,
+    state_dir: Optional[str] = None,
+) -> Dict[str, bool]:
+    """Log in every account through one browser, at most max_contexts contexts at a time."""
+    from playwright.sync_api import sync_playwright
+
+    pending = deque(ContextLogin(a, timeout, state_dir) for a in accounts)
+    active: List[ContextLogin] = []
+    results: Dict[str, bool] = {}
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless)
+        try:
+            while pending or active:
+                while pending and len(active) < max(1, max_contexts):
+                    session = pending.popleft()
+                    try:
+                        session.open(browser)
+                        active.append(session)
+                    except Exception as e:
+                        print(f"[{session.name}] Failed to open login page: {e}")
+                        results[session.name] = False
+                        session.close()
+                for session in list(active):
+                    try:
+                        done = session.poll()
+                    except Exception as e:
+                        print(f"[{session.name}] Login failed: {e}")
+                        done = False
+                    if done is None:
+                        continue
+                    results[session.name] = done
+                    session.close()
+                    active.remove(session)
+                if active:
+                    # Sync Playwright only delivers request events while it is called.
+                    active[0].page.wait_for_timeout(500)
+        finally:
+            for session in active:
+                session.close()
+            browser.close()
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Auto-capture CTYUN device_info + ctg headers + authData via Playwright."
@@ -37,6 +269,22 @@ def main():
         default=os.path.join(os.path.dirname(__file__), "config.json"),
         help="Output config path.",
     )
+    parser.add_argument(
+        "--accounts",
+        default=None,
+        help="accounts.json: log in every account in one browser, one context each.",
+    )
+    parser.add_argument(
+        "--max-contexts",
+        type=int,
+        default=4,
+        help="With --accounts: max concurrent login contexts in the shared browser.",
+    )
+    parser.add_argument(
+        "--state-dir",
+        default=None,
+        help="With --accounts: dir for <name>.storage.json (default: next to each config).",
+    )
     args = parser.parse_args()
 
     try:
@@ -46,40 +294,30 @@ def main():
         print("Then run: playwright install")
         raise
 
+    if args.accounts:
+        from keepliver.daemon import load_accounts
+
+        accounts = load_accounts(args.accounts)
+        results = login_accounts(
+            accounts,
+            headless=args.headless,
+            timeout=args.timeout,
+            max_contexts=args.max_contexts,
+            state_dir=args.state_dir,
+        )
+        failed = sorted(name for name, ok in results.items() if not ok)
+        print(f"Logged in {len(results) - len(failed)}/{len(results)} accounts.")
+        if failed:
+            raise SystemExit(f"Login failed for: {', '.join(failed)}")
+        return
+
     device_info_holder = {"value": None}
     headers_holder = {"value": None}
 
     def capture_request(request):
-        url = request.url or ""
-        if "/api/desktop/client/connect" in url and request.method == "POST":
-            headers = request.headers
-            ctg_headers = {k: v for k, v in headers.items() if k.lower().startswith("ctg-")}
-            headers_holder["value"] = {
-                "url": url,
-                "ctg_headers": ctg_headers,
-            }
-
-    hook_js = """
-(() => {
-  const keys = [
-    "objId","objType","osType","deviceId","deviceCode",
-    "deviceName","sysVersion","appVersion","hostName",
-    "vdCommand","ipAddress","macAddress","hardwareFeatureCode"
-  ];
-  const origStringify = JSON.stringify;
-  JSON.stringify = function (value, ...rest) {
-    try {
-      if (value && typeof value === "object") {
-        const hit = keys.every(k => k in value);
-        if (hit) {
-          window.__ctyun_device_info = value;
-        }
-      }
-    } catch (e) {}
-    return origStringify.apply(this, arguments);
-  };
-})();
-"""
+        capture = _capture_headers(request)
+        if capture:
+            headers_holder["value"] = capture
 
     with sync_playwright() as p:
         context = p.chromium.launch_persistent_context(
@@ -88,8 +326,8 @@ def main():
         )
         page = context.new_page()
         page.on("request", capture_request)
-        page.add_init_script(hook_js)
-        page.goto("https://pc.ctyun.cn", wait_until="domcontentloaded")
+        page.add_init_script(HOOK_JS)
+        page.goto(PORTAL_URL, wait_until="domcontentloaded")
 
         print("Waiting for login/localStorage authData... (please login if needed)")
         auth_data = None
@@ -128,20 +366,11 @@ def main():
             context.close()
             return
 
-        output = {
-            "connect_url": headers_holder["value"]["url"],
-            "ctg_headers": headers_holder["value"]["ctg_headers"],
-            "device_info": device_info_holder["value"],
-            "auth": {
-                "userId": auth_data.get("userId"),
-                "tenantId": auth_data.get("tenantId"),
-                "secretKey": auth_data.get("secretKey"),
-                "userAccount": auth_data.get("userAccount"),
-            },
-        }
+        output = build_output(
+            headers_holder["value"], device_info_holder["value"], auth_data
+        )
 
-        with open(args.out, "w", encoding="utf-8") as f:
-            json.dump(output, f, ensure_ascii=True, indent=2)
+        save_config(args.out, output)
         print(f"Saved: {args.out}")
 
         context.close()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""Async Playwright login: captures are pushed by browser events instead of polled.
+
+authData arrives through a binding called from a localStorage.setItem hook, and the
+connect POST is taken from the context's request events (device_info from its body,
+ctg-* from its headers). Every account is one coroutine in one event loop.
+"""
+import argparse
+import asyncio
+import os
+from typing import Dict, List, Optional
+
+from keepliver.config_store import save_config
+from keepliver.ctyun_auto import (
+    _CLICK_BY_TEXT_JS,
+    DESKTOP_LIST_URL,
+    HOOK_JS,
+    PORTAL_URL,
+    _account_credentials,
+    _capture_headers,
+    _safe_json_loads,
+    build_output,
+    storage_state_path,
+)
+
+DEVICE_KEYS = (
+    "objId", "objType", "osType", "deviceId", "deviceCode",
+    "deviceName", "sysVersion", "appVersion", "hostName",
+    "vdCommand", "ipAddress", "macAddress", "hardwareFeatureCode",
+)  # fmt: skip
+
+AUTH_HOOK_JS = """
+(() => {
+  const setItem = Storage.prototype.setItem;
+  Storage.prototype.setItem = function (key, value) {
+    const result = setItem.apply(this, arguments);
+    try {
+      if (key === "authData" && window.__keepliverAuth) window.__keepliverAuth(String(value));
+    } catch (e) {}
+    return result;
+  };
+})();
+"""
+
+
+def find_device_info(body) -> Optional[Dict]:
+    """The first object in a parsed request body that carries every device_info key."""
+    stack = [body]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            if all(k in value for k in DEVICE_KEYS):
+                return value
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return None
+
+
+def _resolve(future: asyncio.Future, value) -> None:
+    if not future.done():
+        future.set_result(value)
+
+
+class AsyncLogin:
+    """One account in a shared browser; run() returns True once its config is saved."""
+
+    def __init__(self, options: Dict, timeout: float, state_dir: Optional[str] = None):
+        self.name = options["name"]
+        self.out = options["config"]
+        self.state_path = storage_state_path(options, state_dir)
+        self.account, self.password = _account_credentials(options)
+        self.timeout = timeout
+        self.auth: Optional[asyncio.Future] = None
+        self.connect: Optional[asyncio.Future] = None
+
+    def _on_auth(self, _source, text) -> None:
+        auth_data = _safe_json_loads(text) if text else None
+        if auth_data:
+            _resolve(self.auth, auth_data)
+
+    def _on_request(self, request) -> None:
+        capture = _capture_headers(request)
+        if not capture:
+            return
+        try:
+            body = _safe_json_loads(request.post_data or "")
+        except Exception:
+            body = None
+        capture["device_info"] = find_device_info(body)
+        _resolve(self.connect, capture)
+
+    async def run(self, browser) -> bool:
+        try:
+            return await asyncio.wait_for(self._login(browser), self.timeout)
+        except asyncio.TimeoutError:
+            what = "connect request" if self.auth and self.auth.done() else "authData"
+            print(f"[{self.name}] {what} not captured within {self.timeout:.0f}s.", flush=True)
+        except Exception as e:
+            print(f"[{self.name}] Login failed: {e}", flush=True)
+        return False
+
+    async def _login(self, browser) -> bool:
+        loop = asyncio.get_running_loop()
+        self.auth = loop.create_future()
+        self.connect = loop.create_future()
+        state = self.state_path if os.path.exists(self.state_path) else None
+        context = await browser.new_context(storage_state=state)
+        try:
+            await context.expose_binding("__keepliverAuth", self._on_auth)
+            await context.add_init_script(AUTH_HOOK_JS)
+            await context.add_init_script(HOOK_JS)
+            context.on("request", self._on_request)
+            page = await context.new_page()
+            await page.goto(PORTAL_URL, wait_until="domcontentloaded")
+            # A restored state is already in localStorage; setItem won't fire for it.
+            self._on_auth(None, await page.evaluate("localStorage.getItem('authData')"))
+            if not self.auth.done() and self.account and self.password:
+                await self._fill_login(page)
+            auth_data = await self.auth
+            print(f"[{self.name}] authData found; connecting to capture device_info...")
+
+            await page.goto(DESKTOP_LIST_URL, wait_until="domcontentloaded")
+            while not self.connect.done():
+                await page.evaluate(_CLICK_BY_TEXT_JS, ["进入AI云电脑", "连接云电脑", "连接"])
+                await asyncio.wait({self.connect}, timeout=5)
+            capture = self.connect.result()
+            device_info = capture.pop("device_info")
+            if not device_info:
+                # Body shape not recognised: fall back to the JSON.stringify hook.
+                device_info = await page.evaluate("window.__ctyun_device_info || null")
+            if not device_info:
+                print(f"[{self.name}] device_info not found in the connect request.", flush=True)
+                return False
+
+            save_config(self.out, build_output(capture, device_info, auth_data))
+            print(f"[{self.name}] Saved: {self.out}", flush=True)
+            os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+            await context.storage_state(path=self.state_path)
+            os.chmod(self.state_path, 0o600)
+            return True
+        finally:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+    async def _fill_login(self, page) -> None:
+        try:
+            await page.evaluate(_CLICK_BY_TEXT_JS, ["账号登录", "密码登录", "账户登录", "账号登陆"])
+            await page.fill("input.account", self.account, timeout=10000)
+            await page.fill("input.password", self.password, timeout=10000)
+            await page.check("input.el-checkbox__original", force=True, timeout=2000)
+        except Exception as e:
+            print(f"[{self.name}] Account form not filled ({e}); please login manually.")
+            return
+        try:
+            await page.click(".btn-submit-pc, .btn-submit", timeout=5000)
+        except Exception:
+            await page.evaluate(_CLICK_BY_TEXT_JS, ["登录", "安全登录"])
+
+
+async def login_accounts(
+    accounts: List[Dict],
+    headless: bool = False,
+    timeout: float = 600,
+    max_contexts: int = 4,
+    state_dir: Optional[str] = None,
+) -> Dict[str, bool]:
+    """Log in every account concurrently in one browser, at most max_contexts at a time."""
+    from playwright.async_api import async_playwright
+
+    limit = asyncio.Semaphore(max(1, max_contexts))
+
+    async def one(options: Dict) -> bool:
+        async with limit:
+            return await AsyncLogin(options, timeout, state_dir).run(browser)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        try:
+            results = await asyncio.gather(*(one(a) for a in accounts))
+        finally:
+            await browser.close()
+    return {a["name"]: ok for a, ok in zip(accounts, results)}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Capture CTYUN device_info + ctg headers + authData with async Playwright."
+    )
+    parser.add_argument("--accounts", default=None, help="accounts.json (default: one account).")
+    parser.add_argument(
+        "--out",
+        default=os.path.join(os.path.dirname(__file__), "config.json"),
+        help="Output config path (single account).",
+    )
+    parser.add_argument("--account", default=None, help="Single account: login account.")
+    parser.add_argument("--password", default=None, help="Single account: login password.")
+    parser.add_argument("--secrets", default=None, help="Single account: secrets.json path.")
+    parser.add_argument("--headless", action="store_true", help="Run browser headless.")
+    parser.add_argument("--timeout", type=int, default=600, help="Per-account login timeout.")
+    parser.add_argument("--max-contexts", type=int, default=4, help="Concurrent logins.")
+    parser.add_argument(
+        "--state-dir",
+        default=None,
+        help="Dir for <name>.storage.json (default: next to each config).",
+    )
+    args = parser.parse_args()
+
+    try:
+        import playwright.async_api  # noqa: F401
+    except Exception:
+        print("Playwright not installed. Run: pip install playwright")
+        print("Then run: playwright install")
+        raise
+
+    if args.accounts:
+        from keepliver.daemon import load_accounts
+
+        accounts = load_accounts(args.accounts)
+    else:
+        name = os.path.splitext(os.path.basename(args.out))[0]
+        accounts = [
+            {
+                "name": name,
+                "config": args.out,
+                "account": args.account,
+                "password": args.password,
+                "secrets": args.secrets,
+            }
+        ]
+    results = asyncio.run(
+        login_accounts(
+            accounts,
+            headless=args.headless,
+            timeout=args.timeout,
+            max_contexts=args.max_contexts,
+            state_dir=args.state_dir,
+        )
+    )
+    failed = sorted(name for name, ok in results.items() if not ok)
+    print(f"Logged in {len(results) - len(failed)}/{len(results)} accounts.")
+    if failed:
+        raise SystemExit(f"Login failed for: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
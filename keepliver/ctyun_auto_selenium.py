@@ -7,7 +7,7 @@ import threading
 import time
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from queue import Queue
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from urllib.parse import parse_qs, urlencode
 from urllib.request import Request, urlopen
 
@@ -21,6 +21,18 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from keepliver.browser_presets import PRESETS, preset_arguments
+from keepliver.config_store import save_config
+from keepliver.deadline import PhaseDeadline, phase_deadlines
+from keepliver.drivers import resolve as resolve_drivers
+from keepliver.governor import MemoryGovernor
+from keepliver.profile_compact import compact_profile
+from keepliver.proctree import kill_tree
+from keepliver.remote import end_session, pick_endpoint
+from keepliver.profile_tmpfs import default_tmpfs, discard, stage_profile, sync_back
+from keepliver.retry import get_breaker
+from keepliver.sdnotify import still_busy
+
 
 def _safe_json_loads(text: str):
     try:
@@ -91,13 +103,18 @@ def _try_ocr_captcha(image_path: str) -> Optional[str]:
 
 
 def _tg_request(url: str, data: Optional[bytes] = None, timeout: int = 10) -> Optional[dict]:
+    breaker = get_breaker("telegram")
+    if not breaker.allow():
+        return None
     try:
         req = Request(url, data=data, headers={"Content-Type": "application/x-www-form-urlencoded"})
         with urlopen(req, timeout=timeout) as resp:
             payload = resp.read().decode("utf-8")
-        return _safe_json_loads(payload) or None
     except Exception:
+        breaker.record_failure()
         return None
+    breaker.record_success()
+    return _safe_json_loads(payload) or None
 
 
 def _tg_send_message(token: str, chat_id: str, text: str) -> bool:
@@ -341,11 +358,25 @@ def _start_phone_verify_server(
     return server
 
 
+def _user_data_dir(argv: List[str], cwd: str) -> Optional[str]:
+    """The resolved --user-data-dir of a browser command line, None if it has none."""
+    for i, arg in enumerate(argv):
+        if arg.startswith("--user-data-dir="):
+            value = arg.split("=", 1)[1]
+        elif arg == "--user-data-dir" and i + 1 < len(argv):
+            value = argv[i + 1]
+        else:
+            continue
+        return os.path.realpath(os.path.join(cwd, os.path.expanduser(value)))
+    return None
+
+
 def _kill_existing_browser_processes(profile_dir: str):
     """Kill existing browser processes using the same profile directory (pure Python, no psutil)."""
     import subprocess
     import glob
 
+    target = os.path.realpath(os.path.expanduser(profile_dir))
     try:
         # Find processes by looking at /proc
         for pid_str in glob.glob('/proc/[0-9]*'):
@@ -354,10 +385,16 @@ def _kill_existing_browser_processes(profile_dir: str):
                 # Read cmdline
                 cmdline_path = os.path.join(pid_str, 'cmdline')
                 with open(cmdline_path, 'rb') as f:
-                    cmdline = f.read().decode('utf-8', errors='ignore').replace('\x00', ' ')
+                    argv = f.read().decode('utf-8', errors='ignore').split('\x00')
+                cmdline = ' '.join(argv)
 
-                # Check if this process uses our profile directory
-                if profile_dir in cmdline:
+                # Check if this process uses our profile directory. Compare the exact path:
+                # parallel logins run .selenium-profile-a next to .selenium-profile-ab.
+                try:
+                    cwd = os.readlink(os.path.join(pid_str, 'cwd'))
+                except OSError:
+                    cwd = '/'
+                if _user_data_dir(argv, cwd) == target:
                     # Check if it's a browser process
                     cmd_lower = cmdline.lower()
                     if 'edge' in cmd_lower or 'chrome' in cmd_lower or 'msedge' in cmd_lower:
@@ -400,6 +437,13 @@ def _kill_existing_browser_processes(profile_dir: str):
         print(f"Warning: error cleaning processes: {e}")
 
 
+def _kill_browser(service) -> None:
+    process = getattr(service, "process", None)
+    if process is not None:
+        # The driver leads its own process group, and the browser is started inside it.
+        kill_tree(process.pid)
+
+
 def _is_profile_initialized(profile_dir: str) -> bool:
     if not profile_dir:
         return False
@@ -944,6 +988,24 @@ def main():
         action="store_true",
         help="Try to click the Connect button automatically.",
     )
+    parser.add_argument(
+        "--launch-deadline",
+        type=int,
+        default=120,
+        help="Max seconds to start the browser and open the page before killing it.",
+    )
+    parser.add_argument(
+        "--login-deadline",
+        type=int,
+        default=0,
+        help="Max seconds for the login phase (0 = timeout + captcha/SMS waits + 60).",
+    )
+    parser.add_argument(
+        "--connect-deadline",
+        type=int,
+        default=0,
+        help="Max seconds for the connect-capture phase (0 = timeout + 60).",
+    )
     parser.add_argument(
         "--login-mode",
         choices=["qr", "account"],
@@ -1022,6 +1084,50 @@ def main():
         default=10,
         help="Seconds to keep browser open after success (0 = don't close).",
     )
+    parser.add_argument(
+        "--rss-budget-mb",
+        type=float,
+        default=0,
+        help="Recycle the browser once its process tree RSS exceeds this (0 = only measure).",
+    )
+    parser.add_argument(
+        "--rss-interval", type=float, default=5.0, help="Seconds between browser RSS samples."
+    )
+    parser.add_argument(
+        "--remote",
+        default=None,
+        help="Comma-separated Selenium Grid / remote WebDriver URLs; the freest one is used.",
+    )
+    parser.add_argument(
+        "--remote-profile-dir",
+        default=None,
+        help="With --remote: user-data dir on the remote node (default: a fresh profile).",
+    )
+    parser.add_argument(
+        "--profile-budget-mb",
+        type=float,
+        default=0,
+        help="Before launch, trim caches once the profile is larger than this (0 = never).",
+    )
+    parser.add_argument(
+        "--tmpfs-profile",
+        action="store_true",
+        help="Run the browser from a tmpfs copy of the profile; sync login state back to disk.",
+    )
+    parser.add_argument(
+        "--tmpfs-dir", default=None, help="tmpfs mount for --tmpfs-profile (default /dev/shm)."
+    )
+    parser.add_argument(
+        "--browser-preset",
+        choices=sorted(PRESETS),
+        default="default",
+        help="Launch preset; 'lean' trades features for memory on small nodes.",
+    )
+    parser.add_argument(
+        "--headless-shell",
+        default=None,
+        help="Path to chrome-headless-shell to run instead of Chrome (implies headless).",
+    )
     parser.add_argument(
         "--out",
         default=os.path.join(os.path.dirname(__file__), "config.json"),
@@ -1048,12 +1154,51 @@ def main():
     caps["goog:loggingPrefs"] = {"performance": "ALL"}
     caps["ms:loggingPrefs"] = {"performance": "ALL"}
 
+    remote_url = None
+    if args.remote:
+        urls = [u.strip() for u in args.remote.split(",") if u.strip()]
+        remote_url = pick_endpoint(urls, args.browser)
+        if remote_url is None:
+            raise RuntimeError(f"no free {args.browser} slot on: {', '.join(urls)}")
+        print(f"Using remote WebDriver: {remote_url}")
+        # The profile, driver and browser processes below are all on the remote node.
+        args.profile_budget_mb = 0
+        args.tmpfs_profile = False
+    if (args.profile_budget_mb or args.tmpfs_profile) and os.path.isdir(args.profile_dir):
+        # Nothing may write to the disk profile while it is trimmed or copied.
+        _kill_existing_browser_processes(args.profile_dir)
+    if args.profile_budget_mb and os.path.isdir(args.profile_dir):
+        freed = compact_profile(args.profile_dir, args.profile_budget_mb)
+        if freed:
+            print(f"Profile over {args.profile_budget_mb:.0f} MiB; freed {freed / 2**20:.1f} MiB.")
+    staged = None
+    if args.tmpfs_profile:
+        tmpfs = args.tmpfs_dir or default_tmpfs()
+        if tmpfs:
+            staged = stage_profile(args.profile_dir, tmpfs)
+            print(f"Running browser from tmpfs profile copy: {staged}")
+        else:
+            print("No writable tmpfs found; running from the disk profile.")
+    run_profile = staged or args.profile_dir
+    if remote_url:
+        run_profile = args.remote_profile_dir
+
+    def sync_profile():
+        if staged is None:
+            return
+        try:
+            copied = sync_back(staged, args.profile_dir)
+            print(f"Synced {copied // 1024} KiB of login state to {args.profile_dir}")
+        except OSError as e:
+            print(f"Warning: failed to sync profile back: {e}")
+
     if args.browser == "edge":
         options = EdgeOptions()
         options.use_chromium = True
     else:
         options = Options()
-    options.add_argument(f"--user-data-dir={args.profile_dir}")
+    if run_profile:
+        options.add_argument(f"--user-data-dir={run_profile}")
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_argument("--disable-extensions")
     options.add_argument("--disable-gpu")
@@ -1064,38 +1209,105 @@ def main():
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-setuid-sandbox")
-    if args.headless:
-        if _is_profile_initialized(args.profile_dir) or args.force_headless:
-            options.add_argument("--headless=new")
+    preset_args = preset_arguments(args.browser_preset)
+    for arg in preset_args:
+        if arg not in options.arguments:
+            options.add_argument(arg)
+    window_set = any(a.startswith("--window-size=") for a in preset_args)
+    if args.headless_shell:
+        if args.browser == "edge":
+            raise SystemExit("--headless-shell is a Chrome build; it can't be used with Edge.")
+        # The shell has no headed mode, so a first QR login can't be shown.
+        if not _is_profile_initialized(args.profile_dir) and args.login_mode != "account":
+            print("Warning: chrome-headless-shell with a new profile; QR login can't be shown.")
+        if not window_set:
             options.add_argument("--window-size=1280,720")
+    elif args.headless:
+        # A remote node's profile can't be inspected from here; trust --headless then.
+        if remote_url or _is_profile_initialized(args.profile_dir) or args.force_headless:
+            options.add_argument("--headless=new")
+            if not window_set:
+                options.add_argument("--window-size=1280,720")
         else:
             print("Profile not initialized; ignoring --headless for first login.")
     options.set_capability("goog:loggingPrefs", caps.get("goog:loggingPrefs", {}))
     options.set_capability("ms:loggingPrefs", caps.get("ms:loggingPrefs", {}))
 
-    # Clean up any existing browser processes using our profile
-    _kill_existing_browser_processes(args.profile_dir)
-    time.sleep(0.5)  # Give processes time to exit
+    if not remote_url:
+        # Clean up any existing browser processes using our profile
+        _kill_existing_browser_processes(run_profile)
+        time.sleep(0.5)  # Give processes time to exit
 
+    # Own process group for the driver (and the browser it starts), so a deadline can kill both.
+    popen_kw = {"start_new_session": True} if os.name != "nt" else {}
     if args.browser == "edge":
-        if args.edge_binary:
-            options.binary_location = args.edge_binary
-        edgedriver_path = _resolve_driver_path(args.edgedriver, "msedgedriver")
-        service = EdgeService(executable_path=edgedriver_path)
-        driver = webdriver.Edge(service=service, options=options)
+        binary = args.edge_binary
+        driver_path = _resolve_driver_path(args.edgedriver, "msedgedriver")
     else:
-        if args.chrome_binary:
-            options.binary_location = args.chrome_binary
-        chromedriver_path = _resolve_driver_path(args.chromedriver, "chromedriver")
-        service = Service(executable_path=chromedriver_path)
-        driver = webdriver.Chrome(service=service, options=options)
+        binary = args.headless_shell or args.chrome_binary
+        driver_path = _resolve_driver_path(args.chromedriver, "chromedriver")
+    if remote_url:
+        # A binary path names a browser on the remote node; nothing to check locally.
+        if binary:
+            options.binary_location = binary
+    else:
+        # Checked (and cached by binary mtime) before launch: a mismatch fails here, clearly.
+        resolved = resolve_drivers(args.browser, driver_path, binary or None)
+        if resolved["driver"]:
+            driver_path = resolved["driver"]
+        if binary and resolved["binary"]:
+            options.binary_location = resolved["binary"]
+        # Without an explicit binary the driver still picks the browser as it always did;
+        # resolve() checked the first browser on the usual install names and PATH.
+        if resolved["driver_version"] or resolved["browser_version"]:
+            print(
+                f"Driver {resolved['driver_version'] or '?'}, "
+                f"browser {resolved['browser_version'] or '?'}"
+            )
+    service = None
+    remote_session = {"id": None}
+
+    def start_driver():
+        # A fresh service each time: a recycled browser gets a new driver process too.
+        nonlocal service
+        if remote_url:
+            # Logging prefs travel in the capabilities, so performance logs (the network
+            # capture) come back through the remote session like a local one.
+            remote = webdriver.Remote(command_executor=remote_url, options=options)
+            remote_session["id"] = remote.session_id
+            return remote
+        if args.browser == "edge":
+            service = EdgeService(executable_path=driver_path, popen_kw=popen_kw)
+            return webdriver.Edge(service=service, options=options)
+        service = Service(executable_path=driver_path, popen_kw=popen_kw)
+        return webdriver.Chrome(service=service, options=options)
+
+    def service_pid():
+        process = getattr(service, "process", None)
+        return process.pid if process is not None else None
+
+    deadlines = phase_deadlines(args)
+    def kill():
+        if remote_url:
+            if remote_session["id"]:
+                end_session(remote_url, remote_session["id"])
+            return
+        _kill_browser(service)
 
+    guard = PhaseDeadline(kill)
+    governor = MemoryGovernor(service_pid, args.rss_budget_mb, args.rss_interval)
+    driver = None
     try:
+        guard.enter("launch", deadlines["launch"])
+        driver = start_driver()
+        governor.start()
         desktop_list_url = "https://pc.ctyun.cn/#/desktop-list"
         driver.get(desktop_list_url)
         # Inject hook to capture device_info before encryption
         driver.execute_script(HOOK_JS)
 
+        guard.enter("login", deadlines["login"])
+
         if args.login_mode == "account":
             account, password = _resolve_account_password(args)
             if not account or not password:
@@ -1157,6 +1369,7 @@ def main():
                     break
             time.sleep(1)
 
+        guard.check()
         if not auth_data:
             print("authData not found. Login may not be complete.")
             print("Keep the browser open and try again.")
@@ -1188,6 +1401,7 @@ def main():
                 except Exception:
                     return False
 
+        guard.enter("connect", deadlines["connect"])
         # Always ensure we are on desktop list before clicking connect
         driver.get(desktop_list_url)
         try:
@@ -1243,6 +1457,7 @@ def main():
                     last_click = time.time()
             time.sleep(0.5)
 
+        guard.check()
         if not device_info:
             print("device_info not captured. Please click Connect and retry.")
             return
@@ -1262,22 +1477,53 @@ def main():
             },
         }
 
-        with open(args.out, "w", encoding="utf-8") as f:
-            json.dump(output, f, ensure_ascii=True, indent=2)
+        save_config(args.out, output)
         print(f"Saved: {args.out}")
+        # The browser may still be flushing cookies; the copy after quit() below is final.
+        sync_profile()
+        governor.sample()
+        print(f"Browser RSS: {governor.rss_mb:.0f} MiB (peak {governor.peak_mb:.0f} MiB)")
+        # From here on the config is saved: any moment is a safe point to recycle.
+        guard.enter("keep", deadlines["keep"])
         if args.keep_browser > 0:
             print(f"Waiting {args.keep_browser} seconds before closing browser...")
-            time.sleep(args.keep_browser)
+            end = time.time() + args.keep_browser
+            while time.time() < end and not governor.over_budget():
+                time.sleep(min(1.0, max(0.0, end - time.time())))
         else:
             print("Keeping browser open (--keep-browser=0). Press Ctrl+C to exit.")
             while True:
                 time.sleep(1)
+                still_busy()
+                if governor.over_budget():
+                    print("Recycling the browser to release memory...")
+                    try:
+                        driver.quit()
+                    except Exception:
+                        kill()
+                    driver = None
+                    sync_profile()
+                    driver = start_driver()
+                    driver.get(desktop_list_url)
+                    governor.recycled()
+    except Exception as e:
+        if guard.expired is not None and e is not guard.expired:
+            # The stuck WebDriver call failed because the deadline killed the browser.
+            raise guard.expired from e
+        raise
     finally:
+        guard.stop()
+        governor.stop()
         if driver is not None:
             try:
                 driver.quit()
             except Exception as e:
                 print(f"Error quitting driver: {e}")
+        if staged is not None:
+            # A browser killed at a deadline may have left torn files; keep the disk copy then.
+            if guard.expired is None:
+                sync_profile()
+            discard(staged)
 
 
 if __name__ == "__main__":
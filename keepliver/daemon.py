@@ -0,0 +1,643 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from typing import Callable, Dict, List, Optional
+
+from keepliver import metrics
+from keepliver.control import CommandError, ControlServer, default_socket_path, format_ts
+from keepliver.lease import LeaseBackend, default_node_id, make_backend
+from keepliver.lifecycle import Lifecycle
+from keepliver.login_pool import LoginPool
+from keepliver.retry import CircuitOpenError, RetryPolicy, get_breaker
+from keepliver.scheduler import AdaptiveScheduler, default_state_path
+from keepliver.sdnotify import notify, watchdog_interval
+from keepliver.timing_wheel import TimerHandle, WheelScheduler
+
+
+def load_accounts(path: str, overrides: Optional[Dict] = None) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        data = {"accounts": data}
+    base_dir = os.path.dirname(os.path.abspath(path))
+    defaults = dict(overrides or {})
+    defaults.update(data.get("defaults") or {})
+    accounts = []
+    for entry in data.get("accounts") or []:
+        name = str(entry.get("name") or "").strip()
+        if not name:
+            raise ValueError(f"account without name in {path}")
+        options = dict(defaults)
+        options.update(entry)
+        options["name"] = name
+        options.setdefault("config", os.path.join(base_dir, f"{name}.config.json"))
+        options.setdefault("profile_dir", os.path.join(base_dir, f".selenium-profile-{name}"))
+        accounts.append(options)
+    return accounts
+
+
+class Account:
+    def __init__(self, options: Dict):
+        self.name = options["name"]
+        self.options: Dict = {}
+        self.args = None
+        self.scheduler: Optional[AdaptiveScheduler] = None
+        self.handle: Optional[TimerHandle] = None
+        self.next_run_ts: Optional[float] = None
+        self.last_keepalive_ts: Optional[float] = None
+        self.last_status: Optional[str] = None
+        self.login_pending = False
+        self.relogin_pending = False
+        self.removed = False
+        self.paused = False
+        # Wall-clock expiry of this node's lease on the account (None = not held).
+        self.lease_expires: Optional[float] = None
+        self.configure(options)
+
+    def configure(self, options: Dict) -> None:
+        """Apply (new) options; runtime state and what the scheduler learned are kept."""
+        from keepliver import auto
+
+        args = auto.build_parser().parse_args(auto.options_argv(options))
+        auto._apply_defaults(args)
+        args.backend = "selenium"
+        args.auto_connect = True
+        old = self.args
+        if old is not None and (old.profile_cookies, old.profile_dir) == (
+            args.profile_cookies,
+            args.profile_dir,
+        ):
+            args.http_session = old.http_session
+        elif args.profile_cookies:
+            from keepliver.keepalive import profile_session
+
+            args.http_session = profile_session(args.profile_dir)
+        state_path = args.schedule_state or default_state_path(args.config)
+        if self.scheduler is not None and self.scheduler.state_path == state_path:
+            self.scheduler.retune(args.interval, args.min_interval, args.max_interval)
+        else:
+            self.scheduler = AdaptiveScheduler(
+                state_path,
+                base_interval=args.interval,
+                min_interval=args.min_interval,
+                max_interval=args.max_interval,
+            )
+        if self.scheduler.login_ts is None and os.path.exists(args.config):
+            self.scheduler.login_ts = os.path.getmtime(args.config)
+        self.options = options
+        self.args = args
+
+    def phase(self, interval: float) -> float:
+        # Stable per-account offset so a restart doesn't line every account up again.
+        return (zlib.crc32(self.name.encode("utf-8")) % 10000) / 10000.0 * interval
+
+
+class Daemon:
+    def __init__(
+        self,
+        accounts: List[Dict],
+        workers: int = 8,
+        tick: float = 1.0,
+        control_socket: Optional[str] = None,
+        login_workers: int = 1,
+        login_min_free_mb: float = 0,
+        leases: Optional[LeaseBackend] = None,
+        lease_ttl: float = 60.0,
+        node_id: Optional[str] = None,
+    ):
+        from keepliver.keepalive import set_hedge_callers
+
+        self.accounts = {opts["name"]: Account(opts) for opts in accounts}
+        self.wheel = WheelScheduler(tick=tick, workers=workers)
+        set_hedge_callers(workers)
+        # Worker logins each get their own process, profile and debugging port (Chrome picks
+        # a free one), so they can run side by side while memory allows.
+        self.login_pool = LoginPool(login_workers, login_min_free_mb)
+        # In-process logins share module globals (sys.argv, phone-verify state): one at a time.
+        self._inprocess_login = threading.Lock()
+        self._lock = threading.Lock()
+        self.rng = random.Random()
+        self.keepalive_retry = RetryPolicy(base=1, cap=10, max_attempts=2)
+        self.lifecycle = Lifecycle()
+        self.watchdog_interval: Optional[float] = None
+        # Deadlines of the logins in progress; the watchdog pings stop once one is overdue.
+        self._login_deadlines: Dict[str, float] = {}
+        # With a shared lease backend, only the node holding an account's lease serves it.
+        self.leases = leases
+        self.lease_ttl = lease_ttl
+        self.node_id = node_id or default_node_id()
+        self.control = None
+        if control_socket:
+            self.control = ControlServer(control_socket, self.control_handlers())
+
+    def schedule_keepalive(self, account: Account, delay: float) -> None:
+        with self._lock:
+            if account.removed:
+                return
+            self.wheel.cancel(account.handle)
+            if account.paused:
+                account.handle = None
+                account.next_run_ts = None
+                return
+            account.handle = self.wheel.call_later(delay, self._keepalive_job, account)
+            account.next_run_ts = time.time() + delay
+
+    def schedule_login(self, account: Account) -> None:
+        with self._lock:
+            if account.login_pending or account.removed:
+                return
+            account.login_pending = True
+            self.wheel.cancel(account.handle)
+            account.handle = None
+            account.next_run_ts = None
+        self.login_pool.submit(self._login_job, account, priority=self._login_priority(account))
+
+    def _login_priority(self, account: Account, preemptive: bool = False):
+        # The desktop whose last good keepalive is oldest idles out first. Pre-emptive logins
+        # refresh sessions that still work, so they wait behind every expired one.
+        return (1 if preemptive else 0, account.last_keepalive_ts or 0.0)
+
+    def _watch_login(self, account: Account, timeout: Optional[float]) -> None:
+        deadline = float("inf") if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._login_deadlines[account.name] = deadline
+
+    def _unwatch_login(self, account: Account) -> None:
+        with self._lock:
+            self._login_deadlines.pop(account.name, None)
+
+    def logins_alive(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            return all(now < deadline for deadline in self._login_deadlines.values())
+
+    def _run_account_login(self, account: Account, login: Callable[[], object]):
+        if getattr(account.args, "login_worker", "inprocess") == "inprocess":
+            with self._inprocess_login:
+                return login()
+        return login()
+
+    def _keepalive_job(self, account: Account) -> None:
+        try:
+            if self.owns(account):
+                self._keepalive_once(account)
+            else:
+                self._standby(account)
+        finally:
+            self._report_status()
+
+    def owns(self, account: Account) -> bool:
+        if self.leases is None:
+            return True
+        # Checked against our own clock; renewals keep it a full TTL ahead while we live.
+        return account.lease_expires is not None and time.time() < account.lease_expires
+
+    def _standby(self, account: Account) -> None:
+        # A peer holds the lease; _lease_job schedules us again if we take it over.
+        account.last_status = "standby"
+        with self._lock:
+            self.wheel.cancel(account.handle)
+            account.handle = None
+            account.next_run_ts = None
+
+    def _lease_job(self, reschedule: bool = True) -> None:
+        for account in list(self.accounts.values()):
+            if account.removed:
+                continue
+            held = self.owns(account)
+            try:
+                expires = self.leases.acquire(account.name, self.node_id, self.lease_ttl)
+            except Exception as e:
+                # Keep the old expiry: we stop serving by ourselves once it passes.
+                print(f"[daemon] {account.name}: lease renewal failed: {e}", flush=True)
+                continue
+            account.lease_expires = expires
+            if expires is not None and not held:
+                print(f"[daemon] {account.name}: lease acquired by {self.node_id}", flush=True)
+                metrics.inc("lease_acquired")
+                if reschedule and not account.login_pending:
+                    self.schedule_keepalive(account, 0.0)
+            elif expires is None and held:
+                print(f"[daemon] {account.name}: lease lost to a peer", flush=True)
+                metrics.inc("lease_lost")
+        metrics.set_gauge("leases_held", sum(self.owns(a) for a in self.accounts.values()))
+        if reschedule:
+            # Renew at a third of the TTL: two renewals can fail before a peer takes over.
+            self.wheel.call_later(self.lease_ttl / 3, self._lease_job)
+
+    def _release_leases(self, accounts: List[Account]) -> None:
+        for account in accounts:
+            if self.leases is None or not self.owns(account):
+                continue
+            account.lease_expires = None
+            try:
+                self.leases.release(account.name, self.node_id)
+            except Exception as e:
+                print(f"[daemon] {account.name}: lease release failed: {e}", flush=True)
+
+    def _report_status(self) -> None:
+        counts: Dict[str, int] = {}
+        for account in list(self.accounts.values()):
+            key = "paused" if account.paused else account.last_status or "pending"
+            counts[key] = counts.get(key, 0) + 1
+        summary = ", ".join(f"{n} {key}" for key, n in sorted(counts.items()))
+        notify(f"STATUS={len(self.accounts)} accounts: {summary}")
+
+    def _watchdog_job(self) -> None:
+        # Runs on the keepalive pool: a stalled wheel thread, a pool full of hung jobs or a
+        # login stuck past its deadline all stop the pings, and systemd restarts the unit.
+        if self.logins_alive():
+            notify("WATCHDOG=1")
+        else:
+            print("[daemon] login is overdue; no longer pinging systemd.", flush=True)
+        self.wheel.call_later(self.watchdog_interval / 2, self._watchdog_job)
+
+    def _keepalive_once(self, account: Account) -> None:
+        import requests
+
+        from keepliver.auto import _load_config, _probe_session, _retry_with_profile_auth
+        from keepliver.keepalive import send_keepalive_with_retry
+        from keepliver.probe import VALID, invalidate, remember
+
+        cfg = _load_config(account.args.config)
+        if cfg is None:
+            print(f"[daemon] {account.name}: config missing or invalid, login", flush=True)
+            self.schedule_login(account)
+            return
+        try:
+            # Keep retries short: a worker sleeping here is a worker not serving other accounts.
+            ok, status, payload = send_keepalive_with_retry(
+                cfg,
+                self.keepalive_retry,
+                hedge=account.args.hedge,
+                session=account.args.http_session,
+            )
+        except CircuitOpenError as e:
+            # Upstream is down for everyone; come back after the breaker window, spread out.
+            account.last_status = "skipped"
+            delay = e.retry_after + self.rng.uniform(0, account.scheduler.min_interval)
+            self.schedule_keepalive(account, delay)
+            return
+        except requests.RequestException as e:
+            print(f"[daemon] {account.name}: keepalive error: {e}", flush=True)
+            account.last_status = "error"
+            metrics.inc("daemon_keepalive_errors")
+            self.schedule_keepalive(account, account.scheduler.min_interval)
+            return
+        account.last_keepalive_ts = time.time()
+        print(f"[daemon] {account.name}: keepalive status: {status}", flush=True)
+        if not ok:
+            ok = _retry_with_profile_auth(account.args, cfg)
+        if ok:
+            remember(cfg, VALID, account.args.probe_url)
+            account.last_status = "ok"
+            metrics.inc("daemon_keepalive_ok")
+            account.scheduler.record_success()
+            self.schedule_keepalive(account, account.scheduler.next_interval())
+            self._maybe_preempt(account)
+            return
+        invalidate(cfg, account.args.probe_url)
+        if _probe_session(account.args, cfg) == VALID:
+            # Refused connect with a working token: a browser login would not help.
+            account.last_status = "refused"
+            self.schedule_keepalive(account, account.scheduler.min_interval)
+            return
+        account.last_status = "expired"
+        metrics.inc("daemon_keepalive_expired")
+        account.scheduler.record_expired()
+        if account.relogin_pending:
+            # The pre-emptive login is already producing a fresh config; pick it up after.
+            self.schedule_keepalive(account, account.scheduler.min_interval)
+            return
+        self.schedule_login(account)
+
+    def _maybe_preempt(self, account: Account) -> None:
+        if not account.args.preemptive_relogin:
+            return
+        due = account.scheduler.relogin_at(account.args.session_lifetime)
+        if due is None or time.time() < due:
+            return
+        with self._lock:
+            if account.login_pending or account.relogin_pending:
+                return
+            account.relogin_pending = True
+        self.login_pool.submit(
+            self._preemptive_login_job, account, priority=self._login_priority(account, True)
+        )
+
+    def _preemptive_login_job(self, account: Account) -> None:
+        from keepliver.auto import _busy_timeout
+        from keepliver.relogin import login_to_staging
+
+        breaker = get_breaker(f"login:{account.name}")
+        try:
+            if not self.owns(account) or not breaker.allow():
+                return
+            print(f"[daemon] {account.name}: pre-emptive login start", flush=True)
+            self._watch_login(account, _busy_timeout(account.args))
+            # Keepalives keep reading the current config until the staging file is renamed over it.
+            if self._run_account_login(
+                account, lambda: login_to_staging(account.args, guarded=False)
+            ):
+                account.scheduler.record_login()
+                metrics.inc("relogin_swaps")
+                breaker.record_success()
+            else:
+                metrics.inc("relogin_failures")
+                breaker.record_failure()
+        except BaseException as e:
+            print(f"[daemon] {account.name}: pre-emptive login failed: {e!r}", flush=True)
+            breaker.record_failure()
+            metrics.inc("relogin_failures")
+        finally:
+            self._unwatch_login(account)
+            with self._lock:
+                account.relogin_pending = False
+
+    def _login_job(self, account: Account) -> None:
+        from keepliver.auto import _busy_timeout, _check_login_output, _run_login
+
+        if not self.owns(account):
+            # Two nodes logging in to one account kick each other out.
+            with self._lock:
+                account.login_pending = False
+            self._standby(account)
+            return
+        # Per account: one account with bad credentials must not block everyone's logins.
+        breaker = get_breaker(f"login:{account.name}")
+        if not breaker.allow():
+            with self._lock:
+                account.login_pending = False
+            delay = breaker.retry_after() + self.rng.uniform(0, account.scheduler.min_interval)
+            print(f"[daemon] {account.name}: login circuit open, retry in {delay:.0f}s", flush=True)
+            self.schedule_keepalive(account, delay)
+            return
+        print(f"[daemon] {account.name}: login start", flush=True)
+        self._watch_login(account, _busy_timeout(account.args))
+        try:
+            self._run_account_login(account, lambda: _run_login(account.args))
+            _check_login_output(account.args)
+            breaker.record_success()
+            account.scheduler.record_login()
+            metrics.inc("daemon_logins")
+            delay = 0.0
+        except BaseException as e:
+            # ctyun_auto_selenium may SystemExit; keep the daemon alive either way.
+            print(f"[daemon] {account.name}: login failed: {e!r}", flush=True)
+            breaker.record_failure()
+            metrics.inc("daemon_login_failures")
+            delay = account.scheduler.min_interval
+        finally:
+            self._unwatch_login(account)
+            with self._lock:
+                account.login_pending = False
+        self.schedule_keepalive(account, delay)
+
+    def apply_accounts(self, accounts: List[Dict]) -> None:
+        """Bring the running set in line with a re-read accounts.json, without a restart."""
+        wanted = {opts["name"]: opts for opts in accounts}
+        for name in list(self.accounts):
+            if name in wanted:
+                continue
+            with self._lock:
+                account = self.accounts.pop(name)
+                account.removed = True
+                self.wheel.cancel(account.handle)
+                account.handle = None
+            self._release_leases([account])
+            print(f"[daemon] {name}: removed", flush=True)
+        for name, options in wanted.items():
+            account = self.accounts.get(name)
+            if account is None:
+                account = Account(options)
+                with self._lock:
+                    self.accounts[name] = account
+                print(f"[daemon] {name}: added", flush=True)
+                self.schedule_keepalive(account, account.phase(account.scheduler.min_interval))
+                continue
+            if account.options == options:
+                continue
+            account.configure(options)
+            print(f"[daemon] {name}: options updated", flush=True)
+            if account.next_run_ts is not None and not account.login_pending:
+                # Only pull the next run in: a longer interval applies from the run after.
+                remaining = max(0.0, account.next_run_ts - time.time())
+                self.schedule_keepalive(account, min(remaining, account.scheduler.next_interval()))
+        metrics.set_gauge("daemon_accounts", len(self.accounts))
+
+    def _select(self, request: Dict) -> List[Account]:
+        name = request.get("account")
+        if not name:
+            return list(self.accounts.values())
+        account = self.accounts.get(name)
+        if account is None:
+            raise CommandError(f"no account named {name!r}")
+        return [account]
+
+    def status(self) -> Dict:
+        now = time.time()
+        result = {}
+        for name, account in sorted(self.accounts.items()):
+            next_in = None if account.next_run_ts is None else max(0, account.next_run_ts - now)
+            result[name] = {
+                "status": account.last_status,
+                "last_keepalive": format_ts(account.last_keepalive_ts),
+                "next_run": format_ts(account.next_run_ts),
+                "next_run_in_s": None if next_in is None else round(next_in),
+                "paused": account.paused,
+                "login_pending": account.login_pending,
+                "relogin_pending": account.relogin_pending,
+            }
+            if self.leases is not None:
+                result[name]["lease"] = self.node_id if self.owns(account) else "peer"
+        return result
+
+    def control_handlers(self) -> Dict:
+        def trigger(request):
+            accounts = self._select(request)
+            for account in accounts:
+                if not account.login_pending:
+                    self.schedule_keepalive(account, 0.0)
+            return f"keepalive triggered for {len(accounts)} account(s)"
+
+        def relogin(request):
+            if not request.get("account"):
+                raise CommandError("relogin needs an account name")
+            for account in self._select(request):
+                self.schedule_login(account)
+            return "login scheduled"
+
+        def pause(request):
+            accounts = self._select(request)
+            for account in accounts:
+                account.paused = True
+                self.schedule_keepalive(account, 0.0)
+            return f"paused {len(accounts)} account(s)"
+
+        def resume(request):
+            accounts = self._select(request)
+            for account in accounts:
+                if account.paused:
+                    account.paused = False
+                    self.schedule_keepalive(account, 0.0)
+            return f"resumed {len(accounts)} account(s)"
+
+        def reload(_request):
+            self.lifecycle.request_reload()
+            return "reload requested"
+
+        return {
+            "status": lambda _request: self.status(),
+            "trigger": trigger,
+            "relogin": relogin,
+            "pause": pause,
+            "resume": resume,
+            "metrics": lambda _request: metrics.format_metrics(metrics.snapshot()),
+            "reload": reload,
+        }
+
+    def start(self) -> None:
+        if self.leases is not None:
+            # Learn what we own before the first keepalives fire.
+            self._lease_job(reschedule=False)
+        for account in self.accounts.values():
+            self.schedule_keepalive(account, account.phase(account.scheduler.base_interval))
+        metrics.set_gauge("daemon_accounts", len(self.accounts))
+        self.wheel.start()
+        if self.leases is not None:
+            self.wheel.call_later(self.lease_ttl / 3, self._lease_job)
+        if self.control is not None:
+            self.control.start()
+        self.watchdog_interval = watchdog_interval()
+        if self.watchdog_interval is not None:
+            print(f"[daemon] systemd watchdog every {self.watchdog_interval:.0f}s", flush=True)
+            self._watchdog_job()
+        notify("READY=1")
+        self._report_status()
+
+    def stop(self) -> None:
+        # Keepalives already running finish; queued logins are dropped, a running one finishes.
+        notify("STOPPING=1")
+        if self.control is not None:
+            self.control.stop()
+        self.wheel.stop(wait=True)
+        self.login_pool.shutdown(wait=True)
+        # Hand the accounts over now instead of after the TTL runs out.
+        self._release_leases(list(self.accounts.values()))
+
+    def run_forever(self, reload_accounts: Optional[Callable[[], List[Dict]]] = None) -> None:
+        self.lifecycle.install()
+        self.start()
+        try:
+            while not self.lifecycle.stopping.is_set():
+                self.lifecycle.sleep(None)
+                if self.lifecycle.take_reload() and reload_accounts is not None:
+                    print("[daemon] reloading accounts", flush=True)
+                    try:
+                        self.apply_accounts(reload_accounts())
+                    except Exception as e:
+                        print(f"[daemon] reload failed, keeping current accounts: {e}", flush=True)
+        except KeyboardInterrupt:
+            print("[daemon] interrupted, stopping.", flush=True)
+        finally:
+            self.stop()
+            print("[daemon] stopped.", flush=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Multi-account keepalive daemon.")
+    parser.add_argument(
+        "--accounts",
+        default=os.path.join(os.path.dirname(__file__), "accounts.json"),
+        help="accounts.json with per-account login options.",
+    )
+    parser.add_argument("--interval", type=int, default=1800, help="Default keepalive interval.")
+    parser.add_argument("--min-interval", type=int, default=300, help="Adaptive lower bound.")
+    parser.add_argument("--max-interval", type=int, default=None, help="Adaptive upper bound.")
+    parser.add_argument("--workers", type=int, default=8, help="Keepalive worker threads.")
+    parser.add_argument("--tick", type=float, default=1.0, help="Timing wheel tick seconds.")
+    parser.add_argument(
+        "--login-workers",
+        type=int,
+        default=1,
+        help="Browser logins run in parallel (each in its own worker process).",
+    )
+    parser.add_argument(
+        "--login-min-free-mb",
+        type=float,
+        default=512,
+        help="Start another parallel login only while MemAvailable is above this (0 = off).",
+    )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Hedge slow keepalives with a second signed request.",
+    )
+    parser.add_argument(
+        "--preemptive-relogin",
+        action="store_true",
+        help="Log each account in again in the background before its session runs out.",
+    )
+    parser.add_argument(
+        "--profile-cookies",
+        action="store_true",
+        help="Send each account's browser-profile cookies with its keepalives.",
+    )
+    parser.add_argument(
+        "--control-socket",
+        default=None,
+        help="Unix socket for 'cli ctl' (default: $XDG_RUNTIME_DIR/keepliver.sock).",
+    )
+    parser.add_argument("--no-control", action="store_true", help="Don't open a control socket.")
+    parser.add_argument(
+        "--lease",
+        default=None,
+        help="Share accounts with other nodes: sqlite:<file> or dir:<path> on shared storage.",
+    )
+    parser.add_argument(
+        "--lease-ttl",
+        type=float,
+        default=60.0,
+        help="Seconds a node's account lease lasts without renewal (takeover time).",
+    )
+    parser.add_argument("--node-id", default=None, help="Lease owner name (default host-pid).")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    overrides = {
+        "interval": args.interval,
+        "min_interval": args.min_interval,
+        "max_interval": args.max_interval,
+        "hedge": args.hedge,
+        "profile_cookies": args.profile_cookies,
+        "preemptive_relogin": args.preemptive_relogin,
+    }
+    accounts = load_accounts(args.accounts, overrides)
+    if not accounts:
+        raise SystemExit(f"no accounts in {args.accounts}")
+    print(f"[daemon] {len(accounts)} accounts, {args.workers} workers", flush=True)
+    control_socket = None if args.no_control else args.control_socket or default_socket_path()
+    daemon = Daemon(
+        accounts,
+        workers=args.workers,
+        tick=args.tick,
+        control_socket=control_socket,
+        login_workers=args.login_workers,
+        login_min_free_mb=args.login_min_free_mb,
+        leases=make_backend(args.lease) if args.lease else None,
+        lease_ttl=args.lease_ttl,
+        node_id=args.node_id,
+    )
+    # SIGHUP re-reads accounts.json; --workers, --tick and --login-workers need a restart.
+    daemon.run_forever(lambda: load_accounts(args.accounts, overrides))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+def phase_deadlines(args) -> Dict[str, Optional[float]]:
+    """Per-phase deadlines in seconds (None = unbounded); 0 on the command line = derived."""
+    sms_wait = args.telegram_timeout or args.captcha_timeout
+    login = args.login_deadline or args.timeout + args.captcha_timeout + sms_wait + 60
+    connect = args.connect_deadline or args.timeout + 60
+    # --keep-browser 0 keeps the browser open on purpose.
+    keep = args.keep_browser + 30 if args.keep_browser > 0 else None
+    launch = args.launch_deadline or None
+    return {"launch": launch, "login": login, "connect": connect, "keep": keep}
+
+
+class PhaseTimeout(TimeoutError):
+    def __init__(self, phase: str, seconds: float):
+        super().__init__(f"login phase {phase!r} exceeded its {seconds:.0f}s deadline")
+        self.phase = phase
+        self.seconds = seconds
+
+
+class PhaseDeadline:
+    """Kill the owned browser when the current login phase runs past its deadline.
+
+    WebDriver calls have no overall timeout of their own; killing the driver/browser makes
+    the stuck call fail, and the caller turns that failure into the recorded PhaseTimeout.
+    """
+
+    def __init__(self, kill: Callable[[], None], poll: float = 0.5):
+        self._kill = kill
+        self._poll = poll
+        self._lock = threading.Lock()
+        self._phase: Optional[str] = None
+        self._seconds = 0.0
+        self._deadline: Optional[float] = None
+        self.expired: Optional[PhaseTimeout] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def enter(self, phase: str, seconds: Optional[float]) -> None:
+        """Start a phase; seconds None (or <= 0) leaves it without a deadline."""
+        with self._lock:
+            self._phase = phase
+            self._seconds = seconds or 0.0
+            self._deadline = time.monotonic() + seconds if seconds and seconds > 0 else None
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="keepliver-deadline", daemon=True
+                )
+                self._thread.start()
+
+    def check(self) -> None:
+        if self.expired is not None:
+            raise self.expired
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._poll):
+            with self._lock:
+                if self._deadline is None or time.monotonic() < self._deadline:
+                    continue
+                self.expired = PhaseTimeout(self._phase, self._seconds)
+                self._deadline = None
+            print(f"{self.expired}; killing the browser.", flush=True)
+            try:
+                self._kill()
+            except Exception as e:
+                print(f"Warning: failed to kill browser: {e}", flush=True)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+import json
+import os
+import re
+import shutil
+import subprocess
+from typing import Dict, List, Optional
+
+_PKG_DIR = os.path.dirname(os.path.abspath(__file__))
+_REPO_ROOT = os.path.dirname(_PKG_DIR)
+
+DRIVER_NAMES = {"chrome": "chromedriver", "edge": "msedgedriver"}
+BROWSER_NAMES = {
+    "chrome": [
+        "google-chrome",
+        "google-chrome-stable",
+        "chromium",
+        "chromium-browser",
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    ],
+    "edge": [
+        "microsoft-edge",
+        "microsoft-edge-stable",
+        "msedge",
+        r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
+        r"C:\Program Files\Microsoft\Edge\Application\msedge.exe",
+        "/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge",
+    ],
+}
+_VERSION_RE = re.compile(r"(\d+)\.(\d+)\.(\d+)(?:\.(\d+))?")
+
+
+class DriverMismatchError(RuntimeError):
+    pass
+
+
+def default_cache_path() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "keepliver", "drivers.json")
+
+
+def local_driver(kind: str) -> str:
+    """A driver shipped next to the package (drivers/ etc.), else the bare name for PATH."""
+    name = DRIVER_NAMES[kind]
+    exe = f"{name}.exe" if os.name == "nt" else name
+    candidates = []
+    for base in (_PKG_DIR, _REPO_ROOT, os.path.join(_REPO_ROOT, "drivers")):
+        # Windows builds were historically dropped in as .exe even next to Linux checkouts.
+        candidates += [os.path.join(base, exe), os.path.join(base, f"{name}.exe")]
+    return next((p for p in candidates if os.path.isfile(p)), name)
+
+
+def _locate(names: List[str]) -> Optional[str]:
+    for name in names:
+        if not name:
+            continue
+        if os.path.isfile(name):
+            return os.path.abspath(name)
+        found = shutil.which(name)
+        if found:
+            return os.path.abspath(found)
+    return None
+
+
+def binary_version(path: str) -> Optional[str]:
+    """'126.0.6478.126' from `<path> --version`; None if it can't be run or parsed."""
+    try:
+        out = subprocess.run(
+            [path, "--version"], capture_output=True, text=True, timeout=15
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = _VERSION_RE.search(out or "")
+    return match.group(0) if match else None
+
+
+def _major(version: Optional[str]) -> Optional[int]:
+    return int(version.split(".", 1)[0]) if version else None
+
+
+def _stamp(path: Optional[str]) -> Optional[List[int]]:
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _load_cache(path: str) -> Dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path: str, data: Dict) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Warning: cannot write driver cache {path}: {e}")
+
+
+def resolve(
+    kind: str,
+    driver: Optional[str] = None,
+    binary: Optional[str] = None,
+    cache_path: Optional[str] = None,
+) -> Dict:
+    """Find the driver and browser for kind ("chrome"/"edge") and check their majors match.
+
+    Returns {"driver", "binary", "driver_version", "browser_version"}; paths are None when
+    nothing was found (Selenium Manager then takes over). The result is cached per request
+    and reused while both binaries keep their mtime and size, so a warm launch runs no
+    --version probes and no PATH search. Raises DriverMismatchError on a major mismatch.
+    """
+    cache_path = cache_path or default_cache_path()
+    key = f"{kind}|{driver or ''}|{binary or ''}"
+    cache = _load_cache(cache_path)
+    hit = cache.get(key)
+    if (
+        isinstance(hit, dict)
+        and hit.get("driver_stamp") == _stamp(hit.get("driver"))
+        and hit.get("binary_stamp") == _stamp(hit.get("binary"))
+    ):
+        return {k: hit.get(k) for k in ("driver", "binary", "driver_version", "browser_version")}
+
+    driver_path = _locate([driver or DRIVER_NAMES[kind]])
+    binary_path = _locate([binary] if binary else BROWSER_NAMES[kind])
+    result = {
+        "driver": driver_path,
+        "binary": binary_path,
+        "driver_version": binary_version(driver_path) if driver_path else None,
+        "browser_version": binary_version(binary_path) if binary_path else None,
+    }
+    driver_major = _major(result["driver_version"])
+    browser_major = _major(result["browser_version"])
+    if driver_major and browser_major and driver_major != browser_major:
+        raise DriverMismatchError(
+            f"{DRIVER_NAMES[kind]} {result['driver_version']} ({driver_path}) does not match "
+            f"{kind} {result['browser_version']} ({binary_path}); install driver "
+            f"{browser_major}.x and pass it with --{DRIVER_NAMES[kind].replace('ms', '')}."
+        )
+    if driver_path and binary_path:
+        # Misses are not cached: a driver installed later must be picked up.
+        cache[key] = dict(
+            result, driver_stamp=_stamp(driver_path), binary_stamp=_stamp(binary_path)
+        )
+        _save_cache(cache_path, cache)
+    return result
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+import threading
+from typing import Callable, Optional
+
+from keepliver import metrics
+from keepliver.proctree import tree_rss_kb
+
+
+class MemoryGovernor:
+    """Sample the RSS of the browser process tree we own and flag it when over budget.
+
+    Nothing is killed from here: the login code recycles the browser at its next safe point
+    (after the config is saved) when over_budget() is set. Current and peak figures go to
+    the browser_rss_mb / browser_rss_peak_mb gauges.
+    """
+
+    def __init__(
+        self,
+        root_pid: Callable[[], Optional[int]],
+        budget_mb: float = 0,
+        interval: float = 5.0,
+        sample: Callable[[int], int] = tree_rss_kb,
+    ):
+        self._root_pid = root_pid
+        self.budget_mb = budget_mb
+        self.interval = interval
+        self._sample = sample
+        self.rss_mb = 0.0
+        self.peak_mb = 0.0
+        self._over = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="keepliver-governor", daemon=True
+            )
+            self._thread.start()
+
+    def sample(self) -> float:
+        pid = self._root_pid()
+        self.rss_mb = self._sample(pid) / 1024 if pid else 0.0
+        self.peak_mb = max(self.peak_mb, self.rss_mb)
+        metrics.set_gauge("browser_rss_mb", self.rss_mb)
+        metrics.set_gauge("browser_rss_peak_mb", self.peak_mb)
+        if self.budget_mb and self.rss_mb > self.budget_mb and not self._over.is_set():
+            print(
+                f"[governor] browser RSS {self.rss_mb:.0f} MiB is over the "
+                f"{self.budget_mb:.0f} MiB budget; recycling at the next safe point.",
+                flush=True,
+            )
+            self._over.set()
+        return self.rss_mb
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"[governor] sampling failed: {e}", flush=True)
+
+    def over_budget(self) -> bool:
+        return self._over.is_set()
+
+    def recycled(self) -> None:
+        """Call after the browser was restarted: clears the flag and the current figure."""
+        metrics.inc("browser_recycles")
+        self.rss_mb = 0.0
+        self._over.clear()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
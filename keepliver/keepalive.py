@@ -1,12 +1,50 @@
 #!/usr/bin/env python3
 import argparse
 import hashlib
-import json
+import threading
 import time
-from typing import Dict, Tuple, Any
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple, Any
 
 import requests
 
+from keepliver import metrics
+from keepliver.config_store import load_config, save_config
+from keepliver.retry import CircuitOpenError, RetryPolicy, call_with_retry, get_breaker
+
+# Server clock offset learned from the `Date` header of earlier responses.
+# offset_ms = server_time - local_time; applied when generating ctg-timestamp.
+CLOCK_SKEW_STATE = {
+    "offset_ms": 0.0,
+    "samples": 0,
+}
+# EWMA weight for new samples; Date only has 1 s resolution so single samples are noisy.
+_CLOCK_SKEW_ALPHA = 0.3
+# Offsets below the Date header resolution are indistinguishable from noise.
+_CLOCK_SKEW_MIN_APPLY_MS = 1000
+# Responses slower than this give a poor estimate of when the server stamped them.
+_CLOCK_SKEW_MAX_RTT_MS = 5000
+# A jump this large means the local clock was stepped (NTP, VM resume); start over.
+_CLOCK_SKEW_RESET_MS = 60000
+
+# Recent connect round-trip times (seconds), used for adaptive timeout and hedging.
+_LATENCIES = deque(maxlen=64)
+_LATENCIES_LOCK = threading.Lock()
+_LATENCY_MIN_SAMPLES = 8
+# Timeouts since the last answered request. A timeout is not a latency sample: it would
+# drag p95 (the hedge delay) up to the timeout itself, turning hedging off when it matters.
+_TIMEOUT_STREAK = 0
+DEFAULT_TIMEOUT = 20.0
+_MIN_TIMEOUT = 3.0
+# Timeout = p99 * factor, clamped to [_MIN_TIMEOUT, DEFAULT_TIMEOUT].
+_TIMEOUT_P99_FACTOR = 3.0
+_HEDGE_POOL: Optional[ThreadPoolExecutor] = None
+_HEDGE_LOCK = threading.Lock()
+# A hedged call holds two slots (primary + duplicate); sized per concurrent caller.
+_HEDGE_WORKERS = 2
+
 
 def build_signature(
     device_type: str,
@@ -23,9 +61,70 @@ def build_signature(
     return hashlib.md5(signature_str.encode("utf-8")).hexdigest().upper()
 
 
-def load_config(path: str) -> Dict:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+def _parse_http_date(value: str) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except Exception:
+        return None
+
+
+def observe_server_date(date_header: Optional[str], sent_ms: float, recv_ms: float) -> None:
+    if not date_header:
+        return
+    server_s = _parse_http_date(date_header)
+    if server_s is None:
+        return
+    rtt_ms = recv_ms - sent_ms
+    if rtt_ms < 0 or rtt_ms > _CLOCK_SKEW_MAX_RTT_MS:
+        return
+    # Date is truncated to the second; assume the middle of that second and of the round trip.
+    sample = server_s * 1000 + 500 - (sent_ms + recv_ms) / 2
+    state = CLOCK_SKEW_STATE
+    if state["samples"] == 0 or abs(sample - state["offset_ms"]) > _CLOCK_SKEW_RESET_MS:
+        state["offset_ms"] = sample
+        state["samples"] = 1
+    else:
+        state["offset_ms"] += _CLOCK_SKEW_ALPHA * (sample - state["offset_ms"])
+        state["samples"] += 1
+    metrics.set_gauge("keepalive_clock_skew_ms", state["offset_ms"])
+    metrics.set_gauge("keepalive_clock_skew_samples", state["samples"])
+
+
+def get_clock_skew_ms() -> float:
+    return CLOCK_SKEW_STATE["offset_ms"]
+
+
+def server_now_ms() -> int:
+    now_ms = time.time() * 1000
+    offset = CLOCK_SKEW_STATE["offset_ms"]
+    if abs(offset) >= _CLOCK_SKEW_MIN_APPLY_MS:
+        now_ms += offset
+    return int(now_ms)
+
+
+def refresh_auth_from_profile(path: str, cfg: Dict, profile_dir: str) -> bool:
+    from keepliver.local_storage import refresh_config_auth
+
+    try:
+        changed = refresh_config_auth(cfg, profile_dir)
+    except Exception as e:
+        print(f"Warning: cannot read authData from profile {profile_dir}: {e}")
+        return False
+    if changed:
+        save_config(path, cfg)
+        print(f"Refreshed auth from profile: {profile_dir}")
+    return changed
+
+
+def profile_session(profile_dir: Optional[str]) -> Optional[requests.Session]:
+    if not profile_dir:
+        print("--profile-cookies needs a profile dir; sending without cookies.")
+        return None
+    from keepliver.cookies import ProfileCookieSession
+
+    session = ProfileCookieSession(profile_dir)
+    print(f"Loaded {len(session.cookies)} cookies from profile: {profile_dir}")
+    return session
 
 
 def _extract_auth(cfg: Dict) -> Tuple[str, str, str, str]:
@@ -44,20 +143,53 @@ def validate_config(cfg: Dict) -> None:
         raise ValueError("Missing auth/ctg values in config.json")
 
 
-def send_keepalive_once(cfg: Dict, timeout: int = 20) -> Tuple[bool, int, Any]:
+def record_latency(seconds: float) -> None:
+    global _TIMEOUT_STREAK
+    with _LATENCIES_LOCK:
+        _LATENCIES.append(seconds)
+        _TIMEOUT_STREAK = 0
+    p50 = latency_percentile(50)
+    p95 = latency_percentile(95)
+    if p50 is not None and p95 is not None:
+        metrics.set_gauge("keepalive_latency_p50_s", p50)
+        metrics.set_gauge("keepalive_latency_p95_s", p95)
+
+
+def record_timeout() -> None:
+    global _TIMEOUT_STREAK
+    with _LATENCIES_LOCK:
+        _TIMEOUT_STREAK += 1
+    metrics.inc("keepalive_timeouts")
+
+
+def latency_percentile(pct: float) -> Optional[float]:
+    with _LATENCIES_LOCK:
+        samples = sorted(_LATENCIES)
+    if len(samples) < _LATENCY_MIN_SAMPLES:
+        return None
+    index = min(len(samples) - 1, int(round(pct / 100.0 * (len(samples) - 1))))
+    return samples[index]
+
+
+def adaptive_timeout(default: float = DEFAULT_TIMEOUT) -> float:
+    p99 = latency_percentile(99)
+    if p99 is None or _TIMEOUT_STREAK:
+        # Slower than anything recorded: give the next attempt the full budget.
+        return default
+    return min(default, max(_MIN_TIMEOUT, p99 * _TIMEOUT_P99_FACTOR))
+
+
+def _build_keepalive_request(cfg: Dict) -> Tuple[str, Dict, Dict]:
     connect_url = cfg.get("connect_url") or "https://desk.ctyun.cn:8810/api/desktop/client/connect"
     device_info = cfg.get("device_info") or {}
-    ctg_headers = {k.lower(): v for k, v in (cfg.get("ctg_headers") or {}).items()}
-    auth = cfg.get("auth") or {}
+    return connect_url, device_info, build_signed_headers(cfg)
 
-    device_type_value = str(ctg_headers.get("ctg-devicetype", "60"))
-    tenant_id_value = str(auth.get("tenantId") or ctg_headers.get("ctg-tenantid", ""))
-    userid_value = str(auth.get("userId") or ctg_headers.get("ctg-userid", ""))
-    version_value = str(ctg_headers.get("ctg-version", ""))
-    secret_key_value = str(auth.get("secretKey", ""))
 
-    if not (tenant_id_value and userid_value and version_value and secret_key_value):
-        raise ValueError("Missing auth/ctg values in config.json")
+def build_signed_headers(cfg: Dict) -> Dict:
+    ctg_headers = {k.lower(): v for k, v in (cfg.get("ctg_headers") or {}).items()}
+    validate_config(cfg)
+    device_type_value = str(ctg_headers.get("ctg-devicetype", "60"))
+    tenant_id_value, userid_value, version_value, secret_key_value = _extract_auth(cfg)
 
     base_headers = {
         "accept": "application/json, text/plain, */*",
@@ -78,8 +210,8 @@ def send_keepalive_once(cfg: Dict, timeout: int = 20) -> Tuple[bool, int, Any]:
         if k in ctg_headers:
             base_headers[k] = ctg_headers[k]
 
-    request_id_value = str(int(time.time() * 1000))
-    timestamp_value = str(int(time.time() * 1000))
+    request_id_value = str(server_now_ms())
+    timestamp_value = str(server_now_ms())
     signature = build_signature(
         device_type_value,
         request_id_value,
@@ -93,8 +225,38 @@ def send_keepalive_once(cfg: Dict, timeout: int = 20) -> Tuple[bool, int, Any]:
     headers["ctg-requestid"] = request_id_value
     headers["ctg-timestamp"] = timestamp_value
     headers["ctg-signaturestr"] = signature
+    return headers
+
+
+def signed_post(
+    cfg: Dict,
+    url: str,
+    data: Optional[Dict] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    session: Optional[requests.Session] = None,
+) -> requests.Response:
+    http = session or requests
+    sent_ms = time.time() * 1000
+    resp = http.post(url, data=data or {}, headers=build_signed_headers(cfg), timeout=timeout)
+    observe_server_date(resp.headers.get("Date"), sent_ms, time.time() * 1000)
+    return resp
 
-    resp = requests.post(connect_url, data=device_info, headers=headers, timeout=timeout)
+
+def _post_keepalive(
+    cfg: Dict, timeout: float, session: Optional[requests.Session] = None
+) -> Tuple[bool, int, Any]:
+    # Signed per call, so a hedged duplicate carries its own request id/timestamp.
+    connect_url, device_info, headers = _build_keepalive_request(cfg)
+    http = session or requests
+    start = time.monotonic()
+    sent_ms = time.time() * 1000
+    try:
+        resp = http.post(connect_url, data=device_info, headers=headers, timeout=timeout)
+    except requests.Timeout:
+        record_timeout()
+        raise
+    record_latency(time.monotonic() - start)
+    observe_server_date(resp.headers.get("Date"), sent_ms, time.time() * 1000)
     try:
         payload = resp.json()
     except Exception:
@@ -103,6 +265,96 @@ def send_keepalive_once(cfg: Dict, timeout: int = 20) -> Tuple[bool, int, Any]:
     return ok, resp.status_code, payload
 
 
+def set_hedge_callers(callers: int) -> None:
+    """Size the hedge pool for this many concurrent keepalive callers (e.g. daemon workers).
+
+    A pool smaller than two slots per caller makes hedges queue behind the slow primaries
+    they were meant to race, exactly when the fleet is under load.
+    """
+    global _HEDGE_POOL, _HEDGE_WORKERS
+    workers = max(1, callers) * 2
+    with _HEDGE_LOCK:
+        if workers == _HEDGE_WORKERS:
+            return
+        _HEDGE_WORKERS = workers
+        old, _HEDGE_POOL = _HEDGE_POOL, None
+    if old is not None:
+        # In-flight requests finish on the old pool; new ones use the resized one.
+        old.shutdown(wait=False)
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    global _HEDGE_POOL
+    with _HEDGE_LOCK:
+        if _HEDGE_POOL is None:
+            _HEDGE_POOL = ThreadPoolExecutor(
+                max_workers=_HEDGE_WORKERS, thread_name_prefix="keepalive-hedge"
+            )
+        return _HEDGE_POOL
+
+
+def _send_hedged(
+    cfg: Dict, timeout: float, hedge_after: float, session: Optional[requests.Session]
+) -> Tuple[bool, int, Any]:
+    pool = _hedge_pool()
+    primary = pool.submit(_post_keepalive, cfg, timeout, session)
+    done, _ = wait([primary], timeout=hedge_after)
+    pending = {primary}
+    if not done:
+        # Primary is slower than p95: race a freshly signed duplicate against it.
+        metrics.inc("keepalive_hedged")
+        pending.add(pool.submit(_post_keepalive, cfg, timeout, session))
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                result = future.result()
+            except requests.RequestException as e:
+                error = e
+                continue
+            if future is not primary:
+                metrics.inc("keepalive_hedge_wins")
+            return result
+    raise error
+
+
+def send_keepalive_once(
+    cfg: Dict,
+    timeout: Optional[float] = None,
+    hedge: bool = False,
+    session: Optional[requests.Session] = None,
+) -> Tuple[bool, int, Any]:
+    if timeout is None:
+        timeout = adaptive_timeout()
+    metrics.set_gauge("keepalive_timeout_s", timeout)
+    hedge_after = latency_percentile(95) if hedge else None
+    if hedge_after is None or hedge_after >= timeout:
+        return _post_keepalive(cfg, timeout, session)
+    return _send_hedged(cfg, timeout, hedge_after, session)
+
+
+def _is_upstream_failure(result: Tuple[bool, int, Any]) -> bool:
+    return result[1] >= 500
+
+
+def send_keepalive_with_retry(
+    cfg: Dict,
+    policy: Optional[RetryPolicy] = None,
+    hedge: bool = False,
+    session: Optional[requests.Session] = None,
+) -> Tuple[bool, int, Any]:
+    # Network errors and 5xx are retried and count against the connect breaker;
+    # 4xx means the session/signature is bad and retrying won't help.
+    return call_with_retry(
+        lambda: send_keepalive_once(cfg, hedge=hedge, session=session),
+        policy or RetryPolicy(base=5, cap=120, max_attempts=4),
+        breaker=get_breaker("connect"),
+        retry_on=(requests.RequestException,),
+        is_failure=_is_upstream_failure,
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(description="CTYUN keepalive using captured config.")
     parser.add_argument(
@@ -121,21 +373,50 @@ def main():
         action="store_true",
         help="Send one request and exit.",
     )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Send a second signed request if the first is slower than recent p95.",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=None,
+        help="Browser profile to refresh authData from (read from disk, no browser).",
+    )
+    parser.add_argument(
+        "--profile-cookies",
+        action="store_true",
+        help="Send the profile's pc.ctyun.cn cookies with requests (needs --profile-dir).",
+    )
     args = parser.parse_args()
 
     cfg = load_config(args.config)
+    if args.profile_dir:
+        refresh_auth_from_profile(args.config, cfg, args.profile_dir)
     validate_config(cfg)
+    session = profile_session(args.profile_dir) if args.profile_cookies else None
 
     if args.once:
-        ok, status, payload = send_keepalive_once(cfg)
+        ok, status, payload = send_keepalive_with_retry(cfg, hedge=args.hedge, session=session)
         print("status:", status, "response:", payload)
+        print(f"clock skew: {get_clock_skew_ms():.0f} ms")
         if not ok:
             raise SystemExit(f"Keepalive failed with status {status}")
         return
 
     while True:
-        ok, status, payload = send_keepalive_once(cfg)
+        try:
+            ok, status, payload = send_keepalive_with_retry(cfg, hedge=args.hedge, session=session)
+        except CircuitOpenError as e:
+            print(f"keepalive skipped: {e}")
+            time.sleep(min(args.interval, max(e.retry_after, 1)))
+            continue
+        except requests.RequestException as e:
+            print(f"keepalive error: {e}")
+            time.sleep(args.interval)
+            continue
         print("status:", status, "response:", payload)
+        print(f"clock skew: {get_clock_skew_ms():.0f} ms")
         time.sleep(args.interval)
 
 
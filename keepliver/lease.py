@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+import json
+import os
+import socket
+import sqlite3
+import time
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+
+def default_node_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+# A node serves an account only while it holds that account's lease. Expiry is wall-clock
+# time, so node clocks must agree to well within the TTL; a dead node stops renewing and a
+# peer takes the account over once its lease expires.
+class LeaseBackend:
+    def acquire(self, account: str, owner: str, ttl: float) -> Optional[float]:
+        """Take or renew the lease; returns its new expiry, or None if a peer holds it."""
+        raise NotImplementedError
+
+    def release(self, account: str, owner: str) -> None:
+        """Give the lease up now (only if owner holds it) so a peer can take over at once."""
+        raise NotImplementedError
+
+    def holder(self, account: str) -> Optional[Tuple[str, float]]:
+        """(owner, expiry) of an unexpired lease, else None."""
+        raise NotImplementedError
+
+
+class SqliteLeases(LeaseBackend):
+    """One row per account in a SQLite file; use a filesystem with working POSIX locks."""
+
+    def __init__(self, path: str):
+        self.path = path
+        db = self._connect()
+        try:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS leases "
+                "(account TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+        finally:
+            db.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A fresh connection per call: the daemon calls in from several threads.
+        return sqlite3.connect(self.path, timeout=10, isolation_level=None)
+
+    def acquire(self, account: str, owner: str, ttl: float) -> Optional[float]:
+        now = time.time()
+        expires = now + ttl
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            cur = db.execute(
+                "INSERT INTO leases (account, owner, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT(account) DO UPDATE SET owner = excluded.owner, "
+                "expires = excluded.expires WHERE leases.owner = excluded.owner "
+                "OR leases.expires < ?",
+                (account, owner, expires, now),
+            )
+            db.execute("COMMIT")
+            return expires if cur.rowcount else None
+        except BaseException:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+    def release(self, account: str, owner: str) -> None:
+        db = self._connect()
+        try:
+            db.execute("DELETE FROM leases WHERE account = ? AND owner = ?", (account, owner))
+        finally:
+            db.close()
+
+    def holder(self, account: str) -> Optional[Tuple[str, float]]:
+        db = self._connect()
+        try:
+            row = db.execute(
+                "SELECT owner, expires FROM leases WHERE account = ?", (account,)
+            ).fetchone()
+        finally:
+            db.close()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0], row[1]
+
+
+class DirectoryLeases(LeaseBackend):
+    """A JSON lease file per account, guarded by an atomic mkdir lock (works on NFS)."""
+
+    STALE_LOCK_S = 30.0
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, account: str) -> str:
+        return os.path.join(self.path, f"{quote(account, safe='')}.lease")
+
+    def _lock(self, account: str) -> str:
+        lock = os.path.join(self.path, f"{quote(account, safe='')}.lock")
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                os.mkdir(lock)
+                return lock
+            except FileExistsError:
+                pass
+            try:
+                # The holder died inside the few milliseconds it keeps the lock.
+                if time.time() - os.stat(lock).st_mtime > self.STALE_LOCK_S:
+                    os.rmdir(lock)
+                    continue
+            except OSError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"lease lock busy: {lock}")
+            time.sleep(0.05)
+
+    def _read(self, account: str) -> Optional[Tuple[str, float]]:
+        try:
+            with open(self._file(account), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return str(data["owner"]), float(data["expires"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def acquire(self, account: str, owner: str, ttl: float) -> Optional[float]:
+        lock = self._lock(account)
+        try:
+            now = time.time()
+            current = self._read(account)
+            if current is not None and current[0] != owner and current[1] >= now:
+                return None
+            expires = now + ttl
+            tmp = f"{self._file(account)}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"owner": owner, "expires": expires}, f)
+            os.replace(tmp, self._file(account))
+            return expires
+        finally:
+            os.rmdir(lock)
+
+    def release(self, account: str, owner: str) -> None:
+        lock = self._lock(account)
+        try:
+            current = self._read(account)
+            if current is not None and current[0] == owner:
+                os.remove(self._file(account))
+        finally:
+            os.rmdir(lock)
+
+    def holder(self, account: str) -> Optional[Tuple[str, float]]:
+        current = self._read(account)
+        if current is None or current[1] < time.time():
+            return None
+        return current
+
+
+def make_backend(spec: str) -> LeaseBackend:
+    """'sqlite:/shared/leases.db' or 'dir:/shared/leases'."""
+    kind, sep, path = spec.partition(":")
+    if not sep or not path:
+        raise ValueError(f"lease backend must be sqlite:<file> or dir:<path>, not {spec!r}")
+    if kind == "sqlite":
+        return SqliteLeases(path)
+    if kind == "dir":
+        return DirectoryLeases(path)
+    raise ValueError(f"unknown lease backend: {kind}")
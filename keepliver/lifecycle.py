@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+import signal
+import threading
+from typing import Optional
+
+
+class Lifecycle:
+    """Reload/stop requests from signals or control commands, plus an interruptible sleep.
+
+    Handlers only set flags: whatever is running (a keepalive, a login) finishes, and the
+    owning loop picks the request up at its next check or as soon as its sleep is cut short.
+    """
+
+    def __init__(self):
+        self._wake = threading.Event()
+        self._reload = threading.Event()
+        self.stopping = threading.Event()
+
+    def install(self) -> None:
+        if threading.current_thread() is not threading.main_thread():
+            return
+        signal.signal(signal.SIGTERM, self._on_stop)
+        if hasattr(signal, "SIGHUP"):
+            # Not available on Windows; reload through the control command there.
+            signal.signal(signal.SIGHUP, self._on_reload)
+
+    def _on_stop(self, signum, _frame) -> None:
+        print(f"received {signal.Signals(signum).name}, finishing in-flight work", flush=True)
+        self.request_stop()
+
+    def _on_reload(self, _signum, _frame) -> None:
+        self.request_reload()
+
+    def request_stop(self) -> None:
+        self.stopping.set()
+        self._wake.set()
+
+    def request_reload(self) -> None:
+        self._reload.set()
+        self._wake.set()
+
+    def wake(self) -> None:
+        """Cut the current sleep short, e.g. to run a keepalive now."""
+        self._wake.set()
+
+    def take_reload(self) -> bool:
+        if not self._reload.is_set():
+            return False
+        self._reload.clear()
+        return True
+
+    def sleep(self, seconds: Optional[float]) -> bool:
+        """Sleep unless a reload/stop arrives first; True if the sleep was cut short."""
+        woke = self._wake.wait(seconds)
+        self._wake.clear()
+        if self.stopping.is_set():
+            # Keep later sleeps from blocking shutdown.
+            self._wake.set()
+        return woke
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""Read Chromium Local Storage straight from a profile's LevelDB, without a browser.
+
+Only what Local Storage needs is implemented: write-ahead ``.log`` files, ``.ldb``
+tables (uncompressed or snappy blocks) and newest-sequence-wins resolution.
+"""
+import argparse
+import glob
+import json
+import os
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple
+
+CTYUN_ORIGIN = "https://pc.ctyun.cn"
+
+_LOG_BLOCK_SIZE = 32768
+_LOG_FULL, _LOG_FIRST, _LOG_MIDDLE, _LOG_LAST = 1, 2, 3, 4
+_TABLE_MAGIC = 0xDB4775248B80FB57
+_TYPE_DELETION, _TYPE_VALUE = 0, 1
+
+# (user_key, sequence, value_type, value)
+Entry = Tuple[bytes, int, int, bytes]
+
+
+def _varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+def snappy_decompress(data: bytes) -> bytes:
+    length, pos = _varint(data, 0)
+    out = bytearray()
+    while pos < len(data):
+        tag = data[pos]
+        pos += 1
+        kind = tag & 3
+        if kind == 0:
+            size = tag >> 2
+            if size >= 60:
+                extra = size - 59
+                size = int.from_bytes(data[pos : pos + extra], "little")
+                pos += extra
+            size += 1
+            out += data[pos : pos + size]
+            pos += size
+            continue
+        if kind == 1:
+            size = ((tag >> 2) & 7) + 4
+            offset = ((tag >> 5) << 8) | data[pos]
+            pos += 1
+        elif kind == 2:
+            size = (tag >> 2) + 1
+            offset = int.from_bytes(data[pos : pos + 2], "little")
+            pos += 2
+        else:
+            size = (tag >> 2) + 1
+            offset = int.from_bytes(data[pos : pos + 4], "little")
+            pos += 4
+        if offset <= 0 or offset > len(out):
+            raise ValueError("corrupt snappy stream")
+        start = len(out) - offset
+        for i in range(size):
+            out.append(out[start + i])
+    if len(out) != length:
+        raise ValueError("snappy length mismatch")
+    return bytes(out)
+
+
+def _log_records(data: bytes) -> Iterator[bytes]:
+    pending = bytearray()
+    pos = 0
+    while pos + 7 <= len(data):
+        block_left = _LOG_BLOCK_SIZE - pos % _LOG_BLOCK_SIZE
+        if block_left < 7:
+            pos += block_left
+            continue
+        length, rtype = struct.unpack_from("<HB", data, pos + 4)
+        if rtype == 0:
+            # Zero padding from a preallocated file: skip to the next block.
+            pos += block_left
+            continue
+        chunk = data[pos + 7 : pos + 7 + length]
+        pos += 7 + length
+        if rtype == _LOG_FULL:
+            yield bytes(chunk)
+            pending.clear()
+        elif rtype == _LOG_FIRST:
+            pending = bytearray(chunk)
+        elif rtype == _LOG_MIDDLE:
+            pending += chunk
+        elif rtype == _LOG_LAST:
+            pending += chunk
+            yield bytes(pending)
+            pending.clear()
+
+
+def _parse_write_batch(batch: bytes) -> Iterator[Entry]:
+    if len(batch) < 12:
+        return
+    seq, count = struct.unpack_from("<QI", batch, 0)
+    pos = 12
+    for i in range(count):
+        vtype = batch[pos]
+        pos += 1
+        klen, pos = _varint(batch, pos)
+        key = batch[pos : pos + klen]
+        pos += klen
+        value = b""
+        if vtype == _TYPE_VALUE:
+            vlen, pos = _varint(batch, pos)
+            value = batch[pos : pos + vlen]
+            pos += vlen
+        yield key, seq + i, vtype, value
+
+
+def read_log_file(path: str) -> List[Entry]:
+    with open(path, "rb") as f:
+        data = f.read()
+    entries: List[Entry] = []
+    for record in _log_records(data):
+        try:
+            entries.extend(_parse_write_batch(record))
+        except (IndexError, struct.error):
+            continue
+    return entries
+
+
+def _read_block(data: bytes, offset: int, size: int) -> bytes:
+    raw = data[offset : offset + size]
+    compression = data[offset + size]
+    if compression == 1:
+        return snappy_decompress(raw)
+    if compression != 0:
+        raise ValueError(f"unsupported block compression {compression}")
+    return raw
+
+
+def _block_entries(block: bytes) -> Iterator[Tuple[bytes, bytes]]:
+    num_restarts = struct.unpack_from("<I", block, len(block) - 4)[0]
+    end = len(block) - 4 - 4 * num_restarts
+    pos = 0
+    key = b""
+    while pos < end:
+        shared, pos = _varint(block, pos)
+        non_shared, pos = _varint(block, pos)
+        vlen, pos = _varint(block, pos)
+        key = key[:shared] + block[pos : pos + non_shared]
+        pos += non_shared
+        yield key, block[pos : pos + vlen]
+        pos += vlen
+
+
+def read_table_file(path: str) -> List[Entry]:
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < 48 or struct.unpack_from("<Q", data, len(data) - 8)[0] != _TABLE_MAGIC:
+        raise ValueError(f"not a leveldb table: {path}")
+    footer_pos = len(data) - 48
+    _meta_offset, pos = _varint(data, footer_pos)
+    _meta_size, pos = _varint(data, pos)
+    index_offset, pos = _varint(data, pos)
+    index_size, pos = _varint(data, pos)
+    entries: List[Entry] = []
+    for _last_key, handle in _block_entries(_read_block(data, index_offset, index_size)):
+        block_offset, hpos = _varint(handle, 0)
+        block_size, _ = _varint(handle, hpos)
+        for ikey, value in _block_entries(_read_block(data, block_offset, block_size)):
+            if len(ikey) < 8:
+                continue
+            tag = struct.unpack_from("<Q", ikey, len(ikey) - 8)[0]
+            entries.append((ikey[:-8], tag >> 8, tag & 0xFF, value))
+    return entries
+
+
+def read_leveldb(db_dir: str) -> Dict[bytes, bytes]:
+    latest: Dict[bytes, Tuple[int, int, bytes]] = {}
+    files = glob.glob(os.path.join(db_dir, "*.ldb")) + glob.glob(os.path.join(db_dir, "*.sst"))
+    files += glob.glob(os.path.join(db_dir, "*.log"))
+    for path in files:
+        try:
+            if path.endswith(".log"):
+                entries = read_log_file(path)
+            else:
+                entries = read_table_file(path)
+        except (OSError, ValueError, IndexError, struct.error) as e:
+            print(f"Warning: skipping {path}: {e}")
+            continue
+        for key, seq, vtype, value in entries:
+            current = latest.get(key)
+            if current is None or seq > current[0]:
+                latest[key] = (seq, vtype, value)
+    return {k: v for k, (_seq, vtype, v) in latest.items() if vtype == _TYPE_VALUE}
+
+
+def _encode_key(origin: str, key: str) -> List[bytes]:
+    prefix = b"_" + origin.encode("utf-8") + b"\x00"
+    candidates = [prefix + b"\x00" + key.encode("utf-16-le")]
+    try:
+        candidates.insert(0, prefix + b"\x01" + key.encode("latin-1"))
+    except UnicodeEncodeError:
+        pass
+    return candidates
+
+
+def _decode_value(raw: bytes) -> Optional[str]:
+    if not raw:
+        return None
+    if raw[0] == 1:
+        return raw[1:].decode("latin-1")
+    if raw[0] == 0:
+        return raw[1:].decode("utf-16-le", errors="replace")
+    return None
+
+
+def local_storage_dirs(profile_dir: str) -> List[str]:
+    dirs = []
+    others = sorted(glob.glob(os.path.join(profile_dir, "Profile *")))
+    for name in ["Default"] + [os.path.basename(p) for p in others]:
+        path = os.path.join(profile_dir, name, "Local Storage", "leveldb")
+        if os.path.isdir(path):
+            dirs.append(path)
+    return dirs
+
+
+def read_local_storage(profile_dir: str, key: str, origin: str = CTYUN_ORIGIN) -> Optional[str]:
+    for db_dir in local_storage_dirs(profile_dir):
+        data = read_leveldb(db_dir)
+        for encoded in _encode_key(origin, key):
+            if encoded in data:
+                return _decode_value(data[encoded])
+    return None
+
+
+def read_auth_data(profile_dir: str) -> Optional[dict]:
+    text = read_local_storage(profile_dir, "authData")
+    if not text:
+        return None
+    try:
+        data = json.loads(text)
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def auth_from_auth_data(auth_data: dict) -> dict:
+    return {
+        "userId": auth_data.get("userId"),
+        "tenantId": auth_data.get("tenantId"),
+        "secretKey": auth_data.get("secretKey"),
+        "userAccount": auth_data.get("userAccount"),
+    }
+
+
+def refresh_config_auth(cfg: dict, profile_dir: str) -> bool:
+    """Replace cfg['auth'] with the profile's authData; True if anything changed."""
+    auth_data = read_auth_data(profile_dir)
+    if not auth_data or not auth_data.get("secretKey"):
+        return False
+    auth = auth_from_auth_data(auth_data)
+    if auth == cfg.get("auth"):
+        return False
+    cfg["auth"] = auth
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print authData from a browser profile on disk.")
+    parser.add_argument(
+        "--profile-dir",
+        default=os.path.join(os.path.dirname(__file__), ".selenium-profile"),
+        help="Browser user-data dir.",
+    )
+    parser.add_argument("--key", default="authData", help="Local Storage key.")
+    parser.add_argument("--origin", default=CTYUN_ORIGIN, help="Local Storage origin.")
+    args = parser.parse_args()
+    value = read_local_storage(args.profile_dir, args.key, args.origin)
+    if value is None:
+        raise SystemExit(f"{args.key} not found for {args.origin} in {args.profile_dir}")
+    print(value)
+
+
+if __name__ == "__main__":
+    main()
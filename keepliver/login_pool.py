@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+import heapq
+import itertools
+import threading
+from typing import Callable, List, Optional, Tuple
+
+
+def mem_available_mb() -> Optional[float]:
+    """MemAvailable from /proc/meminfo in MiB; None where it can't be read."""
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class LoginPool:
+    """Run login jobs on up to `workers` threads, most urgent first.
+
+    Each job drives its own browser (normally in a login worker process), so a new job is
+    only admitted while MemAvailable stays above min_free_mb; one job may always run.
+    Jobs with equal priority run in submission order.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        min_free_mb: float = 0,
+        mem_available: Callable[[], Optional[float]] = mem_available_mb,
+        recheck: float = 5.0,
+    ):
+        self.workers = max(1, workers)
+        self.min_free_mb = min_free_mb
+        self._mem_available = mem_available
+        self._recheck = recheck
+        self._queue: List[tuple] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running = 0
+        self._shutdown = False
+        self._threads = [
+            threading.Thread(target=self._run, name=f"keepliver-login-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn: Callable, *args, priority=0.0) -> None:
+        """Queue fn(*args); lower priority values (numbers or tuples) run first."""
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("login pool is shut down")
+            heapq.heappush(self._queue, (priority, next(self._seq), fn, args))
+            self._cond.notify()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"running": self._running, "queued": len(self._queue)}
+
+    def _admit(self) -> bool:
+        if self._running == 0 or not self.min_free_mb:
+            return True
+        free = self._mem_available()
+        return free is None or free >= self.min_free_mb
+
+    def _next(self) -> Optional[Tuple[Callable, tuple]]:
+        with self._cond:
+            while True:
+                if self._shutdown:
+                    return None
+                if self._queue:
+                    if self._admit():
+                        _priority, _seq, fn, args = heapq.heappop(self._queue)
+                        self._running += 1
+                        return fn, args
+                    # Memory frees up without a notify when another login's browser exits.
+                    self._cond.wait(self._recheck)
+                else:
+                    self._cond.wait()
+
+    def _run(self) -> None:
+        while True:
+            job = self._next()
+            if job is None:
+                return
+            fn, args = job
+            try:
+                fn(*args)
+            except BaseException as e:
+                print(f"[login-pool] job failed: {e!r}", flush=True)
+            finally:
+                with self._cond:
+                    self._running -= 1
+                    self._cond.notify_all()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Drop queued jobs; running jobs finish (and are waited for when wait is set)."""
+        with self._cond:
+            self._shutdown = True
+            self._queue.clear()
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
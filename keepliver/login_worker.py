@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Run a browser login in a short-lived child interpreter.
+
+selenium, ddddocr/onnxruntime and PIL are only ever imported by the worker, so the
+long-running auto/daemon process stays small and the memory is returned when it exits.
+The worker writes the config to its --out path as usual; failures come back through a
+small JSON result file.
+"""
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import List, Optional
+
+from keepliver import metrics
+from keepliver.deadline import PhaseTimeout
+from keepliver.proctree import kill_tree
+from keepliver.sdnotify import still_busy
+
+# Only these modules may be started as workers.
+LOGIN_MODULES = ("keepliver.ctyun_auto_selenium", "keepliver.ctyun_auto")
+_RESULT_ENV = "KEEPLIVER_WORKER_RESULT"
+
+
+class LoginWorkerError(RuntimeError):
+    pass
+
+
+def _wait(proc: subprocess.Popen, timeout: Optional[float]) -> int:
+    if timeout is not None:
+        return proc.wait(timeout)
+    # Open-ended on purpose (--keep-browser 0): the worker's own phase deadlines bound the
+    # login, so keep the systemd watchdog fed while it runs.
+    while True:
+        try:
+            return proc.wait(1.0)
+        except subprocess.TimeoutExpired:
+            still_busy()
+
+
+def run_worker(module: str, argv: List[str], timeout: Optional[float] = None) -> None:
+    """Run module.main() with argv in a child process; raise if the login raised."""
+    if module not in LOGIN_MODULES:
+        raise ValueError(f"not a login module: {module}")
+    fd, result_path = tempfile.mkstemp(prefix="keepliver-worker-", suffix=".json")
+    os.close(fd)
+    env = dict(os.environ, **{_RESULT_ENV: result_path})
+    # The child must import this same keepliver, installed or not.
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (root, env.get("PYTHONPATH")) if p)
+    cmd = [sys.executable, "-m", "keepliver.login_worker", module] + list(argv)
+    try:
+        proc = subprocess.Popen(cmd, env=env)
+        try:
+            code = _wait(proc, timeout)
+        except subprocess.TimeoutExpired:
+            # The worker's own phase deadlines should have fired long before this.
+            kill_tree(proc.pid)
+            proc.wait()
+            raise PhaseTimeout("worker", timeout)
+        except BaseException:
+            kill_tree(proc.pid)
+            proc.wait()
+            raise
+        result = _read_result(result_path)
+        for name, value in (result.get("metrics") or {}).items():
+            # Measured in the worker; shown by 'ctl metrics' here.
+            metrics.set_gauge(name, value)
+        if code == 0:
+            return
+        if result.get("error") == "PhaseTimeout":
+            raise PhaseTimeout(result.get("phase") or "unknown", result.get("seconds") or 0)
+        message = result.get("message") or f"exit code {code}"
+        raise LoginWorkerError(f"login worker failed: {message}")
+    finally:
+        try:
+            os.remove(result_path)
+        except OSError:
+            pass
+
+
+def _read_result(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_result(data: dict) -> None:
+    path = os.environ.get(_RESULT_ENV)
+    if not path:
+        return
+    # Browser memory figures travel back with every result, for capacity planning.
+    browser = {k: v for k, v in metrics.snapshot().items() if k.startswith("browser_")}
+    data = dict(data, metrics=browser)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in LOGIN_MODULES:
+        raise SystemExit(f"usage: login_worker.py {{{','.join(LOGIN_MODULES)}}} [args...]")
+    name = sys.argv[1]
+    sys.argv = [name.rsplit(".", 1)[-1] + ".py"] + sys.argv[2:]
+    try:
+        importlib.import_module(name).main()
+        _write_result({})
+    except PhaseTimeout as e:
+        _write_result({"error": "PhaseTimeout", "phase": e.phase, "seconds": e.seconds})
+        print(f"[worker] {e}", flush=True)
+        raise SystemExit(3)
+    except SystemExit:
+        _write_result({})
+        raise
+    except BaseException as e:
+        _write_result({"error": type(e).__name__, "message": f"{type(e).__name__}: {e}"})
+        raise
+
+
+if __name__ == "__main__":
+    main()
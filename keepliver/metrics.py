@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+import threading
+from typing import Dict
+
+_LOCK = threading.Lock()
+_METRICS: Dict[str, float] = {}
+
+
+def set_gauge(name: str, value: float) -> None:
+    with _LOCK:
+        _METRICS[name] = float(value)
+
+
+def inc(name: str, value: float = 1.0) -> None:
+    with _LOCK:
+        _METRICS[name] = _METRICS.get(name, 0.0) + float(value)
+
+
+def get(name: str, default: float = 0.0) -> float:
+    with _LOCK:
+        return _METRICS.get(name, default)
+
+
+def snapshot() -> Dict[str, float]:
+    with _LOCK:
+        return dict(_METRICS)
+
+
+def format_metrics(values: Dict[str, float]) -> str:
+    lines = []
+    for name in sorted(values):
+        value = values[name]
+        if value == int(value):
+            lines.append(f"{name} {int(value)}")
+        else:
+            lines.append(f"{name} {value:.3f}")
+    return "\n".join(lines)
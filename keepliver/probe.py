@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+import argparse
+import threading
+import time
+from typing import Any, Collection, Dict, Optional, Tuple
+
+import requests
+
+from keepliver import metrics
+
+VALID = "valid"
+EXPIRED = "expired"
+UNKNOWN = "unknown"
+
+# There is no confirmed read-only endpoint, so probing is off until one is configured
+# (--probe-url or probe_url in config.json); without it callers act as if probing was unknown.
+DEFAULT_PROBE_TTL = 60.0
+DEFAULT_PROBE_TIMEOUT = 5.0
+_PROBE_DATA = {"pageNum": 1, "pageSize": 1}
+SUCCESS_CODES = (0, "0")
+
+# (url, tenantId, userId, secretKey) -> (monotonic ts, result). Only definite answers are cached.
+_CACHE: Dict[Tuple[str, str, str, str], Tuple[float, str]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def probe_url(cfg: Dict, url: Optional[str] = None) -> Optional[str]:
+    return url or cfg.get("probe_url") or None
+
+
+def _cache_key(cfg: Dict, url: Optional[str]) -> Tuple[str, str, str, str]:
+    auth = cfg.get("auth") or {}
+    return (
+        url,
+        str(auth.get("tenantId", "")),
+        str(auth.get("userId", "")),
+        str(auth.get("secretKey", "")),
+    )
+
+
+def classify_response(status: int, payload: Any, expired_codes: Collection = ()) -> str:
+    """VALID only on an explicit success code; EXPIRED only on 401/403 or a listed auth code."""
+    if status in (401, 403):
+        return EXPIRED
+    if status != 200 or not isinstance(payload, dict) or "code" not in payload:
+        return UNKNOWN
+    code = payload["code"]
+    if code in SUCCESS_CODES:
+        return VALID
+    if str(code) in {str(c) for c in expired_codes}:
+        return EXPIRED
+    return UNKNOWN
+
+
+def remember(cfg: Dict, result: str, url: Optional[str] = None) -> None:
+    """Seed the cache from another signed call (e.g. a keepalive that just succeeded)."""
+    url = probe_url(cfg, url)
+    if result == UNKNOWN or url is None:
+        return
+    with _CACHE_LOCK:
+        _CACHE[_cache_key(cfg, url)] = (time.monotonic(), result)
+
+
+def invalidate(cfg: Optional[Dict] = None, url: Optional[str] = None) -> None:
+    with _CACHE_LOCK:
+        if cfg is None:
+            _CACHE.clear()
+        else:
+            _CACHE.pop(_cache_key(cfg, probe_url(cfg, url)), None)
+
+
+def probe_session(
+    cfg: Dict,
+    url: Optional[str] = None,
+    ttl: float = DEFAULT_PROBE_TTL,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+    session: Optional[requests.Session] = None,
+) -> str:
+    from keepliver.keepalive import signed_post
+
+    url = probe_url(cfg, url)
+    if url is None:
+        return UNKNOWN
+    key = _cache_key(cfg, url)
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+    if cached is not None and now - cached[0] < ttl:
+        metrics.inc("session_probe_cache_hits")
+        return cached[1]
+    try:
+        resp = signed_post(cfg, url, data=_PROBE_DATA, timeout=timeout, session=session)
+    except ValueError:
+        # build_signed_headers: auth values missing, nothing to sign with.
+        result = EXPIRED
+    except requests.RequestException as e:
+        print(f"session probe error: {e}")
+        result = UNKNOWN
+    else:
+        try:
+            payload = resp.json()
+        except Exception:
+            payload = resp.text
+        result = classify_response(
+            resp.status_code, payload, cfg.get("probe_expired_codes") or ()
+        )
+    metrics.inc(f"session_probe_{result}")
+    remember(cfg, result, url)
+    return result
+
+
+def main():
+    from keepliver.keepalive import load_config
+
+    parser = argparse.ArgumentParser(description="Check whether config.json's session is valid.")
+    parser.add_argument("--config", default="keepliver/config.json", help="Path to config.json.")
+    parser.add_argument("--probe-url", default=None, help="Signed read-only endpoint to call.")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_PROBE_TIMEOUT)
+    args = parser.parse_args()
+    cfg = load_config(args.config)
+    if probe_url(cfg, args.probe_url) is None:
+        parser.error("no probe endpoint: pass --probe-url or set probe_url in config.json")
+    result = probe_session(cfg, url=args.probe_url, timeout=args.timeout)
+    print(result)
+    raise SystemExit({VALID: 0, EXPIRED: 1}.get(result, 2))
+
+
+if __name__ == "__main__":
+    main()
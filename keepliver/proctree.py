@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import os
+import signal
+import subprocess
+from typing import Dict, List
+
+
+def _parent_map() -> Dict[int, int]:
+    parents = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces and parentheses; ppid follows the last ')'.
+        fields = stat.rsplit(")", 1)[-1].split()
+        if len(fields) > 1:
+            parents[int(name)] = int(fields[1])
+    return parents
+
+
+def descendants(pid: int) -> List[int]:
+    """All processes below pid (children, grandchildren, ...); empty without /proc."""
+    if not os.path.isdir("/proc"):
+        return []
+    children: Dict[int, List[int]] = {}
+    for child, parent in _parent_map().items():
+        children.setdefault(parent, []).append(child)
+    found = []
+    stack = list(children.get(pid, []))
+    while stack:
+        child = stack.pop()
+        found.append(child)
+        stack.extend(children.get(child, []))
+    return found
+
+
+def kill_tree(pid: int) -> None:
+    """SIGKILL pid, its process group (if it leads one) and every descendant."""
+    if os.name == "nt":
+        subprocess.run(
+            ["taskkill", "/PID", str(pid), "/T", "/F"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        return
+    # Collect first: once the parent dies its children are re-parented and lost to the walk.
+    pids = [pid] + descendants(pid)
+    try:
+        if os.getpgid(pid) == pid:
+            os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        pass
+    for target in pids:
+        try:
+            os.kill(target, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+def rss_kb(pid: int) -> int:
+    """VmRSS of one process in KiB from /proc/<pid>/status; 0 if it is gone or unreadable."""
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def tree_rss_kb(pid: int) -> int:
+    """Summed RSS of pid and all its descendants (shared pages are counted in each)."""
+    return sum(rss_kb(p) for p in [pid] + descendants(pid))
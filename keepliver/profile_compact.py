@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import shutil
+from typing import List, Tuple
+
+from keepliver.profile_tmpfs import DISPOSABLE, ESSENTIAL
+
+# Top-level entries of a user-data dir that only hold logs, crash dumps and downloads.
+DISPOSABLE_TOP = (
+    "BrowserMetrics",
+    "Crashpad",
+    "component_crx_cache",
+    "optimization_guide_model_store",
+    "chrome_debug.log",
+    "chrome_shutdown_ms.txt",
+)
+
+
+def path_size(path: str) -> int:
+    if not os.path.isdir(path) or os.path.islink(path):
+        try:
+            return os.lstat(path).st_size
+        except OSError:
+            return 0
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def disposable_entries(profile_dir: str) -> List[Tuple[int, str]]:
+    """(size, path) of everything the browser can rebuild, largest first."""
+    found = []
+    for name in DISPOSABLE_TOP:
+        path = os.path.join(profile_dir, name)
+        if os.path.lexists(path):
+            found.append(path)
+    for root, dirs, _files in os.walk(profile_dir):
+        # Login state lives in the ESSENTIAL entries; never descend into them.
+        dirs[:] = [d for d in dirs if d not in ESSENTIAL]
+        for name in list(dirs):
+            if name in DISPOSABLE:
+                found.append(os.path.join(root, name))
+                dirs.remove(name)
+    return sorted(((path_size(p), p) for p in set(found)), reverse=True)
+
+
+def compact_profile(profile_dir: str, budget_mb: float) -> int:
+    """Delete disposable caches, largest first, until the profile fits budget_mb.
+
+    Returns the bytes freed (0 when the profile already fits).
+    """
+    budget = budget_mb * 1024 * 1024
+    size = path_size(profile_dir)
+    if size <= budget:
+        return 0
+    freed = 0
+    for entry_size, path in disposable_entries(profile_dir):
+        if size - freed <= budget:
+            break
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+        freed += entry_size - path_size(path)
+    return freed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trim browser caches from a profile.")
+    parser.add_argument(
+        "--profile-dir",
+        default=os.path.join(os.path.dirname(__file__), ".selenium-profile"),
+        help="Browser user-data dir.",
+    )
+    parser.add_argument("--budget-mb", type=float, default=0, help="Target size (0 = trim all).")
+    args = parser.parse_args()
+    before = path_size(args.profile_dir)
+    freed = compact_profile(args.profile_dir, args.budget_mb)
+    print(f"{args.profile_dir}: {before / 2**20:.1f} MiB, freed {freed / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+import hashlib
+import os
+import shutil
+from typing import List, Optional
+
+# Rebuilt by the browser on demand; not worth tmpfs RAM or the copy time.
+DISPOSABLE = (
+    "Cache",
+    "Code Cache",
+    "GPUCache",
+    "ShaderCache",
+    "GrShaderCache",
+    "GraphiteDawnCache",
+    "DawnCache",
+    "Crashpad",
+    "CacheStorage",
+    "ScriptCache",
+)
+# What a login needs to survive: the session lives in these.
+ESSENTIAL = (
+    "Local Storage",
+    "Cookies",
+    "Cookies-journal",
+    os.path.join("Network", "Cookies"),
+    os.path.join("Network", "Cookies-journal"),
+    "Preferences",
+    "Secure Preferences",
+)
+
+
+def default_tmpfs() -> Optional[str]:
+    path = "/dev/shm"
+    return path if os.path.isdir(path) and os.access(path, os.W_OK) else None
+
+
+def _profile_dirs(root: str) -> List[str]:
+    """The per-profile directories (Default, Profile 1, ...) inside a user-data dir."""
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return []
+    profiles = [n for n in names if n == "Default" or n.startswith("Profile ")]
+    return [n for n in profiles if os.path.isdir(os.path.join(root, n))]
+
+
+def _ignore(_dir: str, names: List[str]) -> List[str]:
+    return [n for n in names if n in DISPOSABLE or n.startswith("Singleton")]
+
+
+def stage_profile(profile_dir: str, tmpfs_dir: str) -> str:
+    """Copy profile_dir (minus caches and locks) under tmpfs_dir and return the copy's path."""
+    key = hashlib.sha1(os.path.abspath(profile_dir).encode("utf-8")).hexdigest()[:12]
+    owner = os.getuid() if hasattr(os, "getuid") else 0
+    staged = os.path.join(tmpfs_dir, f"keepliver-profile-{owner}-{key}")
+    # A leftover copy is from a run that did not sync back; the disk profile wins.
+    shutil.rmtree(staged, ignore_errors=True)
+    if os.path.isdir(profile_dir):
+        shutil.copytree(profile_dir, staged, symlinks=True, ignore=_ignore)
+    else:
+        os.makedirs(staged)
+    os.chmod(staged, 0o700)
+    return staged
+
+
+def _replace(src: str, dst: str) -> int:
+    """Copy src over dst so dst is never half-written; returns bytes copied."""
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = dst + ".keepliver-sync"
+    if os.path.isdir(src):
+        shutil.rmtree(tmp, ignore_errors=True)
+        shutil.copytree(src, tmp, symlinks=True)
+        old = dst + ".keepliver-old"
+        shutil.rmtree(old, ignore_errors=True)
+        if os.path.exists(dst):
+            os.rename(dst, old)
+        os.rename(tmp, dst)
+        shutil.rmtree(old, ignore_errors=True)
+        return sum(
+            os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(dst) for f in files
+        )
+    shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+    return os.path.getsize(dst)
+
+
+def sync_back(staged: str, profile_dir: str) -> int:
+    """Copy the essential login state from the tmpfs copy back to disk; returns bytes."""
+    copied = 0
+    names = ["Local State"] + [
+        os.path.join(p, name) for p in _profile_dirs(staged) for name in ESSENTIAL
+    ]
+    for name in names:
+        src = os.path.join(staged, name)
+        if os.path.exists(src):
+            copied += _replace(src, os.path.join(profile_dir, name))
+    return copied
+
+
+def discard(staged: str) -> None:
+    shutil.rmtree(staged, ignore_errors=True)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+import copy
+import os
+import threading
+from typing import Callable, Optional
+
+from keepliver import metrics
+from keepliver.config_store import invalidate, save_config
+
+
+def staging_path(config_path: str) -> str:
+    return os.path.splitext(config_path)[0] + ".staging.json"
+
+
+def login_to_staging(args, login: Optional[Callable] = None, guarded: bool = True) -> bool:
+    """Log in writing to the staging config, then swap it into args.config in one rename.
+
+    Readers of args.config see either the old config or the new one, never a half-written
+    file, and nothing changes at all if the login fails.
+    """
+    from keepliver.auto import _guarded_login, _load_config, _run_login
+
+    staged = copy.copy(args)
+    staged.config = staging_path(args.config)
+    try:
+        # A leftover from an interrupted run must not be mistaken for this login's output.
+        os.remove(staged.config)
+    except FileNotFoundError:
+        pass
+    if guarded:
+        _guarded_login(staged, login)
+    else:
+        (login or _run_login)(staged)
+    cfg = _load_config(staged.config)
+    if cfg is None:
+        print(f"[relogin] staging config invalid, keeping {args.config}", flush=True)
+        return False
+    # Written through the store so the config being replaced lands in its history.
+    save_config(args.config, cfg)
+    os.remove(staged.config)
+    invalidate(staged.config)
+    return True
+
+
+class BackgroundRelogin:
+    """Run login_to_staging on a thread so keepalives continue on the current config."""
+
+    def __init__(self, args, login: Optional[Callable] = None):
+        self.args = args
+        self.login = login
+        self._thread: Optional[threading.Thread] = None
+        self._swapped = threading.Event()
+        self._lock = threading.Lock()
+
+    def running(self) -> bool:
+        with self._lock:
+            return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(
+                target=self._run, name="keepliver-relogin", daemon=True
+            )
+            self._thread.start()
+        print("[relogin] pre-emptive login started", flush=True)
+        return True
+
+    def _run(self) -> None:
+        try:
+            ok = login_to_staging(self.args, self.login)
+        except BaseException as e:
+            print(f"[relogin] pre-emptive login failed: {e}", flush=True)
+            metrics.inc("relogin_failures")
+            return
+        if ok:
+            metrics.inc("relogin_swaps")
+            self._swapped.set()
+            print(f"[relogin] new config swapped in: {self.args.config}", flush=True)
+        else:
+            metrics.inc("relogin_failures")
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def take_swapped(self) -> bool:
+        """True once per completed swap; the caller should reload its config."""
+        if not self._swapped.is_set():
+            return False
+        self._swapped.clear()
+        return True
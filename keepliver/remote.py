@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+import json
+from typing import List, Optional
+from urllib.request import Request, urlopen
+
+# browserName in the Grid slot stereotypes.
+_BROWSER_NAMES = {"chrome": ("chrome",), "edge": ("MicrosoftEdge", "msedge")}
+
+
+def _status(url: str, timeout: float) -> dict:
+    req = Request(url.rstrip("/") + "/status", headers={"Accept": "application/json"})
+    with urlopen(req, timeout=timeout) as resp:
+        data = json.loads(resp.read().decode("utf-8"))
+    value = data.get("value") if isinstance(data, dict) else None
+    return value if isinstance(value, dict) else {}
+
+
+def free_slots(url: str, browser: str = "chrome", timeout: float = 5.0) -> int:
+    """Idle session slots for browser on a Grid/standalone endpoint; 0 if unreachable."""
+    try:
+        value = _status(url, timeout)
+    except (OSError, ValueError):
+        return 0
+    if not value.get("ready", False):
+        return 0
+    nodes = value.get("nodes")
+    if nodes is None:
+        # A bare chromedriver/msedgedriver endpoint: ready means it takes one session.
+        return 1
+    names = _BROWSER_NAMES.get(browser, (browser,))
+    free = 0
+    for node in nodes:
+        if node.get("availability", "UP") != "UP":
+            continue
+        for slot in node.get("slots") or []:
+            stereotype = slot.get("stereotype") or {}
+            if slot.get("session") is None and stereotype.get("browserName") in names:
+                free += 1
+    return free
+
+
+def pick_endpoint(urls: List[str], browser: str = "chrome") -> Optional[str]:
+    """The endpoint with the most free slots (first listed wins ties); None if all are full."""
+    best, best_free = None, 0
+    for url in urls:
+        free = free_slots(url, browser)
+        print(f"Remote WebDriver {url}: {free} free slot(s)")
+        if free > best_free:
+            best, best_free = url, free
+    return best
+
+
+def end_session(url: str, session_id: str, timeout: float = 10.0) -> None:
+    """DELETE the session on the endpoint; the node then kills its browser."""
+    req = Request(f"{url.rstrip('/')}/session/{session_id}", method="DELETE")
+    with urlopen(req, timeout=timeout):
+        pass
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple, Type
+
+from keepliver import metrics
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"circuit '{name}' open, retry after {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class RetryPolicy:
+    """Exponential backoff with decorrelated jitter (sleep = rand(base, prev * 3), capped).
+
+    Unlike a fixed or purely exponential schedule, two clients that fail together
+    draw different delays on every attempt, so an outage doesn't turn into
+    synchronized retry waves.
+    """
+
+    def __init__(
+        self,
+        base: float = 1.0,
+        cap: float = 300.0,
+        max_attempts: int = 5,
+        rng: Optional[random.Random] = None,
+    ):
+        self.base = base
+        self.cap = cap
+        self.max_attempts = max_attempts
+        self.rng = rng or random.Random()
+
+    def next_delay(self, prev: Optional[float] = None) -> float:
+        upper = max(self.base, (prev or self.base) * 3)
+        return min(self.cap, self.rng.uniform(self.base, upper))
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+        rng: Optional[random.Random] = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.rng = rng or random.Random()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_until = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and now >= self.opened_until:
+                self.state = "half_open"
+                self._probe_in_flight = False
+                self._publish()
+            if self.state == "half_open" and not self._probe_in_flight:
+                # Let exactly one probe through; everyone else keeps waiting.
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def retry_after(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.state == "closed":
+                return 0.0
+            return max(0.0, self.opened_until - now)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probe_in_flight = False
+            self._publish()
+
+    def record_failure(self, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                # Jitter the open window so breakers across the fleet don't re-probe in lockstep.
+                self.opened_until = now + self.reset_timeout * self.rng.uniform(1.0, 1.5)
+                self.state = "open"
+                self._probe_in_flight = False
+            metrics.inc(f"breaker_{self.name}_failures")
+            self._publish()
+
+    def _publish(self) -> None:
+        value = {"closed": 0, "half_open": 1, "open": 2}[self.state]
+        metrics.set_gauge(f"breaker_{self.name}_state", value)
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+# Per-endpoint defaults: (failure_threshold, reset_timeout seconds). "login:<account>"
+# breakers take the "login" defaults.
+BREAKER_DEFAULTS = {
+    "connect": (5, 60.0),
+    "login": (3, 600.0),
+    "telegram": (5, 120.0),
+}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(name)
+        if breaker is None:
+            threshold, reset_timeout = BREAKER_DEFAULTS.get(name.split(":", 1)[0], (5, 60.0))
+            breaker = CircuitBreaker(name, threshold, reset_timeout)
+            _BREAKERS[name] = breaker
+        return breaker
+
+
+def call_with_retry(
+    fn: Callable,
+    policy: RetryPolicy,
+    breaker: Optional[CircuitBreaker] = None,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+    is_failure: Optional[Callable] = None,
+    sleep: Callable[[float], None] = time.sleep,
+):
+    prev_delay = None
+    result = None
+    for attempt in range(1, policy.max_attempts + 1):
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(breaker.name, breaker.retry_after())
+        try:
+            result = fn()
+        except retry_on:
+            if breaker is not None:
+                breaker.record_failure()
+            if attempt >= policy.max_attempts:
+                raise
+        except BaseException:
+            # Not retried, but a half-open breaker's probe must still be resolved.
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+        else:
+            failed = is_failure is not None and is_failure(result)
+            if breaker is not None:
+                if failed:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            if not failed or attempt >= policy.max_attempts:
+                return result
+        prev_delay = policy.next_delay(prev_delay)
+        metrics.inc("retry_attempts")
+        sleep(prev_delay)
+    return result
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+import json
+import os
+import random
+import time
+from typing import Optional
+
+from keepliver import metrics
+
+
+class AdaptiveScheduler:
+    """Learn how long a session survives without keepalive and schedule below that.
+
+    Every successful keepalive proves the session outlived the gap since the previous
+    one (lower bound); every expiration caps it (upper bound). The next delay is a safe
+    fraction of the tightest known bound, with downward-only jitter so accounts started
+    together drift apart without ever overshooting. Without ``max_interval`` the learned
+    bound is the only cap, so the interval may grow past ``base_interval``.
+    """
+
+    def __init__(
+        self,
+        state_path: str,
+        base_interval: float,
+        min_interval: float = 300,
+        max_interval: Optional[float] = None,
+        safe_fraction: float = 0.8,
+        jitter: float = 0.1,
+        growth: float = 1.25,
+        rng: Optional[random.Random] = None,
+    ):
+        self.state_path = state_path
+        self.retune(base_interval, min_interval, max_interval)
+        self.safe_fraction = safe_fraction
+        self.jitter = jitter
+        self.growth = growth
+        self.rng = rng or random.Random()
+        self.survived_s: Optional[float] = None
+        self.expired_s: Optional[float] = None
+        self.last_ok_ts: Optional[float] = None
+        # Absolute session age at which the server ended a kept-alive session.
+        self.session_age_s: Optional[float] = None
+        self.login_ts: Optional[float] = None
+        self._load()
+
+    def retune(
+        self, base_interval: float, min_interval: float = 300, max_interval: Optional[float] = None
+    ) -> None:
+        """Change the bounds; what was learned about the session is kept."""
+        self.base_interval = float(base_interval)
+        self.min_interval = float(min(min_interval, base_interval))
+        self.max_interval = float(max_interval) if max_interval else None
+
+    def _load(self) -> None:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return
+        if not isinstance(data, dict):
+            return
+        self.survived_s = data.get("survived_s")
+        self.expired_s = data.get("expired_s")
+        self.last_ok_ts = data.get("last_ok_ts")
+        self.session_age_s = data.get("session_age_s")
+        self.login_ts = data.get("login_ts")
+
+    def save(self) -> None:
+        data = {
+            "survived_s": self.survived_s,
+            "expired_s": self.expired_s,
+            "last_ok_ts": self.last_ok_ts,
+            "session_age_s": self.session_age_s,
+            "login_ts": self.login_ts,
+            "updated": time.time(),
+        }
+        tmp_path = f"{self.state_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"Warning: cannot save schedule state {self.state_path}: {e}")
+
+    def _gap(self, now: float) -> Optional[float]:
+        if self.last_ok_ts is None or now <= self.last_ok_ts:
+            return None
+        return now - self.last_ok_ts
+
+    def record_success(self, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        gap = self._gap(now)
+        if gap is not None:
+            self.survived_s = max(self.survived_s or 0.0, gap)
+            if self.expired_s is not None and gap >= self.expired_s:
+                # The server timeout grew past the old bound; learn it again.
+                self.expired_s = None
+        self.last_ok_ts = now
+        self._publish()
+        self.save()
+
+    def record_expired(self, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        gap = self._gap(now)
+        aged_out = (
+            gap is not None
+            and self.survived_s is not None
+            and gap <= self.survived_s
+            and self.login_ts is not None
+            and now > self.login_ts
+        )
+        if aged_out:
+            # Idle gaps this long have survived before, so the session hit its maximum age;
+            # that says nothing about the idle timeout, so leave those bounds alone.
+            age = now - self.login_ts
+            self.session_age_s = min(self.session_age_s or age, age)
+        elif gap is not None:
+            self.expired_s = gap if self.expired_s is None else min(self.expired_s, gap)
+            if self.survived_s is not None and self.survived_s >= gap:
+                # The server timeout shrank below what used to survive.
+                self.survived_s = None
+        self.last_ok_ts = None
+        self._publish()
+        self.save()
+
+    def record_login(self, now: Optional[float] = None) -> None:
+        self.last_ok_ts = time.time() if now is None else now
+        self.login_ts = self.last_ok_ts
+        self.save()
+
+    def learned_lifetime(self) -> Optional[float]:
+        return self.expired_s
+
+    def relogin_at(self, lifetime: Optional[float] = None) -> Optional[float]:
+        """When to start a pre-emptive login: a safe fraction into the session's lifetime."""
+        lifetime = lifetime or self.session_age_s
+        if lifetime is None or self.login_ts is None:
+            return None
+        return self.login_ts + lifetime * self.safe_fraction
+
+    def next_interval(self) -> float:
+        if self.expired_s is not None:
+            target = self.expired_s * self.safe_fraction
+        elif self.survived_s is not None:
+            # No expiry seen yet: probe upward slowly until one is (or max_interval).
+            target = max(self.base_interval, self.survived_s * self.growth)
+        else:
+            target = self.base_interval
+        target = max(target, self.min_interval)
+        if self.max_interval is not None:
+            target = min(target, self.max_interval)
+        delay = target * (1.0 - self.rng.uniform(0.0, self.jitter))
+        metrics.set_gauge("scheduler_next_interval_s", delay)
+        return delay
+
+    def _publish(self) -> None:
+        if self.survived_s is not None:
+            metrics.set_gauge("scheduler_survived_s", self.survived_s)
+        if self.expired_s is not None:
+            metrics.set_gauge("scheduler_expired_s", self.expired_s)
+        if self.session_age_s is not None:
+            metrics.set_gauge("scheduler_session_age_s", self.session_age_s)
+
+
+def default_state_path(config_path: str) -> str:
+    return os.path.splitext(config_path)[0] + ".schedule.json"
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+import os
+import socket
+import threading
+import time
+from typing import Optional
+
+
+def notify(state: str) -> bool:
+    """Send e.g. READY=1 / WATCHDOG=1 / STATUS=... to systemd; no-op outside a notify unit."""
+    path = os.environ.get("NOTIFY_SOCKET")
+    if not path or not hasattr(socket, "AF_UNIX"):
+        return False
+    if path.startswith("@"):
+        path = "\0" + path[1:]
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(path)
+            sock.sendall(state.encode("utf-8"))
+        return True
+    except OSError:
+        return False
+
+
+def watchdog_interval() -> Optional[float]:
+    """WatchdogSec of the unit in seconds, or None when the watchdog is off."""
+    usec = os.environ.get("WATCHDOG_USEC")
+    if not usec:
+        return None
+    pid = os.environ.get("WATCHDOG_PID")
+    # The unit's main process is systemd-inhibit, which forks us: its pings target us too.
+    if pid and pid not in (str(os.getpid()), str(os.getppid())):
+        return None
+    try:
+        seconds = int(usec) / 1_000_000
+    except ValueError:
+        return None
+    return seconds if seconds > 0 else None
+
+
+_ACTIVE: Optional["Watchdog"] = None
+
+
+def still_busy() -> None:
+    """Re-arm the running watchdog: a deliberately open-ended step is still making progress."""
+    if _ACTIVE is not None:
+        _ACTIVE.busy()
+
+
+class Watchdog:
+    """Ping the systemd watchdog while the owning loop keeps its promises.
+
+    The loop marks itself busy() before each step and idle() while it sleeps. A thread pings
+    every half interval unless a busy step has run past busy_timeout (a hung WebDriver call):
+    then the pings stop and systemd restarts the unit.
+    """
+
+    def __init__(self):
+        self.interval: Optional[float] = None
+        self.busy_timeout: Optional[float] = None
+        self._deadline = float("inf")
+        self._overdue = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, busy_timeout: Optional[float], interval: Optional[float] = None) -> bool:
+        self.busy_timeout = busy_timeout
+        self.interval = interval if interval is not None else watchdog_interval()
+        if self.interval is None or self._thread is not None:
+            return False
+        global _ACTIVE
+        self.busy()
+        _ACTIVE = self
+        self._thread = threading.Thread(target=self._run, name="keepliver-watchdog", daemon=True)
+        self._thread.start()
+        return True
+
+    def busy(self, timeout: Optional[float] = None) -> None:
+        if timeout is None:
+            timeout = self.busy_timeout
+        self._deadline = float("inf") if timeout is None else time.monotonic() + timeout
+        self._overdue = False
+
+    def idle(self) -> None:
+        self._deadline = float("inf")
+        self._overdue = False
+
+    def alive(self) -> bool:
+        return time.monotonic() < self._deadline
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval / 2):
+            if self.alive():
+                notify("WATCHDOG=1")
+            elif not self._overdue:
+                self._overdue = True
+                print("[watchdog] loop is overdue; no longer pinging systemd.", flush=True)
+
+    def stop(self) -> None:
+        global _ACTIVE
+        if _ACTIVE is self:
+            _ACTIVE = None
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
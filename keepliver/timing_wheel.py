@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+
+class TimerHandle:
+    __slots__ = ("tick", "callback", "args", "cancelled", "_bucket")
+
+    def __init__(self, tick: int, callback: Callable, args: tuple):
+        self.tick = tick
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        self._bucket: Optional[Dict[int, "TimerHandle"]] = None
+
+
+class TimingWheel:
+    """Hierarchical timing wheel: O(1) schedule/cancel, per-tick cost independent of timer count.
+
+    Level 0 holds timers due within ``wheel_size`` ticks, level 1 within ``wheel_size**2``
+    and so on. When a lower level wraps, the matching slot of the level above is cascaded
+    down. Timers beyond the top level's span are parked in its furthest slot and re-filed
+    on cascade.
+    """
+
+    def __init__(
+        self,
+        tick: float = 1.0,
+        wheel_bits: int = 6,
+        levels: int = 4,
+        now: Optional[float] = None,
+    ):
+        self.tick = tick
+        self.bits = wheel_bits
+        self.size = 1 << wheel_bits
+        self.mask = self.size - 1
+        self.levels = levels
+        self._wheels: List[List[Dict[int, TimerHandle]]] = [
+            [{} for _ in range(self.size)] for _ in range(levels)
+        ]
+        self._origin = time.monotonic() if now is None else now
+        self.current_tick = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _tick_for(self, deadline: float) -> int:
+        return int(math.ceil((deadline - self._origin) / self.tick))
+
+    def _place(self, handle: TimerHandle) -> None:
+        diff = handle.tick - self.current_tick
+        if diff <= 0:
+            bucket = self._wheels[0][self.current_tick & self.mask]
+        else:
+            level = 0
+            while level < self.levels - 1 and diff >= 1 << (self.bits * (level + 1)):
+                level += 1
+            span = 1 << (self.bits * (level + 1))
+            tick = handle.tick if diff < span else self.current_tick + span - 1
+            bucket = self._wheels[level][(tick >> (self.bits * level)) & self.mask]
+        bucket[id(handle)] = handle
+        handle._bucket = bucket
+
+    def schedule_at(self, deadline: float, callback: Callable, *args) -> TimerHandle:
+        with self._lock:
+            tick = max(self._tick_for(deadline), self.current_tick + 1)
+            handle = TimerHandle(tick, callback, args)
+            self._place(handle)
+            self._count += 1
+            return handle
+
+    def cancel(self, handle: TimerHandle) -> bool:
+        with self._lock:
+            if handle.cancelled or handle._bucket is None:
+                return False
+            handle._bucket.pop(id(handle), None)
+            handle._bucket = None
+            handle.cancelled = True
+            self._count -= 1
+            return True
+
+    def _cascade(self) -> None:
+        for level in range(1, self.levels):
+            index = (self.current_tick >> (self.bits * level)) & self.mask
+            bucket = self._wheels[level][index]
+            if bucket:
+                moved = list(bucket.values())
+                bucket.clear()
+                for handle in moved:
+                    self._place(handle)
+            if index != 0:
+                break
+
+    def advance(self, now: float) -> List[TimerHandle]:
+        """Move the wheel up to ``now`` and return the timers that became due."""
+        due: List[TimerHandle] = []
+        with self._lock:
+            target = int((now - self._origin) // self.tick)
+            while self.current_tick < target:
+                self.current_tick += 1
+                if self.current_tick & self.mask == 0:
+                    self._cascade()
+                bucket = self._wheels[0][self.current_tick & self.mask]
+                if bucket:
+                    for handle in bucket.values():
+                        handle._bucket = None
+                    due.extend(bucket.values())
+                    self._count -= len(bucket)
+                    bucket.clear()
+        return due
+
+    def next_tick_time(self) -> float:
+        return self._origin + (self.current_tick + 1) * self.tick
+
+
+class WheelScheduler:
+    """Drive a TimingWheel from one thread and run due callbacks on a bounded pool."""
+
+    def __init__(self, tick: float = 1.0, workers: int = 4):
+        self.wheel = TimingWheel(tick=tick)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="keepliver")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.on_tick: Optional[Callable[[], None]] = None
+
+    def call_later(self, delay: float, callback: Callable, *args) -> TimerHandle:
+        return self.wheel.schedule_at(time.monotonic() + max(0.0, delay), callback, *args)
+
+    def cancel(self, handle: Optional[TimerHandle]) -> bool:
+        if handle is None:
+            return False
+        return self.wheel.cancel(handle)
+
+    def _run_handle(self, handle: TimerHandle) -> None:
+        try:
+            handle.callback(*handle.args)
+        except Exception as e:
+            print(f"[scheduler] job error: {e!r}", flush=True)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            wait = self.wheel.next_tick_time() - time.monotonic()
+            if wait > 0 and self._stop.wait(wait):
+                break
+            for handle in self.wheel.advance(time.monotonic()):
+                self.pool.submit(self._run_handle, handle)
+            if self.on_tick is not None:
+                self.on_tick()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._loop, name="keepliver-wheel", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.pool.shutdown(wait=wait)
+
+    def join(self) -> None:
+        while self._thread is not None and self._thread.is_alive():
+            self._thread.join(1.0)
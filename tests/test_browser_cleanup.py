@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from keepliver.ctyun_auto_selenium import _kill_existing_browser_processes, _user_data_dir
+
+
+class TestBrowserCleanup(unittest.TestCase):
+    def test_user_data_dir_is_parsed_exactly(self) -> None:
+        argv = ["chrome", "--headless=new", "--user-data-dir=prof/../.selenium-profile-a"]
+        self.assertEqual(_user_data_dir(argv, "/srv"), "/srv/.selenium-profile-a")
+        self.assertEqual(_user_data_dir(["chrome", "--user-data-dir", "/p"], "/srv"), "/p")
+        self.assertIsNone(_user_data_dir(["chrome", "--profile-directory=/p"], "/srv"))
+
+    @unittest.skipUnless(os.path.isdir("/proc/self"), "needs /proc")
+    def test_only_the_exact_profile_is_killed(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        procs = {}
+        for name in ("a", "ab"):
+            profile = os.path.join(tmp.name, f".selenium-profile-{name}")
+            procs[name] = subprocess.Popen(
+                [sys.executable, "-c", "import time; time.sleep(30)", "chrome",
+                 f"--user-data-dir={profile}"]
+            )
+            self.addCleanup(procs[name].kill)
+        _kill_existing_browser_processes(os.path.join(tmp.name, ".selenium-profile-a"))
+        self.assertIsNotNone(procs["a"].wait(timeout=5))
+        self.assertIsNone(procs["ab"].poll())
@@ -0,0 +1,36 @@
+import unittest
+from unittest import mock
+
+from keepliver import browser_presets, metrics
+
+
+class TestBrowserPresets(unittest.TestCase):
+    def test_lean_preset(self) -> None:
+        self.assertEqual(browser_presets.preset_arguments("default"), [])
+        lean = browser_presets.preset_arguments("lean")
+        for arg in (
+            "--renderer-process-limit=1",
+            "--disable-extensions",
+            "--disable-gpu",
+            "--disable-background-networking",
+            "--disable-component-update",
+            "--js-flags=--max-old-space-size=128",
+        ):
+            self.assertIn(arg, lean)
+        self.assertTrue(any(a.startswith("--window-size=") for a in lean))
+        with self.assertRaises(ValueError):
+            browser_presets.preset_arguments("tiny")
+
+    def test_measure_reports_peak_from_worker(self) -> None:
+        def run_worker(module, argv, timeout):
+            self.assertEqual(argv[-4:], ["--browser-preset", "lean", "--rss-interval", "0.5"])
+            metrics.set_gauge("browser_rss_peak_mb", 321.0)
+
+        with mock.patch("keepliver.login_worker.run_worker", run_worker):
+            result = browser_presets.measure(["--out", "x.json"], "lean")
+        self.assertEqual(result["peak_rss_mb"], 321.0)
+        self.assertIsNone(result["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import time
+import unittest
+from email.utils import formatdate
+from unittest import mock
+
+from keepliver import keepalive, metrics
+
+
+class TestClockSkew(unittest.TestCase):
+    def setUp(self) -> None:
+        keepalive.CLOCK_SKEW_STATE.update({"offset_ms": 0.0, "samples": 0})
+
+    def test_offset_learned_from_date_header(self) -> None:
+        now_ms = time.time() * 1000
+        # Server is 120 s ahead of the local clock.
+        server_date = formatdate((now_ms + 120000) / 1000, usegmt=True)
+        keepalive.observe_server_date(server_date, now_ms - 50, now_ms + 50)
+        skew = keepalive.get_clock_skew_ms()
+        self.assertAlmostEqual(skew, 120000, delta=1500)
+        self.assertEqual(metrics.get("keepalive_clock_skew_ms"), skew)
+
+    def test_server_now_applies_offset(self) -> None:
+        keepalive.CLOCK_SKEW_STATE.update({"offset_ms": -30000.0, "samples": 3})
+        with mock.patch.object(keepalive.time, "time", return_value=1000.0):
+            self.assertEqual(keepalive.server_now_ms(), 1000000 - 30000)
+
+    def test_small_offset_ignored(self) -> None:
+        keepalive.CLOCK_SKEW_STATE.update({"offset_ms": 400.0, "samples": 3})
+        with mock.patch.object(keepalive.time, "time", return_value=1000.0):
+            self.assertEqual(keepalive.server_now_ms(), 1000000)
+
+    def test_slow_or_invalid_responses_ignored(self) -> None:
+        now_ms = time.time() * 1000
+        keepalive.observe_server_date("not a date", now_ms, now_ms + 10)
+        keepalive.observe_server_date(formatdate(now_ms / 1000), now_ms, now_ms + 10000)
+        self.assertEqual(keepalive.CLOCK_SKEW_STATE["samples"], 0)
@@ -0,0 +1,65 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from keepliver import config_store
+
+
+class TestConfigStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "config.json")
+        config_store.invalidate()
+
+    def tearDown(self) -> None:
+        config_store.invalidate()
+        self.tmp.cleanup()
+
+    def test_load_is_cached_until_file_changes(self) -> None:
+        config_store.save_config(self.path, {"v": 1})
+        config_store.invalidate()
+        with mock.patch.object(config_store, "_parse", wraps=config_store._parse) as parse:
+            self.assertEqual(config_store.load_config(self.path), {"v": 1})
+            self.assertEqual(config_store.load_config(self.path), {"v": 1})
+            self.assertEqual(parse.call_count, 1)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump({"v": 2, "changed": True}, f)
+            self.assertEqual(config_store.load_config(self.path)["v"], 2)
+            self.assertEqual(parse.call_count, 2)
+
+    def test_callers_get_their_own_copy(self) -> None:
+        config_store.save_config(self.path, {"auth": {"secretKey": "a"}})
+        cfg = config_store.load_config(self.path)
+        cfg["auth"]["secretKey"] = "mutated"
+        self.assertEqual(config_store.load_config(self.path)["auth"]["secretKey"], "a")
+
+    def test_history_rotation_and_rollback(self) -> None:
+        for v in range(1, 6):
+            config_store.save_config(self.path, {"v": v}, keep=3)
+        self.assertEqual(len(config_store.history(self.path)), 3)
+        self.assertFalse(os.path.exists(config_store.history_path(self.path, 4)))
+        with open(config_store.history_path(self.path, 1), encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"v": 4})
+        config_store.rollback(self.path, 2)
+        self.assertEqual(config_store.load_config(self.path), {"v": 3})
+        with open(config_store.history_path(self.path, 1), encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"v": 5})
+
+    def test_unchanged_save_does_not_rotate(self) -> None:
+        config_store.save_config(self.path, {"v": 1})
+        config_store.save_config(self.path, {"v": 1})
+        self.assertEqual(config_store.history(self.path), [])
+
+    def test_truncated_file_falls_back_to_history(self) -> None:
+        config_store.save_config(self.path, {"v": 1})
+        config_store.save_config(self.path, {"v": 2})
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write('{"v": ')
+        self.assertEqual(config_store.load_config(self.path), {"v": 1})
+        with self.assertRaises(ValueError):
+            config_store.load_config(self.path, fallback=False)
+        self.assertEqual(
+            [n for n in os.listdir(self.tmp.name) if n.endswith(".tmp")], []
+        )
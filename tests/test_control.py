@@ -0,0 +1,64 @@
+import os
+import socket
+import tempfile
+import unittest
+
+from keepliver.control import ControlServer, send_command
+from keepliver.daemon import Daemon
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "no Unix sockets on this platform")
+class TestControlServer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "ctl.sock")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_round_trip_and_errors(self) -> None:
+        server = ControlServer(self.path, {"echo": lambda request: request.get("account")})
+        self.assertTrue(server.start())
+        try:
+            self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+            self.assertEqual(
+                send_command(self.path, "echo", account="a"), {"ok": True, "result": "a"}
+            )
+            response = send_command(self.path, "nope")
+            self.assertFalse(response["ok"])
+            self.assertIn("unknown command", response["error"])
+        finally:
+            server.stop()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_stale_socket_is_replaced(self) -> None:
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()
+        server = ControlServer(self.path, {"ping": lambda _request: "pong"})
+        self.assertTrue(server.start())
+        try:
+            self.assertEqual(send_command(self.path, "ping")["result"], "pong")
+        finally:
+            server.stop()
+
+    def test_daemon_pause_resume_and_status(self) -> None:
+        accounts = [
+            {"name": name, "config": os.path.join(self.tmp.name, f"{name}.json")}
+            for name in ("a", "b")
+        ]
+        daemon = Daemon(accounts, workers=1, control_socket=self.path)
+        try:
+            daemon.start()
+            self.assertTrue(send_command(self.path, "pause", account="a")["ok"])
+            status = send_command(self.path, "status")["result"]
+            self.assertTrue(status["a"]["paused"])
+            self.assertIsNone(status["a"]["next_run"])
+            self.assertIsNotNone(status["b"]["next_run"])
+            self.assertFalse(send_command(self.path, "relogin")["ok"])
+            self.assertFalse(send_command(self.path, "trigger", account="zz")["ok"])
+            send_command(self.path, "resume", account="a")
+            self.assertFalse(daemon.accounts["a"].paused)
+            self.assertIsNotNone(daemon.accounts["a"].handle)
+        finally:
+            daemon.stop()
@@ -0,0 +1,85 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from keepliver import cookies
+
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:  # pragma: no cover
+    Cipher = None
+
+
+def _encrypt(value: str, host_key: str, password: bytes = b"peanuts", prefix=b"v10") -> bytes:
+    plain = hashlib.sha256(host_key.encode("utf-8")).digest() + value.encode("utf-8")
+    pad = 16 - len(plain) % 16
+    plain += bytes([pad]) * pad
+    key = hashlib.pbkdf2_hmac("sha1", password, b"saltysalt", 1, dklen=16)
+    encryptor = Cipher(algorithms.AES(key), modes.CBC(b" " * 16)).encryptor()
+    return prefix + encryptor.update(plain) + encryptor.finalize()
+
+
+def _write_db(path: str, rows) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE meta (key TEXT, value TEXT)")
+    conn.execute("INSERT INTO meta VALUES ('version', '24')")
+    conn.execute(
+        "CREATE TABLE cookies (host_key TEXT, name TEXT, value TEXT, encrypted_value BLOB, "
+        "path TEXT, expires_utc INTEGER, is_secure INTEGER)"
+    )
+    conn.executemany("INSERT INTO cookies VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+@unittest.skipIf(Cipher is None, "cryptography not installed")
+class TestProfileCookies(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "Default", "Network", "Cookies")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_decrypts_v10_with_host_digest(self) -> None:
+        expires = int((time.time() + 3600 + 11644473600) * 1000000)
+        _write_db(
+            self.db_path,
+            [
+                (".ctyun.cn", "sid", "", _encrypt("abc", ".ctyun.cn"), "/", expires, 1),
+                ("pc.ctyun.cn", "plain", "p", b"", "/", 0, 0),
+                (".example.com", "other", "x", b"", "/", 0, 0),
+            ],
+        )
+        loaded = {c["name"]: c for c in cookies.load_profile_cookies(self.tmp.name)}
+        self.assertEqual(set(loaded), {"sid", "plain"})
+        self.assertEqual(loaded["sid"]["value"], "abc")
+        self.assertTrue(loaded["sid"]["secure"])
+        self.assertIsNone(loaded["plain"]["expires"])
+
+    def test_wrong_host_digest_is_rejected(self) -> None:
+        encrypted = _encrypt("abc", "evil.example.com")
+        self.assertIsNone(cookies.decrypt_cookie_value(encrypted, ".ctyun.cn", 24))
+
+    def test_v11_uses_keyring_password(self) -> None:
+        encrypted = _encrypt("k", ".ctyun.cn", password=b"secret", prefix=b"v11")
+        self.assertIsNone(cookies.decrypt_cookie_value(encrypted, ".ctyun.cn", 24))
+        self.assertEqual(
+            cookies.decrypt_cookie_value(encrypted, ".ctyun.cn", 24, keyring_password=b"secret"),
+            "k",
+        )
+
+    def test_session_reloads_when_db_changes(self) -> None:
+        _write_db(self.db_path, [(".ctyun.cn", "sid", "one", b"", "/", 0, 0)])
+        session = cookies.ProfileCookieSession(self.tmp.name)
+        self.assertEqual(session.cookies.get("sid"), "one")
+        self.assertFalse(session.reload_if_changed())
+        os.remove(self.db_path)
+        _write_db(self.db_path, [(".ctyun.cn", "sid", "two", b"", "/", 0, 0)])
+        os.utime(self.db_path, (time.time() + 5, time.time() + 5))
+        self.assertTrue(session.reload_if_changed())
+        self.assertEqual(session.cookies.get("sid"), "two")
@@ -0,0 +1,120 @@
+import json
+import os
+import stat
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from keepliver import ctyun_auto
+
+DEVICE_INFO = {"objId": "1", "deviceCode": "d"}
+AUTH = {"userId": 1, "tenantId": 2, "secretKey": "s", "userAccount": "u"}
+
+
+class FakePage:
+    def __init__(self):
+        self.listeners = []
+        self.storage = {}
+        self.device_info = None
+
+    def on(self, event, callback):
+        self.listeners.append(callback)
+
+    def goto(self, url, wait_until=None):
+        pass
+
+    def evaluate(self, script, arg=None):
+        if "authData" in script:
+            return self.storage.get("authData")
+        if "__ctyun_device_info" in script:
+            return self.device_info
+        return False
+
+    def fire(self, request):
+        for callback in self.listeners:
+            callback(request)
+
+
+class FakeContext:
+    def __init__(self, storage_state):
+        self.restored = storage_state
+        self.page = FakePage()
+
+    def add_init_script(self, script):
+        pass
+
+    def new_page(self):
+        return self.page
+
+    def storage_state(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"cookies": []}, f)
+
+    def close(self):
+        pass
+
+
+class FakeBrowser:
+    def new_context(self, storage_state=None):
+        self.context = FakeContext(storage_state)
+        return self.context
+
+
+class TestContextLogin(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.options = {"name": "a", "config": os.path.join(self.dir, "a.config.json")}
+
+    def test_storage_state_path(self) -> None:
+        self.assertEqual(
+            ctyun_auto.storage_state_path(self.options),
+            os.path.join(self.dir, "a.config.storage.json"),
+        )
+        self.assertEqual(
+            ctyun_auto.storage_state_path(self.options, "/s"), os.path.join("/s", "a.storage.json")
+        )
+
+    def test_captures_config_and_saves_state(self) -> None:
+        browser = FakeBrowser()
+        session = ctyun_auto.ContextLogin(self.options, timeout=60)
+        session.open(browser)
+        self.assertIsNone(browser.context.restored)
+        page = browser.context.page
+        self.assertIsNone(session.poll())
+        page.storage["authData"] = json.dumps(AUTH)
+        self.assertIsNone(session.poll())
+        page.device_info = DEVICE_INFO
+        self.assertIsNone(session.poll())
+        page.fire(
+            SimpleNamespace(
+                url="https://desk.ctyun.cn/api/desktop/client/connect",
+                method="POST",
+                headers={"ctg-sign": "x", "accept": "*/*"},
+            )
+        )
+        self.assertTrue(session.poll())
+        session.close()
+
+        with open(self.options["config"], "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        self.assertEqual(saved["ctg_headers"], {"ctg-sign": "x"})
+        self.assertEqual(saved["device_info"], DEVICE_INFO)
+        self.assertEqual(saved["auth"]["secretKey"], "s")
+        state = ctyun_auto.storage_state_path(self.options)
+        self.assertEqual(stat.S_IMODE(os.stat(state).st_mode), 0o600)
+
+        again = ctyun_auto.ContextLogin(self.options, timeout=60)
+        again.open(browser)
+        self.assertEqual(browser.context.restored, state)
+
+    def test_times_out(self) -> None:
+        session = ctyun_auto.ContextLogin(self.options, timeout=0)
+        session.open(FakeBrowser())
+        session.deadline -= 1
+        self.assertFalse(session.poll())
+
+
+if __name__ == "__main__":
+    unittest.main()
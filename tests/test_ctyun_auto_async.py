@@ -0,0 +1,110 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from keepliver import ctyun_auto_async
+
+DEVICE_INFO = {k: "v" for k in ctyun_auto_async.DEVICE_KEYS}
+AUTH = {"userId": 1, "tenantId": 2, "secretKey": "s", "userAccount": "u"}
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+
+    async def goto(self, url, wait_until=None):
+        if url == ctyun_auto_async.PORTAL_URL:
+            # The portal stores authData a little later, as after a real login.
+            asyncio.get_running_loop().call_later(0.01, self.context.login)
+
+    async def evaluate(self, script, arg=None):
+        if arg and "连接" in arg:
+            request = SimpleNamespace(
+                url="https://desk.ctyun.cn/api/desktop/client/connect",
+                method="POST",
+                headers={"ctg-sign": "x"},
+                post_data=json.dumps({"data": [DEVICE_INFO]}),
+            )
+            for callback in self.context.listeners:
+                callback(request)
+        return None
+
+
+class FakeContext:
+    def __init__(self):
+        self.listeners = []
+        self.binding = None
+        self.closed = False
+
+    async def expose_binding(self, name, callback):
+        self.binding = callback
+
+    async def add_init_script(self, script):
+        pass
+
+    def on(self, event, callback):
+        self.listeners.append(callback)
+
+    async def new_page(self):
+        return FakePage(self)
+
+    def login(self):
+        self.binding(None, json.dumps(AUTH))
+
+    async def storage_state(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"cookies": []}, f)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    async def new_context(self, storage_state=None):
+        self.context = FakeContext()
+        return self.context
+
+
+class TestAsyncLogin(unittest.TestCase):
+    def test_find_device_info(self) -> None:
+        self.assertEqual(ctyun_auto_async.find_device_info({"a": [1, DEVICE_INFO]}), DEVICE_INFO)
+        self.assertIsNone(ctyun_auto_async.find_device_info({"objId": 1}))
+
+    def test_captures_from_events(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            options = {"name": "a", "config": os.path.join(tmp, "a.config.json")}
+            browser = FakeBrowser()
+            login = ctyun_auto_async.AsyncLogin(options, timeout=5)
+            self.assertTrue(asyncio.run(login.run(browser)))
+            self.assertTrue(browser.context.closed)
+            with open(options["config"], "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            self.assertEqual(saved["device_info"], DEVICE_INFO)
+            self.assertEqual(saved["ctg_headers"], {"ctg-sign": "x"})
+            self.assertEqual(saved["auth"]["userId"], 1)
+            self.assertTrue(os.path.exists(ctyun_auto_async.storage_state_path(options)))
+
+    def test_timeout_closes_context(self) -> None:
+        class NoLogin(FakeContext):
+            def login(self):
+                pass
+
+        class Browser(FakeBrowser):
+            async def new_context(self, storage_state=None):
+                self.context = NoLogin()
+                return self.context
+
+        with tempfile.TemporaryDirectory() as tmp:
+            options = {"name": "a", "config": os.path.join(tmp, "a.config.json")}
+            browser = Browser()
+            login = ctyun_auto_async.AsyncLogin(options, timeout=0.1)
+            self.assertFalse(asyncio.run(login.run(browser)))
+            self.assertTrue(browser.context.closed)
+            self.assertFalse(os.path.exists(options["config"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from keepliver.deadline import PhaseDeadline, PhaseTimeout, phase_deadlines
+from keepliver.proctree import descendants, kill_tree
+
+
+class TestPhaseDeadline(unittest.TestCase):
+    def test_overrun_kills_and_records_phase(self) -> None:
+        killed = threading.Event()
+        guard = PhaseDeadline(killed.set, poll=0.02)
+        try:
+            guard.enter("launch", 10)
+            guard.check()
+            guard.enter("login", 0.05)
+            self.assertTrue(killed.wait(2))
+            with self.assertRaises(PhaseTimeout) as ctx:
+                guard.check()
+            self.assertEqual(ctx.exception.phase, "login")
+        finally:
+            guard.stop()
+
+    def test_unbounded_phase_never_fires(self) -> None:
+        killed = threading.Event()
+        guard = PhaseDeadline(killed.set, poll=0.02)
+        try:
+            guard.enter("keep", None)
+            self.assertFalse(killed.wait(0.1))
+        finally:
+            guard.stop()
+
+    def test_derived_deadlines(self) -> None:
+        args = SimpleNamespace(
+            timeout=600,
+            captcha_timeout=120,
+            telegram_timeout=None,
+            keep_browser=0,
+            launch_deadline=120,
+            login_deadline=0,
+            connect_deadline=300,
+        )
+        self.assertEqual(
+            phase_deadlines(args),
+            {"launch": 120, "login": 900, "connect": 300, "keep": None},
+        )
+
+    def test_busy_timeout_sums_bounded_phases(self) -> None:
+        from keepliver.auto import _busy_timeout
+
+        args = SimpleNamespace(
+            timeout=600,
+            captcha_timeout=120,
+            telegram_timeout=None,
+            keep_browser=0,
+            launch_deadline=0,
+            login_deadline=0,
+            connect_deadline=300,
+        )
+        self.assertEqual(_busy_timeout(args), 900 + 300 + 60)
+        args.keep_browser = 10
+        self.assertEqual(_busy_timeout(args), 900 + 300 + 40 + 60)
+
+
+@unittest.skipUnless(os.path.isdir("/proc") and os.name != "nt", "needs /proc")
+class TestKillTree(unittest.TestCase):
+    def test_kills_process_group_and_descendants(self) -> None:
+        child = "import subprocess, time; subprocess.Popen(['sleep', '30']); time.sleep(30)"
+        proc = subprocess.Popen([sys.executable, "-c", child], start_new_session=True)
+        deadline = time.monotonic() + 5
+        while not descendants(proc.pid) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        grandchildren = descendants(proc.pid)
+        self.assertTrue(grandchildren)
+        kill_tree(proc.pid)
+        proc.wait(5)
+        for pid in grandchildren:
+            for _ in range(100):
+                try:
+                    with open(f"/proc/{pid}/stat") as f:
+                        zombie = f.read().rsplit(")", 1)[-1].split()[0] == "Z"
+                except OSError:
+                    break
+                if zombie:
+                    break
+                time.sleep(0.02)
+            else:
+                self.fail(f"process {pid} survived kill_tree")
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from keepliver import drivers
+
+
+def _script(path: str, version: str) -> str:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"#!/bin/sh\necho 'Fake {version} (abc)'\n")
+    os.chmod(path, 0o755)
+    return path
+
+
+@unittest.skipIf(os.name == "nt", "uses shell scripts as fake binaries")
+class TestDriverResolver(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.cache = os.path.join(self.dir, "cache", "drivers.json")
+        self.driver = _script(os.path.join(self.dir, "chromedriver"), "126.0.6478.126")
+        self.browser = _script(os.path.join(self.dir, "chrome"), "126.0.6478.55")
+
+    def test_matching_versions_are_cached_by_mtime(self) -> None:
+        result = drivers.resolve("chrome", self.driver, self.browser, self.cache)
+        self.assertEqual(result["driver"], self.driver)
+        self.assertEqual(result["browser_version"], "126.0.6478.55")
+        with mock.patch.object(drivers, "binary_version") as probe, mock.patch.object(
+            drivers.shutil, "which"
+        ) as which:
+            again = drivers.resolve("chrome", self.driver, self.browser, self.cache)
+        self.assertEqual(again, result)
+        probe.assert_not_called()
+        which.assert_not_called()
+
+        # An upgraded browser invalidates the entry and is checked again.
+        _script(self.browser, "127.0.6533.72")
+        os.utime(self.browser, ns=(1, 1))
+        with self.assertRaises(drivers.DriverMismatchError):
+            drivers.resolve("chrome", self.driver, self.browser, self.cache)
+
+    def test_missing_driver_is_not_cached(self) -> None:
+        missing = os.path.join(self.dir, "nope")
+        result = drivers.resolve("chrome", missing, self.browser, self.cache)
+        self.assertIsNone(result["driver"])
+        self.assertFalse(os.path.exists(self.cache))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import os
+import unittest
+
+from keepliver import metrics, proctree
+from keepliver.governor import MemoryGovernor
+
+
+class TestMemoryGovernor(unittest.TestCase):
+    @unittest.skipUnless(os.path.isdir("/proc"), "needs /proc")
+    def test_tree_rss_of_this_process(self) -> None:
+        own = proctree.rss_kb(os.getpid())
+        self.assertGreater(own, 0)
+        self.assertGreaterEqual(proctree.tree_rss_kb(os.getpid()), own)
+        self.assertEqual(proctree.rss_kb(-1), 0)
+
+    def test_flags_over_budget_and_tracks_peak(self) -> None:
+        samples = iter([300 * 1024, 700 * 1024, 200 * 1024])
+        governor = MemoryGovernor(lambda: 42, budget_mb=512, sample=lambda _pid: next(samples))
+        governor.sample()
+        self.assertFalse(governor.over_budget())
+        governor.sample()
+        self.assertTrue(governor.over_budget())
+        self.assertEqual(metrics.get("browser_rss_peak_mb"), 700)
+        governor.recycled()
+        self.assertFalse(governor.over_budget())
+        governor.sample()
+        self.assertEqual(governor.peak_mb, 700)
+        self.assertEqual(metrics.get("browser_rss_mb"), 200)
+
+    def test_measures_only_without_budget(self) -> None:
+        governor = MemoryGovernor(lambda: None, sample=lambda _pid: 10**9)
+        self.assertEqual(governor.sample(), 0.0)
+        governor = MemoryGovernor(lambda: 1, sample=lambda _pid: 10**9)
+        governor.sample()
+        self.assertFalse(governor.over_budget())
+
+
+if __name__ == "__main__":
+    unittest.main()
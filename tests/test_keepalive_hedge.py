@@ -0,0 +1,93 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from keepliver import keepalive
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    delays = []
+    request_ids = []
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", "0"))
+        self.rfile.read(length)
+        type(self).request_ids.append(self.headers.get("ctg-requestid"))
+        delay = type(self).delays.pop(0) if type(self).delays else 0.0
+        time.sleep(delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b'{"code":0}')
+
+    def log_message(self, *_args, **_kwargs):
+        return
+
+
+class TestHedgedKeepalive(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        _StubHandler.delays = []
+        _StubHandler.request_ids = []
+        keepalive._LATENCIES.clear()
+        self.cfg = {
+            "connect_url": f"http://127.0.0.1:{self.server.server_port}/connect",
+            "ctg_headers": {"ctg-version": "1"},
+            "device_info": {"objId": "1"},
+            "auth": {"userId": "u", "tenantId": "t", "secretKey": "s"},
+        }
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        keepalive._LATENCIES.clear()
+
+    def test_timeout_adapts_to_latency(self) -> None:
+        self.assertEqual(keepalive.adaptive_timeout(), keepalive.DEFAULT_TIMEOUT)
+        for _ in range(20):
+            keepalive.record_latency(0.05)
+        self.assertEqual(keepalive.adaptive_timeout(), 3.0)
+        for _ in range(20):
+            keepalive.record_latency(4.0)
+        self.assertAlmostEqual(keepalive.adaptive_timeout(), 12.0)
+        for _ in range(20):
+            keepalive.record_latency(15.0)
+        self.assertEqual(keepalive.adaptive_timeout(), keepalive.DEFAULT_TIMEOUT)
+
+    def test_slow_primary_is_hedged_with_fresh_request_id(self) -> None:
+        for _ in range(20):
+            keepalive.record_latency(0.05)
+        _StubHandler.delays = [2.0, 0.0]
+        start = time.monotonic()
+        ok, status, _payload = keepalive.send_keepalive_once(self.cfg, hedge=True)
+        elapsed = time.monotonic() - start
+        self.assertTrue(ok)
+        self.assertEqual(status, 200)
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(len(_StubHandler.request_ids), 2)
+        self.assertNotEqual(_StubHandler.request_ids[0], _StubHandler.request_ids[1])
+
+    def test_timeouts_do_not_skew_hedge_delay(self) -> None:
+        self.addCleanup(keepalive.record_latency, 0.05)
+        for _ in range(20):
+            keepalive.record_latency(0.05)
+        for _ in range(5):
+            keepalive.record_timeout()
+        self.assertEqual(keepalive.latency_percentile(95), 0.05)
+        self.assertEqual(keepalive.adaptive_timeout(), keepalive.DEFAULT_TIMEOUT)
+        keepalive.record_latency(0.05)
+        self.assertEqual(keepalive.adaptive_timeout(), 3.0)
+
+    def test_no_hedge_without_history(self) -> None:
+        ok, _status, _payload = keepalive.send_keepalive_once(self.cfg, hedge=True)
+        self.assertTrue(ok)
+        self.assertEqual(len(_StubHandler.request_ids), 1)
+
+    def test_hedge_pool_scales_with_callers(self) -> None:
+        self.addCleanup(keepalive.set_hedge_callers, 1)
+        keepalive.set_hedge_callers(8)
+        self.assertEqual(keepalive._hedge_pool()._max_workers, 16)
+        keepalive.set_hedge_callers(1)
+        self.assertEqual(keepalive._hedge_pool()._max_workers, 2)
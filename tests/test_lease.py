@@ -0,0 +1,88 @@
+import os
+import tempfile
+import time
+import unittest
+
+from keepliver.daemon import Daemon
+from keepliver.lease import DirectoryLeases, SqliteLeases, make_backend
+
+
+class _LeaseTests:
+    def make(self):
+        raise NotImplementedError
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.leases = self.make()
+
+    def test_one_owner_at_a_time(self) -> None:
+        first = self.leases.acquire("alice", "node-a", 60)
+        self.assertIsNotNone(first)
+        self.assertIsNone(self.leases.acquire("alice", "node-b", 60))
+        self.assertIsNotNone(self.leases.acquire("bob", "node-b", 60))
+        self.assertEqual(self.leases.holder("alice")[0], "node-a")
+        time.sleep(0.01)
+        self.assertGreater(self.leases.acquire("alice", "node-a", 60), first)
+
+    def test_expired_lease_is_taken_over(self) -> None:
+        self.assertIsNotNone(self.leases.acquire("alice", "node-a", 0.05))
+        time.sleep(0.1)
+        self.assertIsNone(self.leases.holder("alice"))
+        self.assertIsNotNone(self.leases.acquire("alice", "node-b", 60))
+        self.assertIsNone(self.leases.acquire("alice", "node-a", 60))
+
+    def test_release_only_by_owner(self) -> None:
+        self.leases.acquire("alice", "node-a", 60)
+        self.leases.release("alice", "node-b")
+        self.assertEqual(self.leases.holder("alice")[0], "node-a")
+        self.leases.release("alice", "node-a")
+        self.assertIsNone(self.leases.holder("alice"))
+        self.assertIsNotNone(self.leases.acquire("alice", "node-b", 60))
+
+
+class TestSqliteLeases(_LeaseTests, unittest.TestCase):
+    def make(self):
+        return make_backend("sqlite:" + os.path.join(self._tmp.name, "leases.db"))
+
+    def test_backend_kind(self) -> None:
+        self.assertIsInstance(self.leases, SqliteLeases)
+
+
+class TestDirectoryLeases(_LeaseTests, unittest.TestCase):
+    def make(self):
+        return make_backend("dir:" + os.path.join(self._tmp.name, "leases"))
+
+    def test_backend_kind(self) -> None:
+        self.assertIsInstance(self.leases, DirectoryLeases)
+
+    def test_account_names_are_quoted(self) -> None:
+        self.assertIsNotNone(self.leases.acquire("../x/y", "node-a", 60))
+        self.assertEqual(os.listdir(self.leases.path), ["..%2Fx%2Fy.lease"])
+
+
+class TestDaemonLeases(unittest.TestCase):
+    def test_only_lease_holder_serves_account(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        spec = "dir:" + os.path.join(tmp.name, "leases")
+        accounts = [{"name": "a", "config": os.path.join(tmp.name, "a.json"), "interval": 1800}]
+
+        def daemon(node_id: str) -> Daemon:
+            return Daemon(
+                accounts, workers=1, leases=make_backend(spec), lease_ttl=600, node_id=node_id
+            )
+
+        first, second = daemon("node-1"), daemon("node-2")
+        self.addCleanup(second.stop)
+        first.start()
+        second.start()
+        self.assertEqual(first.status()["a"]["lease"], "node-1")
+        self.assertEqual(second.status()["a"]["lease"], "peer")
+        second._keepalive_job(second.accounts["a"])
+        self.assertEqual(second.accounts["a"].last_status, "standby")
+        self.assertIsNone(second.accounts["a"].handle)
+
+        first.stop()
+        second._lease_job(reschedule=False)
+        self.assertTrue(second.owns(second.accounts["a"]))
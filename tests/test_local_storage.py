@@ -0,0 +1,98 @@
+import json
+import os
+import struct
+import tempfile
+import unittest
+
+from keepliver import local_storage
+
+
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return bytes(out)
+
+
+def _ls_key(key: str) -> bytes:
+    return b"_https://pc.ctyun.cn\x00\x01" + key.encode("latin-1")
+
+
+def _ls_value(text: str) -> bytes:
+    return b"\x01" + text.encode("latin-1")
+
+
+def _write_log(path: str, seq: int, puts) -> None:
+    batch = struct.pack("<QI", seq, len(puts))
+    for key, value in puts:
+        batch += b"\x01" + _varint(len(key)) + key + _varint(len(value)) + value
+    record = b"\x00\x00\x00\x00" + struct.pack("<HB", len(batch), 1) + batch
+    with open(path, "wb") as f:
+        f.write(record)
+
+
+def _snappy_literal(data: bytes) -> bytes:
+    assert 60 < len(data) <= 256
+    return _varint(len(data)) + bytes([60 << 2, len(data) - 1]) + data
+
+
+def _write_table(path: str, seq: int, key: bytes, value: bytes, snappy: bool) -> None:
+    ikey = key + struct.pack("<Q", (seq << 8) | 1)
+    block = _varint(0) + _varint(len(ikey)) + _varint(len(value)) + ikey + value
+    block += struct.pack("<II", 0, 1)
+    stored = _snappy_literal(block) if snappy else block
+    data = stored + bytes([1 if snappy else 0]) + b"\x00" * 4
+    handle = _varint(0) + _varint(len(stored))
+    index = _varint(0) + _varint(len(ikey)) + _varint(len(handle)) + ikey + handle
+    index += struct.pack("<II", 0, 1)
+    index_offset = len(data)
+    data += index + b"\x00" * 5
+    footer = _varint(0) + _varint(0) + _varint(index_offset) + _varint(len(index))
+    footer = footer.ljust(40, b"\x00") + struct.pack("<Q", 0xDB4775248B80FB57)
+    with open(path, "wb") as f:
+        f.write(data + footer)
+
+
+class TestLocalStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_dir = os.path.join(self.tmp.name, "Default", "Local Storage", "leveldb")
+        os.makedirs(self.db_dir)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_snappy_copy(self) -> None:
+        self.assertEqual(local_storage.snappy_decompress(b"\x0a\x04ab\x11\x02"), b"ababababab")
+
+    def test_newest_sequence_wins_across_table_and_log(self) -> None:
+        old = json.dumps({"userId": 1, "tenantId": 2, "secretKey": "old" * 20})
+        new = json.dumps({"userId": 1, "tenantId": 2, "secretKey": "new", "userAccount": "a"})
+        _write_table(
+            os.path.join(self.db_dir, "000005.ldb"), 10, _ls_key("authData"), _ls_value(old), True
+        )
+        log_path = os.path.join(self.db_dir, "000007.log")
+        _write_log(log_path, 20, [(_ls_key("authData"), _ls_value(new))])
+        auth = local_storage.read_auth_data(self.tmp.name)
+        self.assertEqual(auth["secretKey"], "new")
+
+    def test_uncompressed_table_only(self) -> None:
+        text = json.dumps({"secretKey": "k"})
+        _write_table(
+            os.path.join(self.db_dir, "000005.ldb"), 3, _ls_key("authData"), _ls_value(text), False
+        )
+        self.assertEqual(local_storage.read_local_storage(self.tmp.name, "authData"), text)
+
+    def test_refresh_config_auth(self) -> None:
+        text = json.dumps({"userId": 1, "tenantId": 2, "secretKey": "fresh", "userAccount": "a"})
+        log_path = os.path.join(self.db_dir, "000003.log")
+        _write_log(log_path, 5, [(_ls_key("authData"), _ls_value(text))])
+        cfg = {"auth": {"userId": 1, "tenantId": 2, "secretKey": "stale", "userAccount": "a"}}
+        self.assertTrue(local_storage.refresh_config_auth(cfg, self.tmp.name))
+        self.assertEqual(cfg["auth"]["secretKey"], "fresh")
+        self.assertFalse(local_storage.refresh_config_auth(cfg, self.tmp.name))
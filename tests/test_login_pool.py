@@ -0,0 +1,53 @@
+import threading
+import time
+import unittest
+
+from keepliver.login_pool import LoginPool
+
+
+class TestLoginPool(unittest.TestCase):
+    def test_runs_most_urgent_first(self) -> None:
+        pool = LoginPool(workers=1)
+        self.addCleanup(pool.shutdown)
+        gate = threading.Event()
+        order = []
+        pool.submit(gate.wait, priority=(0, 0.0))
+        jobs = [("b", (0, 20.0)), ("pre", (1, 0.0)), ("a", (0, 10.0)), ("c", (0, 20.0))]
+        for name, priority in jobs:
+            pool.submit(order.append, name, priority=priority)
+        gate.set()
+        deadline = time.monotonic() + 5
+        while len(order) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(order, ["a", "b", "c", "pre"])
+
+    def test_runs_in_parallel(self) -> None:
+        pool = LoginPool(workers=3)
+        self.addCleanup(pool.shutdown)
+        barrier = threading.Barrier(3, timeout=5)
+        done = threading.Semaphore(0)
+        for _ in range(3):
+            pool.submit(lambda: (barrier.wait(), done.release()))
+        for _ in range(3):
+            self.assertTrue(done.acquire(timeout=5))
+
+    def test_memory_admission(self) -> None:
+        free = {"mb": 100.0}
+        pool = LoginPool(workers=2, min_free_mb=500, mem_available=lambda: free["mb"], recheck=0.01)
+        self.addCleanup(pool.shutdown)
+        first = threading.Event()
+        release = threading.Event()
+        second = threading.Event()
+        pool.submit(lambda: (first.set(), release.wait(5)))
+        self.assertTrue(first.wait(5))
+        pool.submit(second.set)
+        # One login always runs; a second waits for memory.
+        self.assertFalse(second.wait(0.1))
+        self.assertEqual(pool.stats(), {"running": 1, "queued": 1})
+        free["mb"] = 1000.0
+        self.assertTrue(second.wait(5))
+        release.set()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from keepliver import login_worker
+from keepliver.deadline import PhaseTimeout
+
+
+class TestLoginWorker(unittest.TestCase):
+    def test_round_trip_through_child_process(self) -> None:
+        # --help exits 0 from argparse before any browser library is imported.
+        login_worker.run_worker("keepliver.ctyun_auto", ["--help"], timeout=60)
+        with self.assertRaises(login_worker.LoginWorkerError):
+            login_worker.run_worker("keepliver.ctyun_auto", ["--bogus"], timeout=60)
+
+    def test_only_login_modules_run(self) -> None:
+        with self.assertRaises(ValueError):
+            login_worker.run_worker("os", [])
+
+    def test_phase_timeout_is_reported_to_supervisor(self) -> None:
+        def main():
+            raise PhaseTimeout("connect", 660)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            result = os.path.join(tmp, "result.json")
+            argv = ["login_worker.py", "keepliver.ctyun_auto"]
+            with mock.patch.dict(os.environ, {login_worker._RESULT_ENV: result}), mock.patch(
+                "sys.argv", argv
+            ), mock.patch("importlib.import_module", return_value=SimpleNamespace(main=main)):
+                with self.assertRaises(SystemExit) as ctx:
+                    login_worker.main()
+            self.assertEqual(ctx.exception.code, 3)
+            with open(result, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["phase"], "connect")
@@ -0,0 +1,82 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from keepliver import probe
+
+
+class _ProbeHandler(BaseHTTPRequestHandler):
+    responses = []
+    calls = 0
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", "0"))
+        self.rfile.read(length)
+        type(self).calls += 1
+        status, body = type(self).responses.pop(0)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode("utf-8"))
+
+    def log_message(self, *_args, **_kwargs):
+        return
+
+
+class TestSessionProbe(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _ProbeHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        _ProbeHandler.responses = []
+        _ProbeHandler.calls = 0
+        probe.invalidate()
+        self.cfg = {
+            "probe_url": f"http://127.0.0.1:{self.server.server_port}/pageDesktop",
+            "ctg_headers": {"ctg-version": "1"},
+            "auth": {"userId": "u", "tenantId": "t", "secretKey": "s"},
+        }
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        probe.invalidate()
+
+    def test_classify_response(self) -> None:
+        self.assertEqual(probe.classify_response(200, {"code": 0, "data": {}}), probe.VALID)
+        self.assertEqual(probe.classify_response(401, ""), probe.EXPIRED)
+        self.assertEqual(probe.classify_response(200, {"data": {}}), probe.UNKNOWN)
+        self.assertEqual(probe.classify_response(200, {"code": 1, "msg": "签名错误"}), probe.UNKNOWN)
+        self.assertEqual(
+            probe.classify_response(200, {"code": 40101, "msg": "x"}, ["40101"]), probe.EXPIRED
+        )
+        self.assertEqual(probe.classify_response(502, "<html>"), probe.UNKNOWN)
+
+    def test_no_endpoint_means_no_request(self) -> None:
+        del self.cfg["probe_url"]
+        self.assertEqual(probe.probe_session(self.cfg), probe.UNKNOWN)
+        self.assertEqual(_ProbeHandler.calls, 0)
+
+    def test_valid_answer_is_cached_for_ttl(self) -> None:
+        _ProbeHandler.responses = [(200, {"code": 0}), (401, {})]
+        self.assertEqual(probe.probe_session(self.cfg), probe.VALID)
+        self.assertEqual(probe.probe_session(self.cfg), probe.VALID)
+        self.assertEqual(_ProbeHandler.calls, 1)
+        self.assertEqual(probe.probe_session(self.cfg, ttl=0), probe.EXPIRED)
+        self.assertEqual(_ProbeHandler.calls, 2)
+
+    def test_unknown_is_not_cached(self) -> None:
+        _ProbeHandler.responses = [(503, {}), (200, {"code": 0})]
+        self.assertEqual(probe.probe_session(self.cfg), probe.UNKNOWN)
+        self.assertEqual(probe.probe_session(self.cfg), probe.VALID)
+
+    def test_new_secret_misses_cache(self) -> None:
+        _ProbeHandler.responses = [(401, {}), (200, {"code": 0})]
+        self.assertEqual(probe.probe_session(self.cfg), probe.EXPIRED)
+        self.cfg["auth"]["secretKey"] = "fresh"
+        self.assertEqual(probe.probe_session(self.cfg), probe.VALID)
+
+    def test_missing_auth_is_expired_without_request(self) -> None:
+        self.cfg["auth"] = {}
+        self.assertEqual(probe.probe_session(self.cfg), probe.EXPIRED)
+        self.assertEqual(_ProbeHandler.calls, 0)
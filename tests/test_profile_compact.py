@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+from keepliver import profile_compact
+
+
+def _write(path: str, size: int) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+
+
+class TestProfileCompact(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.profile = tmp.name
+        mb = 1024 * 1024
+        _write(os.path.join(self.profile, "Local State"), 100)
+        _write(os.path.join(self.profile, "Default", "Cookies"), 1000)
+        _write(os.path.join(self.profile, "Default", "Local Storage", "leveldb", "000003.log"), 500)
+        _write(os.path.join(self.profile, "Default", "Cache", "Cache_Data", "data_1"), 2 * mb)
+        _write(os.path.join(self.profile, "Default", "Code Cache", "js", "a"), mb)
+        _write(os.path.join(self.profile, "Default", "Service Worker", "CacheStorage", "b"), mb)
+        _write(os.path.join(self.profile, "chrome_debug.log"), mb // 2)
+
+    def _exists(self, *parts: str) -> bool:
+        return os.path.exists(os.path.join(self.profile, *parts))
+
+    def test_within_budget_is_untouched(self) -> None:
+        self.assertEqual(profile_compact.compact_profile(self.profile, 10), 0)
+        self.assertTrue(self._exists("Default", "Cache"))
+
+    def test_trims_largest_caches_first(self) -> None:
+        freed = profile_compact.compact_profile(self.profile, 2.6)
+        self.assertEqual(freed, 2 * 1024 * 1024)
+        self.assertFalse(self._exists("Default", "Cache"))
+        self.assertTrue(self._exists("Default", "Code Cache"))
+
+    def test_keeps_login_state(self) -> None:
+        freed = profile_compact.compact_profile(self.profile, 0)
+        self.assertEqual(freed, int(4.5 * 1024 * 1024))
+        for parts in [
+            ("Local State",),
+            ("Default", "Cookies"),
+            ("Default", "Local Storage", "leveldb", "000003.log"),
+            ("Default", "Service Worker"),
+        ]:
+            self.assertTrue(self._exists(*parts), parts)
+        for parts in [("Default", "Code Cache"), ("Default", "Service Worker", "CacheStorage")]:
+            self.assertFalse(self._exists(*parts), parts)
+
+
+if __name__ == "__main__":
+    unittest.main()
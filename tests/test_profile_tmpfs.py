@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+from keepliver import profile_tmpfs
+
+
+def _write(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _read(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class TestProfileTmpfs(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.profile = os.path.join(tmp.name, "profile")
+        self.tmpfs = os.path.join(tmp.name, "shm")
+        os.makedirs(self.tmpfs)
+        _write(os.path.join(self.profile, "Local State"), "state")
+        _write(os.path.join(self.profile, "Default", "Preferences"), "prefs")
+        _write(os.path.join(self.profile, "Default", "Local Storage", "leveldb", "1.log"), "ls")
+        _write(os.path.join(self.profile, "Default", "Cache", "data_0"), "cache")
+        _write(os.path.join(self.profile, "Default", "History"), "history")
+
+    def test_stage_skips_caches(self) -> None:
+        staged = profile_tmpfs.stage_profile(self.profile, self.tmpfs)
+        self.assertTrue(staged.startswith(self.tmpfs))
+        self.assertEqual(_read(os.path.join(staged, "Default", "Preferences")), "prefs")
+        self.assertFalse(os.path.exists(os.path.join(staged, "Default", "Cache")))
+        profile_tmpfs.discard(staged)
+        self.assertFalse(os.path.exists(staged))
+
+    def test_sync_back_copies_only_login_state(self) -> None:
+        staged = profile_tmpfs.stage_profile(self.profile, self.tmpfs)
+        _write(os.path.join(staged, "Default", "Preferences"), "prefs2")
+        _write(os.path.join(staged, "Default", "Network", "Cookies"), "cookies")
+        _write(os.path.join(staged, "Default", "Local Storage", "leveldb", "2.log"), "ls2")
+        os.remove(os.path.join(staged, "Default", "Local Storage", "leveldb", "1.log"))
+        _write(os.path.join(staged, "Default", "History"), "history2")
+
+        self.assertGreater(profile_tmpfs.sync_back(staged, self.profile), 0)
+        default = os.path.join(self.profile, "Default")
+        self.assertEqual(_read(os.path.join(default, "Preferences")), "prefs2")
+        self.assertEqual(_read(os.path.join(default, "Network", "Cookies")), "cookies")
+        self.assertEqual(os.listdir(os.path.join(default, "Local Storage", "leveldb")), ["2.log"])
+        self.assertEqual(_read(os.path.join(default, "History")), "history")
+        self.assertTrue(os.path.exists(os.path.join(default, "Cache", "data_0")))
+        self.assertFalse([n for n in os.listdir(default) if "keepliver" in n])
+
+
+if __name__ == "__main__":
+    unittest.main()
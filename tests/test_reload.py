@@ -0,0 +1,132 @@
+import json
+import os
+import signal
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from keepliver import auto
+from keepliver.daemon import Daemon
+from keepliver.lifecycle import Lifecycle
+
+
+class TestLifecycle(unittest.TestCase):
+    @unittest.skipUnless(hasattr(signal, "SIGHUP"), "no SIGHUP on this platform")
+    def test_signals_set_flags_and_cut_sleep_short(self) -> None:
+        old = {sig: signal.getsignal(sig) for sig in (signal.SIGHUP, signal.SIGTERM)}
+        life = Lifecycle()
+        life.install()
+        try:
+            os.kill(os.getpid(), signal.SIGHUP)
+            self.assertTrue(life.sleep(5))
+            self.assertTrue(life.take_reload())
+            self.assertFalse(life.take_reload())
+            os.kill(os.getpid(), signal.SIGTERM)
+            start = time.monotonic()
+            life.sleep(5)
+            life.sleep(5)
+            self.assertLess(time.monotonic() - start, 1)
+            self.assertTrue(life.stopping.is_set())
+        finally:
+            for sig, handler in old.items():
+                signal.signal(sig, handler)
+
+
+    def test_stop_interrupts_login_circuit_wait(self) -> None:
+        from keepliver.retry import get_breaker
+
+        breaker = get_breaker("login")
+        self.addCleanup(breaker.record_success)
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        life = Lifecycle()
+        threading.Timer(0.1, life.request_stop).start()
+        start = time.monotonic()
+        with self.assertRaises(SystemExit):
+            auto._guarded_login(None, lambda args: None, life)
+        self.assertLess(time.monotonic() - start, 5)
+
+
+class TestReload(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.tmp.name, name)
+
+    def _write(self, name: str, data) -> str:
+        path = self._path(name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        return path
+
+    def test_auto_reload_applies_settings_in_place(self) -> None:
+        settings = self._write("settings.json", {"interval": 1200})
+        argv = ["--config", self._path("config.json"), "--settings", settings, "--adaptive"]
+        args = auto.parse_args(argv)
+        self.assertEqual(args.interval, 1200)
+        self._write("settings.json", {"interval": 2400, "min_interval": 600, "hedge": True})
+        auto._reload(args, argv)
+        self.assertEqual((args.interval, args.min_interval, args.hedge), (2400, 600, True))
+        self._write("settings.json", ["not", "an", "object"])
+        auto._reload(args, argv)
+        self.assertEqual(args.interval, 2400)
+
+    def test_daemon_applies_account_diff(self) -> None:
+        def account(name: str, **extra):
+            opts = {"name": name, "config": self._path(f"{name}.json"), "interval": 1800}
+            opts.update(extra)
+            return opts
+
+        daemon = Daemon([account("a"), account("b")], workers=1)
+        try:
+            daemon.start()
+            a = daemon.accounts["a"]
+            a_scheduler = a.scheduler
+            daemon.apply_accounts([account("a", interval=900), account("c")])
+            self.assertEqual(set(daemon.accounts), {"a", "c"})
+            self.assertIs(daemon.accounts["a"], a)
+            self.assertIs(a.scheduler, a_scheduler)
+            self.assertEqual(a.scheduler.base_interval, 900)
+            self.assertLessEqual(a.next_run_ts - time.time(), 900)
+            self.assertIsNotNone(daemon.accounts["c"].handle)
+        finally:
+            daemon.stop()
+
+    def test_adaptive_loop_survives_failed_login(self) -> None:
+        argv = ["--config", self._path("config.json"), "--adaptive", "--no-control"]
+        args = auto.parse_args(argv)
+        life = Lifecycle()
+        life.request_reload()
+
+        def ensure_config(path, args, probe=False, life=None):
+            if probe:
+                return {}
+            life.request_stop()
+            raise RuntimeError("login did not produce a valid config")
+
+        with mock.patch.object(auto, "_ensure_config", side_effect=ensure_config):
+            auto._run_adaptive(args, life, argv)
+        self.assertEqual(auto.AUTO_STATE["last_status"], "error")
+
+    def test_browser_mode_cycle_needs_a_config(self) -> None:
+        from keepliver.retry import get_breaker
+
+        self.addCleanup(get_breaker("login").record_success)
+        argv = ["--config", self._path("config.json"), "--no-control"]
+        args = auto.parse_args(argv)
+        self.assertEqual(args.login_worker, "inprocess")
+
+        # The browser login returns normally either way; only the config tells them apart.
+        for valid, status in ((None, "error"), ({"auth": {}}, "ok")):
+            life = Lifecycle()
+            with mock.patch.object(
+                auto, "_login_selenium", lambda _args: life.request_stop()
+            ), mock.patch.object(auto, "_load_config", return_value=valid):
+                auto._run(args, life, argv)
+            self.assertEqual(auto.AUTO_STATE["last_status"], status)
@@ -0,0 +1,113 @@
+import json
+import os
+import random
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+
+from keepliver import relogin
+from keepliver.scheduler import AdaptiveScheduler
+
+
+def _config(secret: str) -> dict:
+    return {
+        "ctg_headers": {"ctg-version": "1"},
+        "auth": {"userId": "u", "tenantId": "t", "secretKey": secret},
+    }
+
+
+class TestPreemptiveRelogin(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = os.path.join(self.tmp.name, "config.json")
+        with open(self.config, "w", encoding="utf-8") as f:
+            json.dump(_config("old"), f)
+        self.args = SimpleNamespace(config=self.config)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _read_secret(self) -> str:
+        with open(self.config, "r", encoding="utf-8") as f:
+            return json.load(f)["auth"]["secretKey"]
+
+    def test_swap_happens_only_after_login_completes(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_login(args):
+            self.assertEqual(args.config, relogin.staging_path(self.config))
+            with open(args.config, "w", encoding="utf-8") as f:
+                json.dump(_config("new"), f)
+            started.set()
+            release.wait(5)
+
+        bg = relogin.BackgroundRelogin(self.args, slow_login)
+        self.assertTrue(bg.start())
+        self.assertTrue(started.wait(5))
+        self.assertFalse(bg.start())
+        self.assertEqual(self._read_secret(), "old")
+        self.assertFalse(bg.take_swapped())
+        release.set()
+        bg.wait(5)
+        self.assertTrue(bg.take_swapped())
+        self.assertFalse(bg.take_swapped())
+        self.assertEqual(self._read_secret(), "new")
+        self.assertFalse(os.path.exists(relogin.staging_path(self.config)))
+
+    def test_invalid_staging_keeps_current_config(self) -> None:
+        def broken_login(args):
+            with open(args.config, "w", encoding="utf-8") as f:
+                f.write("{")
+
+        self.assertFalse(relogin.login_to_staging(self.args, broken_login, guarded=False))
+        self.assertEqual(self._read_secret(), "old")
+
+    def test_scheduler_learns_session_age(self) -> None:
+        sched = AdaptiveScheduler(
+            os.path.join(self.tmp.name, "state.json"), 1800, jitter=0.0, rng=random.Random(1)
+        )
+        self.assertIsNone(sched.relogin_at())
+        sched.record_login(now=0)
+        sched.record_success(now=1000)
+        sched.record_success(now=2000)
+        # Expired after an idle gap that already survived once: the session hit its max age.
+        sched.record_expired(now=3000)
+        self.assertEqual(sched.session_age_s, 3000)
+        self.assertIsNone(sched.expired_s)
+        self.assertEqual(sched.survived_s, 1000)
+        sched.record_login(now=5000)
+        self.assertEqual(sched.relogin_at(), 5000 + 3000 * 0.8)
+        self.assertEqual(sched.relogin_at(lifetime=1000), 5800)
+
+    def test_login_without_config_counts_as_failure(self) -> None:
+        from keepliver import auto
+        from keepliver.retry import get_breaker
+
+        breaker = get_breaker("login")
+        self.addCleanup(breaker.record_success)
+        failures = breaker.failures
+        missing = SimpleNamespace(config=os.path.join(self.tmp.name, "missing.json"))
+        with self.assertRaises(RuntimeError):
+            auto._guarded_login(missing, lambda args: None)
+        self.assertEqual(breaker.failures, failures + 1)
+
+    def test_requested_login_reuses_running_background_login(self) -> None:
+        from keepliver import auto
+
+        release = threading.Event()
+        logins = []
+
+        def slow_login(args):
+            logins.append(args.config)
+            release.wait(5)
+            with open(args.config, "w", encoding="utf-8") as f:
+                json.dump(_config("new"), f)
+
+        bg = relogin.BackgroundRelogin(self.args, slow_login)
+        bg.start()
+        threading.Timer(0.1, release.set).start()
+        auto._login_now(self.args, None, bg)
+        self.assertEqual(logins, [relogin.staging_path(self.config)])
+        self.assertEqual(self._read_secret(), "new")
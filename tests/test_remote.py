@@ -0,0 +1,74 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from keepliver import remote
+
+
+def _grid_status(free_chrome: int, busy_chrome: int = 0, ready: bool = True) -> dict:
+    slots = [{"session": None, "stereotype": {"browserName": "chrome"}}] * free_chrome
+    slots += [{"session": {"id": "s"}, "stereotype": {"browserName": "chrome"}}] * busy_chrome
+    slots += [{"session": None, "stereotype": {"browserName": "MicrosoftEdge"}}]
+    return {"value": {"ready": ready, "nodes": [{"availability": "UP", "slots": slots}]}}
+
+
+class FakeEndpoint:
+    """A local stand-in for a Grid/standalone server's /status and DELETE /session."""
+
+    def __init__(self, status: dict):
+        self.status = status
+        self.deleted = []
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps(endpoint.status).encode("utf-8")
+                self.send_response(200 if self.path == "/status" else 404)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_DELETE(self):
+                endpoint.deleted.append(self.path)
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *_args):
+                pass
+
+        self.server = HTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestRemote(unittest.TestCase):
+    def _endpoint(self, status: dict) -> FakeEndpoint:
+        endpoint = FakeEndpoint(status)
+        self.addCleanup(endpoint.close)
+        return endpoint
+
+    def test_free_slots(self) -> None:
+        grid = self._endpoint(_grid_status(free_chrome=2, busy_chrome=3))
+        self.assertEqual(remote.free_slots(grid.url, "chrome"), 2)
+        self.assertEqual(remote.free_slots(grid.url, "edge"), 1)
+        driver = self._endpoint({"value": {"ready": True, "message": "ChromeDriver ready"}})
+        self.assertEqual(remote.free_slots(driver.url), 1)
+        self.assertEqual(remote.free_slots("http://127.0.0.1:9", timeout=0.5), 0)
+
+    def test_pick_endpoint_by_free_slots(self) -> None:
+        small = self._endpoint(_grid_status(free_chrome=1))
+        big = self._endpoint(_grid_status(free_chrome=4))
+        full = self._endpoint(_grid_status(free_chrome=0, busy_chrome=2))
+        self.assertEqual(remote.pick_endpoint([small.url, big.url, full.url]), big.url)
+        self.assertIsNone(remote.pick_endpoint([full.url]))
+        remote.end_session(big.url + "/", "abc")
+        self.assertEqual(big.deleted, ["/session/abc"])
+
+
+if __name__ == "__main__":
+    unittest.main()
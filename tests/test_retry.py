@@ -0,0 +1,91 @@
+import random
+import time
+import unittest
+
+from keepliver.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    call_with_retry,
+    get_breaker,
+)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_decorrelated_jitter_stays_in_bounds(self) -> None:
+        policy = RetryPolicy(base=2, cap=60, rng=random.Random(3))
+        prev = None
+        for _ in range(100):
+            delay = policy.next_delay(prev)
+            self.assertGreaterEqual(delay, 2)
+            self.assertLessEqual(delay, 60)
+            self.assertLessEqual(delay, max(2, (prev or 2) * 3))
+            prev = delay
+
+    def test_clients_do_not_retry_in_lockstep(self) -> None:
+        a = RetryPolicy(base=1, cap=300, rng=random.Random(1))
+        b = RetryPolicy(base=1, cap=300, rng=random.Random(2))
+        self.assertNotEqual(a.next_delay(10), b.next_delay(10))
+
+    def test_call_with_retry_retries_then_succeeds(self) -> None:
+        calls = []
+        sleeps = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise OSError("boom")
+            return "ok"
+
+        policy = RetryPolicy(base=1, cap=5, max_attempts=5, rng=random.Random(0))
+        self.assertEqual(call_with_retry(flaky, policy, sleep=sleeps.append), "ok")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(len(sleeps), 2)
+
+    def test_failure_result_is_returned_after_last_attempt(self) -> None:
+        policy = RetryPolicy(base=1, cap=1, max_attempts=2)
+        result = call_with_retry(
+            lambda: 503, policy, is_failure=lambda r: r >= 500, sleep=lambda _: None
+        )
+        self.assertEqual(result, 503)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_threshold_and_half_opens(self) -> None:
+        breaker = CircuitBreaker("t", failure_threshold=2, reset_timeout=10, rng=random.Random(0))
+        breaker.record_failure(now=0)
+        self.assertTrue(breaker.allow(now=0))
+        breaker.record_failure(now=0)
+        self.assertFalse(breaker.allow(now=1))
+        self.assertTrue(breaker.allow(now=16))
+        # Only one probe is admitted while half-open.
+        self.assertFalse(breaker.allow(now=16))
+        breaker.record_success()
+        self.assertTrue(breaker.allow(now=16))
+
+    def test_call_with_retry_refuses_when_open(self) -> None:
+        breaker = CircuitBreaker("t2", failure_threshold=1, reset_timeout=100)
+        breaker.record_failure()
+        with self.assertRaises(CircuitOpenError):
+            call_with_retry(lambda: "x", RetryPolicy(), breaker=breaker)
+
+    def test_unretried_error_resolves_half_open_probe(self) -> None:
+        breaker = CircuitBreaker("t3", failure_threshold=1, reset_timeout=10, rng=random.Random(0))
+        breaker.record_failure(now=-100)
+
+        def bad():
+            raise KeyError("not retried")
+
+        with self.assertRaises(KeyError):
+            call_with_retry(bad, RetryPolicy(), breaker=breaker, retry_on=(ValueError,))
+        # The probe failed and re-opened the breaker instead of staying "in flight" forever.
+        self.assertEqual(breaker.state, "open")
+        self.assertTrue(breaker.allow(now=time.monotonic() + 100))
+
+    def test_account_login_breakers_are_independent(self) -> None:
+        bad, good = get_breaker("login:test-bad"), get_breaker("login:test-good")
+        self.assertEqual(bad.failure_threshold, get_breaker("login").failure_threshold)
+        for _ in range(bad.failure_threshold):
+            bad.record_failure()
+        self.assertFalse(bad.allow())
+        self.assertTrue(good.allow())
@@ -0,0 +1,60 @@
+import os
+import random
+import tempfile
+import unittest
+
+from keepliver.scheduler import AdaptiveScheduler
+
+
+class TestAdaptiveScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.tmp.name, "state.json")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _make(self, **kwargs) -> AdaptiveScheduler:
+        kwargs.setdefault("base_interval", 1800)
+        kwargs.setdefault("jitter", 0.0)
+        return AdaptiveScheduler(self.state_path, rng=random.Random(1), **kwargs)
+
+    def test_defaults_to_base_interval(self) -> None:
+        self.assertEqual(self._make().next_interval(), 1800)
+
+    def test_expiry_caps_interval_at_safe_fraction(self) -> None:
+        sched = self._make()
+        sched.record_login(now=0)
+        sched.record_expired(now=1000)
+        self.assertEqual(sched.learned_lifetime(), 1000)
+        self.assertEqual(sched.next_interval(), 800)
+
+    def test_growth_never_exceeds_max_interval(self) -> None:
+        sched = self._make(max_interval=3000)
+        sched.record_login(now=0)
+        sched.record_success(now=2000)
+        self.assertEqual(sched.next_interval(), 2500)
+        sched.record_success(now=4500)
+        self.assertEqual(sched.next_interval(), 3000)
+
+    def test_grows_past_base_interval_without_max(self) -> None:
+        sched = self._make()
+        sched.record_login(now=0)
+        sched.record_success(now=1800)
+        self.assertEqual(sched.next_interval(), 2250)
+        sched.record_expired(now=1800 + 5000)
+        self.assertEqual(sched.next_interval(), 4000)
+
+    def test_jitter_only_shortens(self) -> None:
+        sched = self._make(jitter=0.2)
+        for _ in range(50):
+            delay = sched.next_interval()
+            self.assertLessEqual(delay, 1800)
+            self.assertGreaterEqual(delay, 1440)
+
+    def test_state_survives_restart(self) -> None:
+        sched = self._make()
+        sched.record_login(now=0)
+        sched.record_expired(now=1200)
+        restored = self._make()
+        self.assertEqual(restored.learned_lifetime(), 1200)
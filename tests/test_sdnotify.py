@@ -0,0 +1,73 @@
+import os
+import socket
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from keepliver import sdnotify
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "no Unix sockets on this platform")
+class TestSdNotify(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "notify.sock")
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(self.path)
+        self.sock.settimeout(0.01)
+        patcher = mock.patch.dict(os.environ, {"NOTIFY_SOCKET": self.path})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.sock.close()
+        self.tmp.cleanup()
+
+    def _received(self, window: float = 0.1) -> list:
+        messages = []
+        deadline = time.monotonic() + window
+        while time.monotonic() < deadline:
+            try:
+                messages.append(self.sock.recv(1024).decode("utf-8"))
+            except socket.timeout:
+                pass
+        return messages
+
+    def test_notify_sends_state(self) -> None:
+        self.assertTrue(sdnotify.notify("READY=1"))
+        self.assertEqual(self._received(0.03), ["READY=1"])
+        with mock.patch.dict(os.environ, {"NOTIFY_SOCKET": ""}):
+            self.assertFalse(sdnotify.notify("READY=1"))
+
+    def test_watchdog_interval_honours_pid(self) -> None:
+        env = {"WATCHDOG_USEC": "20000000", "WATCHDOG_PID": str(os.getppid())}
+        with mock.patch.dict(os.environ, env):
+            self.assertEqual(sdnotify.watchdog_interval(), 20.0)
+        with mock.patch.dict(os.environ, dict(env, WATCHDOG_PID="1" + str(os.getpid()))):
+            self.assertIsNone(sdnotify.watchdog_interval())
+
+    def test_watchdog_stops_pinging_when_step_overruns(self) -> None:
+        watchdog = sdnotify.Watchdog()
+        self.assertTrue(watchdog.start(busy_timeout=0.15, interval=0.04))
+        try:
+            self.assertIn("WATCHDOG=1", self._received())
+            time.sleep(0.1)
+            self._received(0.05)
+            self.assertEqual(self._received(), [])
+            watchdog.idle()
+            self.assertIn("WATCHDOG=1", self._received())
+        finally:
+            watchdog.stop()
+
+    def test_still_busy_rearms_running_watchdog(self) -> None:
+        watchdog = sdnotify.Watchdog()
+        self.assertTrue(watchdog.start(busy_timeout=0.15, interval=0.04))
+        try:
+            for _ in range(4):
+                time.sleep(0.08)
+                sdnotify.still_busy()
+            self.assertIn("WATCHDOG=1", self._received())
+        finally:
+            watchdog.stop()
+        sdnotify.still_busy()
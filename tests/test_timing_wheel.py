@@ -0,0 +1,45 @@
+import random
+import unittest
+
+from keepliver.timing_wheel import TimingWheel
+
+
+class TestTimingWheel(unittest.TestCase):
+    def _drain(self, wheel: TimingWheel, until: float):
+        fired = []
+        now = 0.0
+        while now < until:
+            now += 1.0
+            for handle in wheel.advance(now):
+                fired.append((now, handle.args[0]))
+        return fired
+
+    def test_timers_fire_at_deadline_across_levels(self) -> None:
+        wheel = TimingWheel(tick=1.0, wheel_bits=3, levels=3, now=0.0)
+        deadlines = [1, 7, 8, 9, 63, 64, 65, 300, 511, 600]
+        for d in deadlines:
+            wheel.schedule_at(float(d), lambda: None, d)
+        fired = self._drain(wheel, 700)
+        self.assertEqual(fired, [(float(d), d) for d in deadlines])
+        self.assertEqual(len(wheel), 0)
+
+    def test_cancel_is_immediate(self) -> None:
+        wheel = TimingWheel(tick=1.0, now=0.0)
+        keep = wheel.schedule_at(10.0, lambda: None, "keep")
+        drop = wheel.schedule_at(10.0, lambda: None, "drop")
+        self.assertTrue(wheel.cancel(drop))
+        self.assertFalse(wheel.cancel(drop))
+        self.assertEqual(len(wheel), 1)
+        fired = self._drain(wheel, 20)
+        self.assertEqual([name for _, name in fired], ["keep"])
+        self.assertFalse(wheel.cancel(keep))
+
+    def test_random_deadlines_never_fire_early_or_late(self) -> None:
+        rng = random.Random(7)
+        wheel = TimingWheel(tick=1.0, wheel_bits=4, levels=3, now=0.0)
+        deadlines = [rng.randint(1, 5000) for _ in range(2000)]
+        for d in deadlines:
+            wheel.schedule_at(float(d), lambda: None, d)
+        for now, d in self._drain(wheel, 5000):
+            self.assertEqual(now, float(d))
+        self.assertEqual(len(wheel), 0)